@@ -46,9 +46,12 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    # ?limit=&offset= włącza stronicowanie; bez limit odpowiedź jest pełną listą jak wcześniej
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.OptionalLimitOffsetPagination",
 }
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -91,6 +94,58 @@ DATABASES = {
 }
 
 
+# Cache
+# Holds the catalog version counter used to invalidate in-process catalog data.
+# With several worker processes point this at a shared backend (file, Redis, ...).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+# Build frontier (core.services.frontier_service) is built by
+# `manage.py rebuild_build_frontier` (run it after catalog changes). True = also
+# rebuild it in a background thread of the server whenever the catalog changes.
+# The catalog version lives in CACHES, so with several server processes the
+# frontier is only shared when CACHES is a shared backend (e.g. Redis).
+
+BUILDER_FRONTIER_AUTO_REBUILD = False
+
+# Worker processes for the optimal/top-K builder search (core.services.
+# parallel_search_service). 1 = search in the request thread; set to the
+# number of cores on multi-core hosts. Workers start via forkserver (spawn where
+# unavailable) and run django.setup() themselves, so DJANGO_SETTINGS_MODULE must
+# be set in the environment.
+
+BUILDER_WORKERS = 1
+
+# Threads running background builder jobs (POST /api/builder/jobs/,
+# core.services.builder_job_service). 0 = run the job inside the POST request.
+
+BUILDER_JOB_WORKERS = 2
+
+# Cache of /api/builder/ responses. BACKEND may also be
+# core.services.result_cache_service.FileCacheBackend (needs LOCATION) or
+# core.services.result_cache_service.DjangoCacheBackend (ALIAS of CACHES).
+
+BUILDER_RESULT_CACHE = {
+    'BACKEND': 'core.services.result_cache_service.LocalMemoryCacheBackend',
+    'MAX_ENTRIES': 1024,
+}
+
+# Per-view request metrics (SQL queries, DB time, render time, response size),
+# exposed as the Server-Timing header and aggregated at /api/_metrics/.
+# SAMPLES = recent requests kept per view for percentiles; PUBLIC = endpoint
+# readable without a staff account (defaults to DEBUG).
+
+REQUEST_METRICS = {
+    'ENABLED': True,
+    'SAMPLES': 1000,
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -1,7 +1,9 @@
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from core.views import CPUViewSet, GPUViewSet, BuildViewSet, FilterOptionsView, BuildBuilderView
+from core.views import CPUViewSet, GPUViewSet, BuildViewSet, FilterOptionsView, BuildBuilderView, CompatibilityView
+from core.views import FilterFacetsView, CatalogExportView, MetricsView, BuilderJobsView, BuilderJobView
+from core.views import RankingView
 from core.views import (
     CPUViewSet, GPUViewSet, MotherboardViewSet, RAMViewSet, StorageViewSet,
     PSUViewSet, CaseViewSet, CoolerViewSet, BuildViewSet, ManufacturerViewSet,
@@ -31,5 +33,12 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include(router.urls)),
     path('api/filters/options/', FilterOptionsView.as_view()),
+    path('api/filters/facets/', FilterFacetsView.as_view()),
     path('api/builder/', BuildBuilderView.as_view()),
+    path('api/builder/jobs/', BuilderJobsView.as_view()),
+    path('api/builder/jobs/<str:job_id>/', BuilderJobView.as_view()),
+    path('api/compatibility/', CompatibilityView.as_view()),
+    path('api/rankings/', RankingView.as_view()),
+    path('api/catalog/export/', CatalogExportView.as_view()),
+    path('api/_metrics/', MetricsView.as_view()),
 ]
@@ -54,6 +54,7 @@ class CPUFilter(django_filters.FilterSet):
     cache_mb = NumberInFilter(field_name="cache_mb", lookup_expr="in")
     integrated_gpu = django_filters.BooleanFilter(field_name="integrated_gpu")
     pcie_max_gen = NumberInFilter(method="filter_pcie_max_gen")
+    tier_score = django_filters.RangeFilter(field_name="tier_score")
 
     class Meta:
         model = CPU
@@ -61,6 +62,7 @@ class CPUFilter(django_filters.FilterSet):
             "family", "generation", "manufacturer", "socket", "p_cores", "e_cores",
             "threads", "boost_clock_ghz", "supported_ram", "max_internal_memory_gb",
             "supported_pcie", "tdp", "price", "cache_mb", "integrated_gpu", "pcie_max_gen",
+            "tier_score",
         ]
 
     def filter_pcie_max_gen(self, queryset, name, value):
@@ -138,6 +140,7 @@ class GPUFilter(django_filters.FilterSet):
     graphics_chip_memory_type = CharInFilter(field_name="graphics_chip__memory_type", lookup_expr="in")
     graphics_chip_ray_tracing_gen = NumberInFilter(field_name="graphics_chip__ray_tracing_gen", lookup_expr="in")
     graphics_chip_upscaling_technology = CharInFilter(field_name="graphics_chip__upscaling_technology", lookup_expr="in")
+    tier_score = django_filters.RangeFilter(field_name="tier_score")
 
     class Meta:
         model = GPU
@@ -147,6 +150,7 @@ class GPUFilter(django_filters.FilterSet):
             "price", "graphics_chip_vendor", "graphics_chip_marketing_name",
             "graphics_chip_pcie_max_gen", "graphics_chip_memory_type",
             "graphics_chip_ray_tracing_gen", "graphics_chip_upscaling_technology",
+            "tier_score",
         ]
 
     def filter_outputs(self, queryset, name, value):
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.models import PSU
+from core.services.psu_service import PSUService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the normalized PSU connector inventory and cached PCIe pin lists from PSU.connectors."
+
+    def handle(self, *args, **options):
+        count = 0
+        for psu in PSU.objects.all().iterator():
+            PSUService.sync_connector_inventory(psu)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Connector inventory rebuilt for {count} PSUs."))
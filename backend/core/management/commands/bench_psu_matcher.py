@@ -0,0 +1,56 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.psu_service import PSUService
+
+
+PIN_COUNTS = (6, 8, 12, 16)
+GPU_REQUIREMENTS = ([8], [8, 8], [8, 8, 8], [16], [12, 8], [16, 16])
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark of the PCIe power connector matcher (DP vs. exhaustive recursion)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--leads", type=int, nargs="+", default=[6, 8, 10, 12, 14])
+        parser.add_argument("--psus", type=int, default=50, help="Random PSUs per lead count.")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        self.stdout.write(f"{'leads':>5} {'exhaustive ms':>14} {'dp ms':>10} {'speedup':>8}")
+
+        for leads in options["leads"]:
+            # ostatni wymóg zwykle przekracza możliwości zasilacza - najgorszy przypadek dla rekurencji
+            cases = [
+                (
+                    [rng.choice(PIN_COUNTS) for _ in range(leads)],
+                    rng.choice(GPU_REQUIREMENTS) + [rng.choice(PIN_COUNTS) * leads],
+                )
+                for _ in range(options["psus"])
+            ]
+
+            exhaustive_ms, exhaustive = self._time(cases, PSUService._find_best_subset_exhaustive)
+            dp_ms, dp = self._time(cases, PSUService._find_best_subset)
+            if exhaustive != dp:
+                raise AssertionError(f"Matchers disagree for {leads} leads")
+
+            speedup = exhaustive_ms / dp_ms if dp_ms else float("inf")
+            self.stdout.write(f"{leads:>5} {exhaustive_ms:>14.2f} {dp_ms:>10.2f} {speedup:>7.1f}x")
+
+    @staticmethod
+    def _time(cases, matcher):
+        original = PSUService._find_best_subset
+        PSUService._find_best_subset = staticmethod(matcher)
+        try:
+            start = time.perf_counter()
+            results = [
+                PSUService.can_satisfy_gpu_power(available, required)
+                for available, required in cases
+            ]
+            elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            PSUService._find_best_subset = original
+        return elapsed, results
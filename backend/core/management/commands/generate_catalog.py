@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core.services.synthetic_catalog_service import SyntheticCatalogService
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic catalog at a configurable scale for benchmarking (see run_benchmarks)."
+
+    def add_arguments(self, parser):
+        for name, count in SyntheticCatalogService.DEFAULT_COUNTS.items():
+            parser.add_argument(f"--{name}", type=int, default=count)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--clear", action="store_true", help="Only remove previously generated components.")
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            deleted = SyntheticCatalogService.clear()
+            self.stdout.write(self.style.SUCCESS(f"Removed {deleted} synthetic rows."))
+            return
+
+        counts = {name: options[name] for name in SyntheticCatalogService.DEFAULT_COUNTS}
+        created = SyntheticCatalogService.generate(counts, seed=options["seed"])
+        summary = ", ".join(f"{name}: {count}" for name, count in created.items())
+        self.stdout.write(self.style.SUCCESS(f"Synthetic catalog generated ({summary})."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.services.frontier_service import FrontierService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed Pareto frontier of builds used by /api/builder/."
+
+    def handle(self, *args, **options):
+        points = FrontierService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Build frontier rebuilt: {points} points."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core.models import MotherboardCapability
+from core.services.motherboard_capability_service import MotherboardCapabilityService
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-motherboard capability summaries (e.g. after loaddata, which skips signals)."
+
+    def handle(self, *args, **options):
+        MotherboardCapabilityService.refresh()
+        count = MotherboardCapability.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"Capability summaries rebuilt for {count} motherboards."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.services.catalog_service import CatalogService
+from core.services.tier_score_service import TierScoreService
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored tier_score columns of CPUs, graphics chips and GPUs."
+
+    def handle(self, *args, **options):
+        changed = TierScoreService.recompute_all()
+        if any(changed.values()):
+            # bulk_update omija sygnały post_save
+            CatalogService.bump_version()
+        summary = ", ".join(f"{name}: {count}" for name, count in changed.items())
+        self.stdout.write(self.style.SUCCESS(f"Tier scores updated ({summary})."))
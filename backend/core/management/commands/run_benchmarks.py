@@ -0,0 +1,68 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.benchmark_service import BenchmarkService
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the builder, compatibility, filter option and list endpoints "
+        "(SQL queries, wall time, peak memory) and optionally diff against a JSON baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--only", nargs="+", help="Run only scenarios whose name contains one of these.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument("--baseline", help="JSON file from a previous run to compare against.")
+        parser.add_argument(
+            "--max-slowdown", type=float,
+            help="With --baseline: fail if a scenario is this many times slower or runs more queries.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'scenario':<32} {'queries':>7} {'median ms':>10} {'max ms':>9} {'peak KiB':>9}")
+
+        def progress(name, result):
+            self.stdout.write(
+                f"{name:<32} {result['queries']:>7} {result['wall_ms']:>10.2f} "
+                f"{result['wall_ms_max']:>9.2f} {result['peak_kb']:>9.1f}"
+            )
+
+        results = BenchmarkService.run(
+            repeat=options["repeat"], only=options["only"], seed=options["seed"], progress=progress,
+        )
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}."))
+
+        if options["baseline"]:
+            with open(options["baseline"]) as file:
+                baseline = json.load(file)
+            self._report(BenchmarkService.compare(results, baseline, options["max_slowdown"]))
+
+    def _report(self, rows):
+        self.stdout.write("")
+        self.stdout.write(f"{'scenario':<32} {'queries':>13} {'median ms':>21} {'ratio':>6}")
+        regressions = []
+        for row in rows:
+            current = row["current"]
+            old = row["baseline"]
+            if old is None:
+                self.stdout.write(f"{row['name']:<32} {'(new)':>13}")
+                continue
+            line = (
+                f"{row['name']:<32} {old['queries']:>6}->{current['queries']:<6} "
+                f"{old['wall_ms']:>10.2f}->{current['wall_ms']:<10.2f} {row['ratio'] or 0:>5.2f}x"
+            )
+            if row["regression"]:
+                regressions.append(row["name"])
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(f"Regressions against baseline: {', '.join(regressions)}")
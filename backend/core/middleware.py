@@ -0,0 +1,111 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+
+from core.services.metrics_service import RequestMetricsService
+
+
+class QueryCounter:
+    """execute_wrapper zliczający zapytania i ich łączny czas (bez debug cursora)."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+class RequestMetricsMiddleware:
+    """Liczba zapytań SQL, czas bazy, serializacji, renderowania i rozmiar odpowiedzi per widok.
+
+    Fazy: serialize - serializer.data w BaseViewSet (łącznie z zapytaniami, które wywoła
+    serializer, np. leniwy queryset), render - JSONRenderer. Wyniki trafiają do nagłówka
+    Server-Timing i do RequestMetricsService (/api/_metrics/). Odpowiedzi strumieniowane
+    mają w nagłówku czasy do pierwszego bajtu, a próbka jest zapisywana po wysłaniu całości.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = RequestMetricsService.get_config()["ENABLED"]
+
+    @staticmethod
+    def _count_queries(counter):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        return stack
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        request._metrics_phases = {}
+        start = time.perf_counter()
+        with self._count_queries(counter):
+            response = self.get_response(request)
+
+        key = getattr(request, "_metrics_key", None)
+        if key is None:
+            return response
+
+        sample = self._sample(request, counter, start, None if response.streaming else len(response.content))
+        timings = [f'db;dur={sample["db_ms"]};desc="{counter.queries} queries"']
+        for phase in ("serialize", "render"):
+            if sample[f"{phase}_ms"] is not None:
+                timings.append(f"{phase};dur={sample[f'{phase}_ms']}")
+        timings.append(f"total;dur={sample['total_ms']}")
+        response["Server-Timing"] = ", ".join(timings)
+
+        if response.streaming:
+            response.streaming_content = self._stream(request, response.streaming_content, counter, start, key)
+        else:
+            RequestMetricsService.record(key, sample)
+        return response
+
+    @staticmethod
+    def _sample(request, counter, start, size):
+        phases = request._metrics_phases
+        return {
+            "total_ms": round((time.perf_counter() - start) * 1000, 2),
+            "db_ms": round(counter.seconds * 1000, 2),
+            "queries": counter.queries,
+            "serialize_ms": round(phases["serialize"], 2) if "serialize" in phases else None,
+            "render_ms": round(phases["render"], 2) if "render" in phases else None,
+            "size_bytes": size,
+        }
+
+    def _stream(self, request, content, counter, start, key):
+        # zapytania i serializacja z queryset.iterator() dzieją się dopiero przy wysyłaniu treści
+        size = 0
+        with self._count_queries(counter):
+            for chunk in content:
+                size += len(chunk)
+                yield chunk
+        RequestMetricsService.record(key, self._sample(request, counter, start, size))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+        name = view_class.__name__ if view_class else getattr(view_func, "__name__", "view")
+        actions = getattr(view_func, "actions", None)
+        method = request.method.lower()
+        # ViewSet: akcja (list/retrieve/...) z mapowania metod; APIView: metoda HTTP
+        action = actions.get(method, method) if actions else method
+        request._metrics_key = f"{name}.{action}"
+
+    def process_template_response(self, request, response):
+        # DRF Response renderuje się zaraz po tym haku; mierzymy samo renderowanie (JSONRenderer)
+        start = time.perf_counter()
+
+        def rendered(response):
+            request._metrics_phases["render"] = (time.perf_counter() - start) * 1000
+
+        response.add_post_render_callback(rendered)
+        return response
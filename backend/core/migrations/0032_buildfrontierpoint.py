@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_psu_connectors_json'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BuildFrontierPoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_ram_gb', models.PositiveSmallIntegerField()),
+                ('target_storage_gb', models.PositiveIntegerField()),
+                ('total_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('score', models.FloatField()),
+                ('catalog_version', models.BigIntegerField()),
+                ('case', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.case')),
+                ('cpu', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.cpu')),
+                ('gpu', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.gpu')),
+                ('motherboard', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.motherboard')),
+                ('psu', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.psu')),
+                ('ram', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.ram')),
+                ('storage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.storage')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['target_ram_gb', 'target_storage_gb', 'total_price'], name='frontier_tier_price_idx')],
+            },
+        ),
+    ]
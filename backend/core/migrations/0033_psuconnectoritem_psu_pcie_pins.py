@@ -0,0 +1,165 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:33
+
+import re
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Kopia parsowania z PSUService z chwili tej migracji; późniejsze zmiany serwisu
+# nie mogą zmieniać wyniku backfillu.
+
+def _number(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_connector_string(value):
+    if not value:
+        return None
+    lowered = value.lower()
+    if "pcie" in lowered:
+        category = "PCIe Power"
+    elif "eps" in lowered or ("cpu" in lowered and "pin" in lowered):
+        category = "CPU Power"
+    elif "atx" in lowered:
+        category = "ATX Power"
+    elif "sata" in lowered:
+        category = "SATA Power"
+    elif "molex" in lowered:
+        category = "Molex"
+    else:
+        return None
+
+    lanes = None
+    pin_match = re.search(r"(\d+)\s*-?\s*pin", lowered)
+    if pin_match:
+        lanes = int(pin_match.group(1))
+    else:
+        plus_match = re.search(r"(\d+)\s*\+\s*(\d+)", lowered)
+        if plus_match:
+            lanes = int(plus_match.group(1)) + int(plus_match.group(2))
+    return category, lanes, None
+
+
+def _item_text(item):
+    return item.get("name") or item.get("label") or item.get("connector")
+
+
+def _quantity(item):
+    if isinstance(item, dict):
+        return item.get("quantity") or item.get("count") or item.get("value") or 1
+    return 1
+
+
+def _connector_list(connectors):
+    if isinstance(connectors, dict):
+        return [{"name": name, "quantity": count} for name, count in connectors.items()]
+    return connectors or []
+
+
+def normalize_connectors(connectors):
+    items = []
+    for item in _connector_list(connectors):
+        if isinstance(item, dict):
+            if item.get("category"):
+                normalized = item.get("category"), item.get("lanes"), item.get("version")
+            else:
+                normalized = _parse_connector_string(_item_text(item))
+        elif isinstance(item, str):
+            normalized = _parse_connector_string(item)
+        else:
+            normalized = None
+        if not normalized:
+            continue
+        category, lanes, version = normalized
+        lanes, version, quantity = _number(lanes), _number(version), _number(_quantity(item))
+        items.append({
+            "category": category,
+            "lanes": int(lanes) if lanes is not None else None,
+            "version": Decimal(str(version)) if version is not None else None,
+            "quantity": int(quantity) if quantity is not None else 1,
+        })
+    return items
+
+
+def get_pcie_pins_list(connectors):
+    pins = []
+    has_data = False
+    missing = False
+    for item in _connector_list(connectors):
+        category = lanes = None
+        if isinstance(item, dict):
+            category, lanes = item.get("category"), item.get("lanes")
+            if not category or lanes is None:
+                parsed = _parse_connector_string(_item_text(item))
+                if parsed:
+                    category = category or parsed[0]
+                    lanes = lanes if lanes is not None else parsed[1]
+        elif isinstance(item, str):
+            parsed = _parse_connector_string(item)
+            if parsed:
+                category, lanes, _ = parsed
+
+        if category != "PCIe Power":
+            continue
+        has_data = True
+        quantity = _number(_quantity(item)) or 1
+        lanes = _number(lanes)
+        if lanes is None:
+            missing = True
+            continue
+        pins.extend([int(lanes)] * int(quantity))
+
+    if not has_data:
+        return []
+    if missing:
+        return None
+    return pins
+
+
+def backfill_connector_inventory(apps, schema_editor):
+    PSU = apps.get_model("core", "PSU")
+    PSUConnectorItem = apps.get_model("core", "PSUConnectorItem")
+
+    for psu in PSU.objects.all():
+        PSUConnectorItem.objects.bulk_create(
+            [PSUConnectorItem(psu_id=psu.id, **item) for item in normalize_connectors(psu.connectors)]
+        )
+        psu.pcie_pins = get_pcie_pins_list(psu.connectors)
+        psu.save(update_fields=["pcie_pins"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_buildfrontierpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='psu',
+            name='pcie_pins',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='PSUConnectorItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=20)),
+                ('lanes', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('version', models.DecimalField(blank=True, decimal_places=1, max_digits=2, null=True)),
+                ('quantity', models.PositiveSmallIntegerField(default=1)),
+                ('psu', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='connector_items', to='core.psu')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['category', 'lanes'], name='psu_item_category_lanes_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_connector_inventory, migrations.RunPython.noop),
+    ]
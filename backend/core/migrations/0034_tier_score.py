@@ -0,0 +1,74 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:46
+
+from django.db import migrations, models
+
+
+# Wzory compute_tier_score z chwili tej migracji (modele historyczne nie mają metod,
+# a późniejsza zmiana wzoru nie może zmieniać wyniku backfillu).
+
+def cpu_tier_score(cpu):
+    raw_score = (
+        cpu.p_cores * 4 + cpu.e_cores * 1 + cpu.threads * 1 + (cpu.cache_mb or 0) * 0.5
+        + float(cpu.boost_clock_ghz or cpu.base_clock_ghz) * 2
+    )
+    return round(10 if raw_score > 125 else raw_score / 125 * 10)
+
+
+def chip_tier_score(chip):
+    raw_score = (chip.memory_bus_width or 0) * 0.1
+    return round(10 if raw_score >= 250 else raw_score / 250 * 10)
+
+
+def gpu_tier_score(gpu):
+    clock = gpu.boost_clock_mhz or gpu.base_clock_mhz or 0
+    raw_score = clock * 0.1 + (gpu.vram_size_gb or 0) * 1
+    max_score = 314 + 241
+    return round(10 if raw_score >= max_score else raw_score / max_score * 10)
+
+
+def backfill_tier_scores(apps, schema_editor):
+    for name, compute in (("CPU", cpu_tier_score), ("GraphicsChip", chip_tier_score), ("GPU", gpu_tier_score)):
+        model = apps.get_model("core", name)
+        changed = []
+        for obj in model.objects.iterator(chunk_size=500):
+            obj.tier_score = compute(obj)
+            changed.append(obj)
+        model.objects.bulk_update(changed, ["tier_score"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_psuconnectoritem_psu_pcie_pins'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cpu',
+            name='tier_score',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='gpu',
+            name='tier_score',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='graphicschip',
+            name='tier_score',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='cpu',
+            index=models.Index(fields=['-tier_score', 'price'], name='cpu_tier_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gpu',
+            index=models.Index(fields=['-tier_score', 'price'], name='gpu_tier_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='graphicschip',
+            index=models.Index(fields=['-tier_score'], name='graphicschip_tier_score_idx'),
+        ),
+        migrations.RunPython(backfill_tier_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0034_tier_score'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(fields=['max_gpu_length_mm'], name='case_gpu_length_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('price__isnull', False)), fields=['id'], name='case_priced_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connector',
+            index=models.Index(fields=['category', 'version', 'lanes'], name='connector_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gpu',
+            index=models.Index(fields=['length_mm'], name='gpu_length_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gpuconnector',
+            index=models.Index(fields=['connector', 'gpu'], name='gpuconnector_connector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='graphicschip',
+            index=models.Index(fields=['pcie_max_width', 'pcie_max_gen'], name='graphicschip_pcie_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='motherboard',
+            index=models.Index(fields=['socket', 'form_factor'], name='mobo_socket_form_factor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='motherboard',
+            index=models.Index(condition=models.Q(('price__isnull', False)), fields=['id'], name='mobo_priced_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='motherboardconnector',
+            index=models.Index(fields=['motherboard', 'connector'], name='moboconnector_mobo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='motherboardconnector',
+            index=models.Index(fields=['connector', 'motherboard'], name='moboconnector_connector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='psu',
+            index=models.Index(fields=['wattage', 'form_factor'], name='psu_wattage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='psu',
+            index=models.Index(condition=models.Q(('price__isnull', False)), fields=['id'], name='psu_priced_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ram',
+            index=models.Index(fields=['base', 'total_capacity', 'modules_count'], name='ram_base_capacity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ram',
+            index=models.Index(condition=models.Q(('price__isnull', False)), fields=['id'], name='ram_priced_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rambase',
+            index=models.Index(fields=['type', 'mts'], name='rambase_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='storage',
+            index=models.Index(fields=['connector', 'capacity_gb'], name='storage_connector_capacity_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='storage',
+            index=models.Index(condition=models.Q(('price__isnull', False)), fields=['id'], name='storage_priced_idx'),
+        ),
+    ]
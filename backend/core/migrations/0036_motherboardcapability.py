@@ -0,0 +1,96 @@
+# Generated by Django 5.2.5 on 2026-10-18 08:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+RAM_TYPE_BITS = {"DDR3": 1, "DDR4": 2, "DDR5": 4}
+
+
+def _rank(*values):
+    # None na końcu, jak przy ORDER BY ... DESC w SQLite
+    return tuple(-1 if value is None else value for value in values)
+
+
+def backfill_capabilities(apps, schema_editor):
+    # kopia MotherboardCapabilityService.compute z chwili tej migracji, na modelach historycznych
+    Motherboard = apps.get_model("core", "Motherboard")
+    MotherboardConnector = apps.get_model("core", "MotherboardConnector")
+    MotherboardCapability = apps.get_model("core", "MotherboardCapability")
+
+    ids = list(Motherboard.objects.values_list("id", flat=True))
+    summaries = {
+        pk: {
+            "gpu_slot_gen": None, "gpu_slot_lanes": None, "m2_pcie_gen": None, "m2_pcie_lanes": None,
+            "m2_sata": False, "sata_ports": 0, "power_connectors": [], "ram_types": 0,
+        }
+        for pk in ids
+    }
+    power = {pk: set() for pk in ids}
+
+    links = MotherboardConnector.objects.filter(motherboard_id__in=ids).values_list(
+        "motherboard_id", "quantity", "connector__category", "connector__version",
+        "connector__lanes", "connector__extra", "connector__is_power",
+    )
+    for mobo_id, quantity, category, version, lanes, extra, is_power in links:
+        summary = summaries[mobo_id]
+        if is_power:
+            power[mobo_id].add((category, lanes, None if version is None else str(version)))
+        if quantity < 1:
+            continue
+        if category == "PCIe":
+            if _rank(lanes, version) > _rank(summary["gpu_slot_lanes"], summary["gpu_slot_gen"]):
+                summary["gpu_slot_lanes"], summary["gpu_slot_gen"] = lanes, version
+        elif category == "M.2 PCIe":
+            if _rank(version, lanes) > _rank(summary["m2_pcie_gen"], summary["m2_pcie_lanes"]):
+                summary["m2_pcie_gen"], summary["m2_pcie_lanes"] = version, lanes
+            if extra is not None and extra != "":
+                summary["m2_sata"] = True
+        elif category == "M.2 SATA":
+            summary["m2_sata"] = True
+        elif category == "SATA":
+            summary["sata_ports"] += quantity
+
+    for mobo_id, items in power.items():
+        items = sorted(items, key=lambda item: (item[0], _rank(item[1]), item[2] or ""))
+        summaries[mobo_id]["power_connectors"] = [
+            {"category": category, "lanes": lanes, "version": version}
+            for category, lanes, version in items
+        ]
+
+    for mobo_id, ram_type in Motherboard.supported_ram.through.objects.filter(
+        motherboard_id__in=ids,
+    ).values_list("motherboard_id", "rambase__type"):
+        summaries[mobo_id]["ram_types"] |= RAM_TYPE_BITS.get(ram_type, 0)
+
+    MotherboardCapability.objects.bulk_create(
+        [MotherboardCapability(motherboard_id=pk, **fields) for pk, fields in summaries.items()]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_compatibility_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MotherboardCapability',
+            fields=[
+                ('motherboard', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='capability', serialize=False, to='core.motherboard')),
+                ('gpu_slot_gen', models.DecimalField(blank=True, decimal_places=1, max_digits=2, null=True)),
+                ('gpu_slot_lanes', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('m2_pcie_gen', models.DecimalField(blank=True, decimal_places=1, max_digits=2, null=True)),
+                ('m2_pcie_lanes', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('m2_sata', models.BooleanField(default=False)),
+                ('sata_ports', models.PositiveSmallIntegerField(default=0)),
+                ('power_connectors', models.JSONField(blank=True, default=list)),
+                ('ram_types', models.PositiveSmallIntegerField(default=0, help_text='Bitmask of RAM_TYPE_BITS')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['gpu_slot_lanes', 'gpu_slot_gen'], name='mobocap_gpu_slot_idx'), models.Index(fields=['m2_pcie_gen', 'm2_pcie_lanes'], name='mobocap_m2_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_capabilities, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 10:24
+
+from django.db import migrations, models
+
+
+def mark_synced_psus(apps, schema_editor):
+    # zasilacze z inwentarzem przeszły już synchronizację; pozostałe zostają na PSU.connectors
+    # do czasu backfill_psu_connectors (wynik zgodności jest ten sam, tylko wolniej liczony)
+    PSU = apps.get_model("core", "PSU")
+    PSUConnectorItem = apps.get_model("core", "PSUConnectorItem")
+    PSU.objects.filter(
+        id__in=PSUConnectorItem.objects.values("psu_id"),
+    ).update(connector_inventory_synced=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0036_motherboardcapability'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='psu',
+            name='connector_inventory_synced',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='psu',
+            index=models.Index(condition=models.Q(('connector_inventory_synced', False)), fields=['id'], name='psu_unsynced_idx'),
+        ),
+        migrations.RunPython(mark_synced_psus, migrations.RunPython.noop),
+    ]
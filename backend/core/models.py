@@ -36,6 +36,11 @@ class Connector(models.Model):
     extra = models.CharField(max_length=16, null=True, blank=True)
     is_power = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["category", "version", "lanes"], name="connector_category_idx"),
+        ]
+
     def __str__(self):
         match self.category:
             case "PCIe":
@@ -77,7 +82,12 @@ class RAMBase(models.Model):
         choices=[('DDR3', 'DDR3'), ('DDR4', 'DDR4'), ('DDR5', 'DDR5')]
     )
     mts = models.PositiveSmallIntegerField()
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["type", "mts"], name="rambase_type_idx"),
+        ]
+
     def __str__(self):
         return f"{self.type}-{self.mts}"
 
@@ -92,7 +102,13 @@ class RAM(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     cycle_latency = models.PositiveSmallIntegerField() # CL
     ram_latency_ns = models.DecimalField(max_digits=5, decimal_places=2, editable=False)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["base", "total_capacity", "modules_count"], name="ram_base_capacity_idx"),
+            models.Index(fields=["id"], condition=models.Q(price__isnull=False), name="ram_priced_idx"),
+        ]
+
     def save(self, *args, **kwargs):
         self.total_capacity = self.modules_count * self.module_memory
         self.ram_latency_ns = self.cycle_latency * 2000 / self.base.mts
@@ -162,6 +178,16 @@ class CPU(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     cache_mb = models.PositiveIntegerField(null=True, blank=True, help_text="Total cache size in MB")
     integrated_gpu = models.BooleanField(default=False)
+    tier_score = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-tier_score", "price"], name="cpu_tier_score_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.tier_score = self.compute_tier_score()
+        super().save(*args, **kwargs)
 
     @property
     def full_name(self):
@@ -204,8 +230,7 @@ class CPU(models.Model):
     def ram_support_info(self):
         return [str(ram) for ram in self.supported_ram.all()]
 
-    @property
-    def tier_score(self):
+    def compute_tier_score(self):
         MAX_CPU_SCORE = 125
         raw_score = (self.p_cores * 4) + (self.e_cores * 1) + (self.threads * 1) + ((self.cache_mb or 0) * 0.5) + (float(self.boost_clock_ghz or self.base_clock_ghz) * 2)
         normalized_score = 10 if raw_score > MAX_CPU_SCORE else (raw_score / MAX_CPU_SCORE) * 10
@@ -236,7 +261,13 @@ class Storage(models.Model):
     connector = models.ForeignKey(Connector, on_delete=models.PROTECT)
     capacity_gb = models.PositiveIntegerField()
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["connector", "capacity_gb"], name="storage_connector_capacity_idx"),
+            models.Index(fields=["id"], condition=models.Q(price__isnull=False), name="storage_priced_idx"),
+        ]
+
     @property
     def full_name(self):
         return f"{self.manufacturer.name} {self.name} {self.capacity_gb}GB"
@@ -263,7 +294,11 @@ class Storage(models.Model):
 
     @property
     def type(self):
-        match self.connector.category:
+        return self.type_for_category(self.connector.category)
+
+    @staticmethod
+    def type_for_category(category):
+        match category:
             case "M.2 PCIe": return "NVMe"
             case "M.2 SATA" | "SATA": return "SATA"
             case _: return "HDD"
@@ -284,9 +319,22 @@ class PSU(models.Model):
     name = models.CharField(max_length=120)
     wattage = models.PositiveSmallIntegerField(help_text="Maximum output power (W)")
     connectors = models.JSONField(default=list, blank=True)
+    pcie_pins = models.JSONField(null=True, blank=True, editable=False)
+    # ustawiane przez PSUService.sync_connector_inventory; False (loaddata, bulk_create) -> zgodność
+    # liczona z PSU.connectors, bo PSUConnectorItem mogą jeszcze nie istnieć
+    connector_inventory_synced = models.BooleanField(default=False, editable=False)
     form_factor = models.ForeignKey(PSUFormFactor, on_delete=models.PROTECT)
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["wattage", "form_factor"], name="psu_wattage_idx"),
+            models.Index(fields=["id"], condition=models.Q(price__isnull=False), name="psu_priced_idx"),
+            models.Index(
+                fields=["id"], condition=models.Q(connector_inventory_synced=False), name="psu_unsynced_idx",
+            ),
+        ]
+
     @property
     def full_name(self):
         return f"{self.manufacturer.name} {self.name}"
@@ -326,6 +374,20 @@ class PSU(models.Model):
         return self.full_name
 
 
+class PSUConnectorItem(models.Model):
+    # znormalizowana postać PSU.connectors, utrzymywana przez PSUService.sync_connector_inventory
+    psu = models.ForeignKey(PSU, on_delete=models.CASCADE, related_name="connector_items")
+    category = models.CharField(max_length=20)
+    lanes = models.PositiveSmallIntegerField(null=True, blank=True)
+    version = models.DecimalField(max_digits=2, decimal_places=1, null=True, blank=True)
+    quantity = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["category", "lanes"], name="psu_item_category_lanes_idx"),
+        ]
+
+
 class GraphicsChip(models.Model):
     vendor = models.CharField(
         max_length=16,
@@ -352,6 +414,17 @@ class GraphicsChip(models.Model):
         default="None",
         blank=True,
     )
+    tier_score = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-tier_score"], name="graphicschip_tier_score_idx"),
+            models.Index(fields=["pcie_max_width", "pcie_max_gen"], name="graphicschip_pcie_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.tier_score = self.compute_tier_score()
+        super().save(*args, **kwargs)
 
     @property
     def chip_manufacturer_name(self):
@@ -365,10 +438,9 @@ class GraphicsChip(models.Model):
     def bus_width_info(self):
         return f"{self.memory_bus_width}-bit" if self.memory_bus_width else "N/A"
 
-    @property
-    def tier_score(self):
+    def compute_tier_score(self):
         MAX_GPU_SCORE = 250
-        raw_score = ((self.cuda_cores or 0) * 0.01) + ((self.memory_bus_width or 0) * 0.1)
+        raw_score = (self.memory_bus_width or 0) * 0.1
         normalized_score = 10 if raw_score >= MAX_GPU_SCORE else (raw_score / MAX_GPU_SCORE) * 10
         return round(normalized_score)
 
@@ -390,6 +462,17 @@ class GPU(models.Model):
     outputs = models.JSONField(null=True, blank=True)
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     connectors = models.ManyToManyField(Connector, through="GPUConnector")
+    tier_score = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-tier_score", "price"], name="gpu_tier_score_idx"),
+            models.Index(fields=["length_mm"], name="gpu_length_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.tier_score = self.compute_tier_score()
+        super().save(*args, **kwargs)
 
     @property
     def full_name(self):
@@ -414,11 +497,11 @@ class GPU(models.Model):
     @property
     def ports_info(self):
         output_categories = ("HDMI", "DisplayPort", "DVI", "VGA", "USB-C")
+        # .all() zamiast filter(), żeby korzystać z prefetch_related w widokach list
         return [
             f"{item.quantity}x {item.connector}"
-            for item in self.gpuconnector_set.filter(
-                connector__category__in=output_categories
-            )
+            for item in self.gpuconnector_set.all()
+            if item.connector.category in output_categories
         ]
 
     @property
@@ -450,11 +533,9 @@ class GPU(models.Model):
     def bus_width_info(self):
         return self.graphics_chip.bus_width_info if self.graphics_chip else "N/A"
 
-    @property
-    def tier_score(self):
-        cuda_cores = self.graphics_chip.cuda_cores if self.graphics_chip else 0
+    def compute_tier_score(self):
         clock = self.boost_clock_mhz or self.base_clock_mhz or 0
-        raw_score = ((cuda_cores or 0) * 0.01) + ((clock or 0) * 0.1) + ((self.vram_size_gb or 0) * 1)
+        raw_score = ((clock or 0) * 0.1) + ((self.vram_size_gb or 0) * 1)
         max_score = 314 + 241
         normalized_score = 10 if raw_score >= max_score else (raw_score / max_score) * 10
         return round(normalized_score)
@@ -468,6 +549,11 @@ class GPUConnector(models.Model):
     connector = models.ForeignKey(Connector, on_delete=models.CASCADE)
     quantity = models.PositiveSmallIntegerField(default=1)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["connector", "gpu"], name="gpuconnector_connector_idx"),
+        ]
+
 
 class Cooler(models.Model):
     manufacturer = models.ForeignKey(Manufacturer, on_delete=models.PROTECT)
@@ -514,6 +600,12 @@ class Case(models.Model):
     max_gpu_length_mm = models.PositiveSmallIntegerField()
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["max_gpu_length_mm"], name="case_gpu_length_idx"),
+            models.Index(fields=["id"], condition=models.Q(price__isnull=False), name="case_priced_idx"),
+        ]
+
     @property
     def full_name(self):
         return f"{self.manufacturer.name} {self.name}"
@@ -549,6 +641,12 @@ class Motherboard(models.Model):
     connectors = models.ManyToManyField(Connector, through="MotherboardConnector")
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["socket", "form_factor"], name="mobo_socket_form_factor_idx"),
+            models.Index(fields=["id"], condition=models.Q(price__isnull=False), name="mobo_priced_idx"),
+        ]
+
     @property
     def full_name(self):
         return f"{self.manufacturer.name} {self.name}"
@@ -575,23 +673,31 @@ class Motherboard(models.Model):
 
     @property
     def supported_ram_types(self):
-        return list(self.supported_ram.values_list('type', flat=True).distinct())
+        return list(dict.fromkeys(ram.type for ram in self.supported_ram.all()))
 
     @property
     def max_ram_capacity_info(self):
         return f"{self.max_ram_capacity} GB"
 
+    def _slots_info(self, matches):
+        # .all() zamiast filter(), żeby korzystać z prefetch_related w widokach list
+        return [
+            f"{item.quantity}x {item.connector}"
+            for item in self.motherboardconnector_set.all()
+            if matches(item.connector.category)
+        ]
+
     @property
     def pcie_slots_info(self):
-        return [f"{item.quantity}x {item.connector}" for item in self.motherboardconnector_set.filter(connector__category="PCIe")]
+        return self._slots_info(lambda category: category == "PCIe")
 
     @property
     def m2_slots_info(self):
-        return [f"{item.quantity}x {item.connector}" for item in self.motherboardconnector_set.filter(connector__category__startswith="M.2")]
+        return self._slots_info(lambda category: category.startswith("M.2"))
 
     @property
     def sata_ports_info(self):
-        return [f"{item.quantity}x {item.connector}" for item in self.motherboardconnector_set.filter(connector__category="SATA")]
+        return self._slots_info(lambda category: category == "SATA")
 
     def __str__(self):
         return self.full_name
@@ -602,6 +708,52 @@ class MotherboardConnector(models.Model):
     connector = models.ForeignKey(Connector, on_delete=models.CASCADE)
     quantity = models.PositiveSmallIntegerField(default=1)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["motherboard", "connector"], name="moboconnector_mobo_idx"),
+            models.Index(fields=["connector", "motherboard"], name="moboconnector_connector_idx"),
+        ]
+
+
+class MotherboardCapability(models.Model):
+    """Podsumowanie złączy i pamięci płyty, utrzymywane przez MotherboardCapabilityService."""
+
+    RAM_TYPE_BITS = {"DDR3": 1, "DDR4": 2, "DDR5": 4}
+
+    motherboard = models.OneToOneField(
+        Motherboard, on_delete=models.CASCADE, primary_key=True, related_name="capability"
+    )
+    gpu_slot_gen = models.DecimalField(max_digits=2, decimal_places=1, null=True, blank=True)
+    gpu_slot_lanes = models.PositiveSmallIntegerField(null=True, blank=True)
+    # najlepszy slot M.2 PCIe; dysk i tak jest dopasowywany do każdego slotu osobno
+    # (MotherboardConnector), bo generacja i linie muszą pochodzić z jednego slotu
+    m2_pcie_gen = models.DecimalField(max_digits=2, decimal_places=1, null=True, blank=True)
+    m2_pcie_lanes = models.PositiveSmallIntegerField(null=True, blank=True)
+    m2_sata = models.BooleanField(default=False)
+    sata_ports = models.PositiveSmallIntegerField(default=0)
+    power_connectors = models.JSONField(default=list, blank=True)
+    ram_types = models.PositiveSmallIntegerField(default=0, help_text="Bitmask of RAM_TYPE_BITS")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["gpu_slot_lanes", "gpu_slot_gen"], name="mobocap_gpu_slot_idx"),
+            models.Index(fields=["m2_pcie_gen", "m2_pcie_lanes"], name="mobocap_m2_idx"),
+        ]
+
+    @staticmethod
+    def ram_type_mask(types) -> int:
+        mask = 0
+        for ram_type in types:
+            mask |= MotherboardCapability.RAM_TYPE_BITS.get(ram_type, 0)
+        return mask
+
+    @property
+    def ram_type_set(self):
+        return {ram_type for ram_type, bit in self.RAM_TYPE_BITS.items() if self.ram_types & bit}
+
+    def __str__(self):
+        return f"Capability of {self.motherboard_id}"
+
 
 class Build(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="builds")
@@ -618,3 +770,29 @@ class Build(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.name}"
+
+
+class BuildFrontierPoint(models.Model):
+    target_ram_gb = models.PositiveSmallIntegerField()
+    target_storage_gb = models.PositiveIntegerField()
+    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    score = models.FloatField()
+    cpu = models.ForeignKey(CPU, on_delete=models.CASCADE, related_name="+")
+    gpu = models.ForeignKey(GPU, on_delete=models.CASCADE, related_name="+")
+    motherboard = models.ForeignKey(Motherboard, on_delete=models.CASCADE, related_name="+")
+    ram = models.ForeignKey(RAM, on_delete=models.CASCADE, related_name="+")
+    storage = models.ForeignKey(Storage, on_delete=models.CASCADE, related_name="+")
+    psu = models.ForeignKey(PSU, on_delete=models.CASCADE, related_name="+")
+    case = models.ForeignKey(Case, on_delete=models.CASCADE, related_name="+")
+    catalog_version = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["target_ram_gb", "target_storage_gb", "total_price"],
+                name="frontier_tier_price_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.target_ram_gb}GB/{self.target_storage_gb}GB {self.total_price} ({self.score})"
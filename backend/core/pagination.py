@@ -0,0 +1,8 @@
+from rest_framework.pagination import LimitOffsetPagination
+
+
+class OptionalLimitOffsetPagination(LimitOffsetPagination):
+    """Stronicowanie tylko na życzenie: bez ?limit= lista zwracana jest w całości (jak dotąd)."""
+
+    default_limit = None
+    max_limit = 200
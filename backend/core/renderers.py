@@ -0,0 +1,18 @@
+import json
+
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def stream_json_array(items, serialize):
+    """Generator kolejnych fragmentów tablicy JSON: "[", elementy rozdzielone przecinkami, "]".
+
+    Każdy element jest serializowany i kodowany osobno, więc w pamięci jest naraz
+    tylko bieżący obiekt (i bieżąca porcja z queryset.iterator()).
+    """
+    yield "["
+    for index, item in enumerate(items):
+        chunk = json.dumps(
+            serialize(item), cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+        )
+        yield chunk if index == 0 else "," + chunk
+    yield "]"
@@ -1,10 +1,11 @@
 # core/serializers.py
+from django.db.models import Prefetch
 from rest_framework import serializers
 
 from .models import (
     Manufacturer, CPU, GPU, Motherboard, RAM, Storage, PSU, Case, Cooler, Build,
     PSUFormFactor, MotherboardFormFactor, Connector, RAMBase, Socket, GPUConnector,
-    MotherboardConnector, GraphicsChip
+    MotherboardConnector, GraphicsChip, CPUSupportedPCIe
 )
 
 class PSUFormFactorSerializer(serializers.ModelSerializer):
@@ -59,8 +60,15 @@ class CPUDetailSerializer(serializers.ModelSerializer):
     supported_ram = RAMBaseSerializer(many=True, read_only=True)
     supported_pcie = serializers.SerializerMethodField()
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("manufacturer", "socket").prefetch_related(
+            "supported_ram",
+            Prefetch("cpusupportedpcie_set", queryset=CPUSupportedPCIe.objects.select_related("connector")),
+        )
+
     def get_supported_pcie(self, obj):
-        items = obj.cpusupportedpcie_set.select_related("connector")
+        items = obj.cpusupportedpcie_set.all()
         return [
             {
                 "version": str(item.connector.version) if item.connector.version is not None else None,
@@ -82,7 +90,6 @@ class CPUDetailSerializer(serializers.ModelSerializer):
         ]
 
 class GraphicsChipSerializer(serializers.ModelSerializer):
-    tier_score = serializers.FloatField(read_only=True)
     class Meta:
         model = GraphicsChip
         fields = "__all__"
@@ -95,6 +102,10 @@ class GraphicsChipInfoSerializer(serializers.ModelSerializer):
 
 
 class GPUSerializer(serializers.ModelSerializer):
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("manufacturer", "graphics_chip")
+
     class Meta:
         model = GPU
         fields = ['id', 'short_name']
@@ -104,14 +115,20 @@ class GPUDetailSerializer(serializers.ModelSerializer):
     graphics_chip = GraphicsChipInfoSerializer(read_only=True)
     power_connectors = serializers.SerializerMethodField()
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("manufacturer", "graphics_chip").prefetch_related(
+            Prefetch("gpuconnector_set", queryset=GPUConnector.objects.select_related("connector")),
+        )
+
     def get_power_connectors(self, obj):
-        items = obj.gpuconnector_set.select_related("connector").filter(connector__is_power=True)
         return [
             {
                 "pins": item.connector.lanes,
                 "quantity": item.quantity,
             }
-            for item in items
+            for item in obj.gpuconnector_set.all()
+            if item.connector.is_power
         ]
 
     class Meta:
@@ -137,8 +154,15 @@ class MotherboardDetailSerializer(serializers.ModelSerializer):
     supported_ram = RAMBaseSerializer(many=True, read_only=True)
     connectors = serializers.SerializerMethodField()
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("manufacturer", "socket", "form_factor").prefetch_related(
+            "supported_ram",
+            Prefetch("motherboardconnector_set", queryset=MotherboardConnector.objects.select_related("connector")),
+        )
+
     def get_connectors(self, obj):
-        items = obj.motherboardconnector_set.select_related("connector")
+        items = obj.motherboardconnector_set.all()
         return [
             {
                 "category": item.connector.category,
@@ -160,6 +184,10 @@ class MotherboardDetailSerializer(serializers.ModelSerializer):
         ]
 
 class RAMSerializer(serializers.ModelSerializer):
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("manufacturer", "base")
+
     class Meta:
         model = RAM
         fields = ['id', 'short_name']
@@ -168,6 +196,10 @@ class RAMDetailSerializer(serializers.ModelSerializer):
     manufacturer = serializers.CharField(source="manufacturer.name", read_only=True)
     base = RAMBaseSerializer(read_only=True)
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("manufacturer", "base")
+
     class Meta:
         model = RAM
         fields = [
@@ -185,6 +217,10 @@ class StorageDetailSerializer(serializers.ModelSerializer):
     manufacturer = serializers.CharField(source="manufacturer.name", read_only=True)
     connector = ConnectorSerializer(read_only=True)
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("manufacturer", "connector")
+
     class Meta:
         model = Storage
         fields = [
@@ -194,6 +230,10 @@ class StorageDetailSerializer(serializers.ModelSerializer):
         ]
 
 class PSUSerializer(serializers.ModelSerializer):
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("manufacturer")
+
     class Meta:
         model = PSU
         fields = ['id', 'short_name']
@@ -202,6 +242,10 @@ class PSUDetailSerializer(serializers.ModelSerializer):
     manufacturer = serializers.CharField(source="manufacturer.name", read_only=True)
     form_factor = serializers.CharField(source="form_factor.name", read_only=True)
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("manufacturer", "form_factor")
+
     class Meta:
         model = PSU
         fields = [
@@ -220,11 +264,17 @@ class CaseDetailSerializer(serializers.ModelSerializer):
     mobo_form_factor_support = serializers.SerializerMethodField()
     psu_form_factor_support = serializers.SerializerMethodField()
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("manufacturer").prefetch_related(
+            "mobo_form_factor_support", "psu_form_factor_support",
+        )
+
     def get_mobo_form_factor_support(self, obj):
-        return list(obj.mobo_form_factor_support.values_list("name", flat=True))
+        return [form_factor.name for form_factor in obj.mobo_form_factor_support.all()]
 
     def get_psu_form_factor_support(self, obj):
-        return list(obj.psu_form_factor_support.values_list("name", flat=True))
+        return [form_factor.name for form_factor in obj.psu_form_factor_support.all()]
 
     class Meta:
         model = Case
@@ -241,6 +291,10 @@ class CoolerSerializer(serializers.ModelSerializer):
         fields = ['id', 'short_name']
 
 class CoolerDetailSerializer(serializers.ModelSerializer):
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("manufacturer")
+
     class Meta:
         model = Cooler
         fields = [
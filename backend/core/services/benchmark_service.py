@@ -0,0 +1,191 @@
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.models import CPU, GPU, Motherboard, RAM, Storage, PSU, Case
+from core.services.case_service import CaseService
+from core.services.catalog_service import CatalogService, CatalogSnapshot
+from core.services.cpu_service import CPUService
+from core.services.filter_options_service import FilterOptionsService
+from core.services.gpu_service import GPUService
+from core.services.motherboard_service import MotherboardService
+from core.services.psu_service import PSUService
+from core.services.ram_service import RAMService
+from core.services.result_cache_service import BuilderResultCache
+from core.services.storage_service import StorageService
+
+
+class BenchmarkService:
+    """Pomiary wydajności gorących ścieżek API na bieżącej bazie.
+
+    Dla każdego scenariusza: liczba zapytań SQL, czas (mediana i maksimum z `repeat`
+    przebiegów) oraz szczytowa pamięć Pythona (tracemalloc, osobny przebieg, żeby
+    narzut śledzenia nie zawyżał czasów).
+    """
+
+    COMPONENTS = {
+        "cpu": CPU, "mobo": Motherboard, "ram": RAM, "gpu": GPU,
+        "mem": Storage, "psu": PSU, "case": Case,
+    }
+    COMPATIBILITY = (
+        ("cpus", CPUService.get_compatible_cpus),
+        ("gpus", GPUService.get_compatible_gpus),
+        ("motherboards", MotherboardService.get_compatible_motherboards),
+        ("rams", RAMService.get_compatible_rams),
+        ("mems", StorageService.get_compatible_m2),
+        ("psus", PSUService.get_compatible_psus),
+        ("cases", CaseService.get_compatible_cases),
+    )
+    LIST_ENDPOINTS = ("cpus", "gpus", "motherboards", "rams", "mems", "psus", "cases")
+    BUDGETS = (3000, 6000, 12000)
+    PARTIAL_BUILDS = 10
+
+    @staticmethod
+    def catalog_counts() -> dict:
+        return {name: model.objects.count() for name, model in BenchmarkService.COMPONENTS.items()}
+
+    @staticmethod
+    def partial_builds(count: int, seed: int = 0, probability: float = 0.5) -> list[dict]:
+        """Losowe częściowe zestawy (każdy komponent z prawdopodobieństwem `probability`)."""
+        rng = random.Random(seed)
+        ids = {
+            name: list(model.objects.order_by("id").values_list("id", flat=True))
+            for name, model in BenchmarkService.COMPONENTS.items()
+        }
+        return [
+            {name: rng.choice(pks) for name, pks in ids.items() if pks and rng.random() < probability}
+            for _ in range(count)
+        ]
+
+    @staticmethod
+    def scenarios(seed: int = 0) -> list[tuple]:
+        """(nazwa, przygotowanie przed każdym przebiegiem albo None, mierzona funkcja)."""
+        client = Client()
+        result_cache = BuilderResultCache.get_default()
+
+        def get(url, **params):
+            def run():
+                response = client.get(url, params)
+                if not response.streaming:
+                    response.content
+                return response.status_code
+            return run
+
+        builds = BenchmarkService.partial_builds(BenchmarkService.PARTIAL_BUILDS, seed)
+        full_build = BenchmarkService.partial_builds(1, seed + 1, probability=1)[0]
+
+        def compatibility(fn):
+            def run():
+                for data in builds:
+                    try:
+                        list(fn(data).values_list("id", flat=True))
+                    except (ObjectDoesNotExist, ValueError):
+                        # np. GPU bez układu graficznego - tak samo odrzuca je API
+                        pass
+            return run
+
+        scenarios = [
+            ("catalog_snapshot_load", None, lambda: CatalogSnapshot.load(CatalogService.get_version())),
+        ]
+        for budget in BenchmarkService.BUDGETS:
+            scenarios += [
+                (f"builder_first_fit_{budget}", result_cache.clear,
+                 get("/api/builder/", budget=budget, mode="first_fit")),
+                (f"builder_top5_{budget}", result_cache.clear, get("/api/builder/", budget=budget, k=5)),
+            ]
+        scenarios += [
+            (f"compatible_{name}", None, compatibility(fn)) for name, fn in BenchmarkService.COMPATIBILITY
+        ]
+        scenarios += [
+            ("compatibility_view", None, get("/api/compatibility/", **full_build)),
+            ("filter_options_cold", FilterOptionsService.clear, get("/api/filters/options/")),
+            ("filter_options_warm", None, get("/api/filters/options/")),
+        ]
+        for name in BenchmarkService.LIST_ENDPOINTS:
+            scenarios += [
+                (f"list_{name}", None, get(f"/api/{name}/")),
+                (f"list_{name}_page", None, get(f"/api/{name}/", limit=50)),
+            ]
+        return scenarios
+
+    @staticmethod
+    def measure(setup, fn, repeat: int) -> dict:
+        timings = []
+        for _ in range(repeat):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "queries": len(queries),
+            "wall_ms": round(statistics.median(timings), 2),
+            "wall_ms_max": round(max(timings), 2),
+            "peak_kb": round(peak / 1024, 1),
+        }
+
+    @staticmethod
+    def run(repeat: int = 5, only=None, seed: int = 0, progress=None) -> dict:
+        # klient testowy przedstawia się jako "testserver"
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            CatalogService.get_snapshot()
+            results = {}
+            for name, setup, fn in BenchmarkService.scenarios(seed):
+                if only and not any(part in name for part in only):
+                    continue
+                results[name] = BenchmarkService.measure(setup, fn, repeat)
+                if progress:
+                    progress(name, results[name])
+
+        return {
+            "meta": {
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "repeat": repeat,
+                "seed": seed,
+                "catalog": BenchmarkService.catalog_counts(),
+            },
+            "scenarios": results,
+        }
+
+    @staticmethod
+    def compare(current: dict, baseline: dict, max_slowdown: float = None) -> list[dict]:
+        """Różnice względem bazowego pomiaru; `regression` = więcej zapytań albo czas
+        powyżej `max_slowdown` razy bazowy."""
+        rows = []
+        previous = baseline.get("scenarios", {})
+        for name, result in current["scenarios"].items():
+            old = previous.get(name)
+            if old is None:
+                rows.append({"name": name, "baseline": None, "current": result, "ratio": None, "regression": False})
+                continue
+            ratio = result["wall_ms"] / old["wall_ms"] if old["wall_ms"] else None
+            regression = result["queries"] > old["queries"] or bool(
+                max_slowdown and ratio is not None and ratio > max_slowdown
+            )
+            rows.append({
+                "name": name,
+                "baseline": old,
+                "current": result,
+                "ratio": round(ratio, 2) if ratio is not None else None,
+                "regression": regression,
+            })
+        return rows
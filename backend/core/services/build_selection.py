@@ -0,0 +1,93 @@
+from core.models import CPU, GPU, Motherboard, RAM, Storage, PSU, Case, MotherboardConnector
+
+
+class BuildSelection:
+    """Komponenty wybrane w częściowym zestawie, pobierane z bazy najwyżej raz.
+
+    Serwisy kompatybilności dostają ten sam obiekt, więc np. przy /api/compatibility/
+    CPU, płyta główna i jej złącza są wczytywane jednokrotnie dla wszystkich kategorii.
+    """
+
+    COMPONENTS = {
+        "cpu": (CPU, ("socket",)),
+        "mobo": (Motherboard, ("socket", "form_factor", "capability")),
+        "ram": (RAM, ("base",)),
+        "gpu": (GPU, ("graphics_chip",)),
+        "mem": (Storage, ("connector",)),
+        "psu": (PSU, ("form_factor",)),
+        "case": (Case, ()),
+    }
+
+    def __init__(self, data: dict[str, int]):
+        self.data = data
+        self._cache = {}
+
+    def _memoize(self, key, loader):
+        if key not in self._cache:
+            self._cache[key] = loader()
+        return self._cache[key]
+
+    def pk(self, name):
+        return self.data.get(name)
+
+    def get(self, name):
+        """Wybrany komponent albo None (brak parametru lub nieistniejący klucz)."""
+        pk = self.pk(name)
+        if not pk:
+            return None
+        model, related = self.COMPONENTS[name]
+        return self._memoize(
+            name, lambda: model.objects.select_related(*related).filter(pk=pk).first()
+        )
+
+    def require(self, name):
+        """Jak get(), ale dla podanego, nieistniejącego klucza rzuca DoesNotExist (zachowanie .get())."""
+        obj = self.get(name)
+        if obj is None and self.pk(name):
+            raise self.COMPONENTS[name][0].DoesNotExist
+        return obj
+
+    @staticmethod
+    def _ram_types(component):
+        return set(component.supported_ram.values_list("type", flat=True).distinct())
+
+    def cpu_ram_types(self):
+        return self._memoize("cpu_ram_types", lambda: self._ram_types(self.get("cpu")))
+
+    def mobo_capability(self):
+        """Podsumowanie złączy wybranej płyty (MotherboardCapability) albo None."""
+        from core.services.motherboard_capability_service import MotherboardCapabilityService
+
+        def load():
+            mobo = self.get("mobo")
+            return MotherboardCapabilityService.get(mobo) if mobo else None
+        return self._memoize("mobo_capability", load)
+
+    def mobo_m2_pcie_slots(self):
+        """(wersja, linie) każdego slotu M.2 PCIe wybranej płyty."""
+        return self._memoize("mobo_m2_pcie_slots", lambda: list(
+            MotherboardConnector.objects.filter(
+                motherboard_id=self.pk("mobo"), connector__category="M.2 PCIe", quantity__gte=1,
+            ).values_list("connector__version", "connector__lanes").distinct()
+        ))
+
+    def mobo_ram_types(self):
+        capability = self.mobo_capability()
+        return capability.ram_type_set if capability else set()
+
+    def mobo_pcie_lanes(self):
+        # najszerszy slot PCIe płyty; None, gdy płyta nie ma PCIe
+        capability = self.mobo_capability()
+        return capability.gpu_slot_lanes if capability else None
+
+    def case_mobo_form_factors(self):
+        return self._memoize(
+            "case_mobo_form_factors",
+            lambda: list(self.get("case").mobo_form_factor_support.all()),
+        )
+
+    def case_psu_form_factors(self):
+        return self._memoize(
+            "case_psu_form_factors",
+            lambda: list(self.get("case").psu_form_factor_support.all()),
+        )
@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from django.conf import settings
+from django.db import connection
+
+from core.services.builder_service import SearchProgress
+from core.services.result_cache_service import BuilderResultCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BuilderJob:
+    id: str
+    key: str
+    status: str = "pending"
+    progress: SearchProgress = field(default_factory=SearchProgress)
+    # (dane, status HTTP) - ten sam kształt co wpisy BuilderResultCache
+    result: Optional[tuple] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+
+class BuilderJobService:
+    """Wyszukiwania buildera wykonywane w tle, w lokalnej puli wątków (bez brokera).
+
+    Zadania o tym samym kluczu BuilderResultCache, które jeszcze trwają, są
+    współdzielone; wynik trafia też do cache, więc synchroniczne /api/builder/
+    korzysta z niego od razu. Zakończone zadania są trzymane w pamięci procesu
+    (najnowsze MAX_FINISHED), więc przy kilku workerach odpytywanie musi trafiać
+    do tego samego procesu.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    MAX_FINISHED = 256
+
+    _lock = threading.Lock()
+    _jobs: OrderedDict = OrderedDict()
+    _inflight: dict = {}
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def get_workers() -> int:
+        return getattr(settings, "BUILDER_JOB_WORKERS", 2)
+
+    @staticmethod
+    def submit(key: str, compute) -> BuilderJob:
+        """`compute(progress)` zwraca (dane, status HTTP)."""
+        with BuilderJobService._lock:
+            job_id = BuilderJobService._inflight.get(key)
+            if job_id is not None:
+                return BuilderJobService._jobs[job_id]
+
+            job = BuilderJob(id=uuid.uuid4().hex, key=key)
+            BuilderJobService._jobs[job.id] = job
+            BuilderJobService._inflight[key] = job.id
+
+        workers = BuilderJobService.get_workers()
+        if workers < 1:
+            # bez puli (np. w testach): zadanie liczone od razu w bieżącym wątku
+            BuilderJobService._run(job, compute, close_connection=False)
+        else:
+            BuilderJobService._get_executor(workers).submit(BuilderJobService._run, job, compute)
+        return job
+
+    @staticmethod
+    def get(job_id: str) -> Optional[BuilderJob]:
+        with BuilderJobService._lock:
+            return BuilderJobService._jobs.get(job_id)
+
+    @staticmethod
+    def clear():
+        with BuilderJobService._lock:
+            executor = BuilderJobService._executor
+            BuilderJobService._executor = None
+            BuilderJobService._jobs = OrderedDict()
+            BuilderJobService._inflight = {}
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def _get_executor(workers: int) -> ThreadPoolExecutor:
+        with BuilderJobService._lock:
+            if BuilderJobService._executor is None:
+                BuilderJobService._executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="builder-job",
+                )
+            return BuilderJobService._executor
+
+    @staticmethod
+    def _run(job: BuilderJob, compute, close_connection: bool = True):
+        job.status = BuilderJobService.STATUS_RUNNING
+        try:
+            job.result = BuilderResultCache.get_default().get_or_compute(
+                job.key, lambda: compute(job.progress),
+            )
+            job.status = BuilderJobService.STATUS_DONE
+        except Exception:
+            logger.exception("Builder job %s failed", job.id)
+            job.status = BuilderJobService.STATUS_FAILED
+        finally:
+            job.finished_at = time.time()
+            with BuilderJobService._lock:
+                if BuilderJobService._inflight.get(job.key) == job.id:
+                    del BuilderJobService._inflight[job.key]
+                BuilderJobService._prune()
+            if close_connection:
+                connection.close()
+
+    @staticmethod
+    def _prune():
+        finished = [
+            job_id for job_id, job in BuilderJobService._jobs.items() if job.finished_at is not None
+        ]
+        for job_id in finished[: max(0, len(finished) - BuilderJobService.MAX_FINISHED)]:
+            del BuilderJobService._jobs[job_id]
+
+    @staticmethod
+    def as_dict(job: BuilderJob) -> dict:
+        data = {
+            "id": job.id,
+            "status": job.status,
+            "progress": job.progress.as_dict(),
+        }
+        if job.result is not None:
+            data["result"], data["result_status"] = job.result
+        if job.status == BuilderJobService.STATUS_FAILED:
+            data["error"] = "search_failed"
+        return data
@@ -1,10 +1,17 @@
-from dataclasses import dataclass
+import hashlib
+import heapq
+import itertools
+from dataclasses import dataclass, fields
 from decimal import Decimal
-from typing import Optional, Tuple
+from typing import Optional
+
+from django.conf import settings
 
 from core.models import CPU, GPU, Motherboard, RAM, Storage, PSU, Case
-from core.services.psu_service import PSUService
-from core.services.case_service import CaseService
+from core.services.catalog_service import (
+    CatalogService, CatalogSnapshot, CPUEntry, GPUEntry, MotherboardEntry,
+)
+from core.services.parallel_search_service import ParallelSearchService
 
 
 @dataclass
@@ -20,11 +27,128 @@ class BuildResult:
     score: float
 
 
+@dataclass
+class BuildCandidate:
+    cpu_id: int
+    gpu_id: int
+    motherboard_id: int
+    ram_id: int
+    storage_id: int
+    psu_id: int
+    case_id: int
+    total_price: Decimal
+    score: float
+
+    def component_ids(self) -> tuple:
+        return (
+            self.cpu_id, self.gpu_id, self.motherboard_id, self.ram_id,
+            self.storage_id, self.psu_id, self.case_id,
+        )
+
+
+@dataclass(frozen=True)
+class BuildConstraints:
+    """Dozwolone ID komponentów per kategoria (None = bez ograniczeń): przypięte części i filtry."""
+    cpu: Optional[frozenset] = None
+    gpu: Optional[frozenset] = None
+    motherboard: Optional[frozenset] = None
+    ram: Optional[frozenset] = None
+    storage: Optional[frozenset] = None
+    psu: Optional[frozenset] = None
+    case: Optional[frozenset] = None
+
+    def as_dict(self) -> dict:
+        return {
+            field.name: getattr(self, field.name)
+            for field in fields(self)
+            if getattr(self, field.name) is not None
+        }
+
+    def __bool__(self):
+        return bool(self.as_dict())
+
+    def cache_key(self) -> str:
+        # z samych zbiorów ID: różne filtry dające ten sam wybór trafiają w ten sam wpis
+        text = ";".join(f"{name}={','.join(map(str, sorted(ids)))}" for name, ids in self.as_dict().items())
+        return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+class TopBuilds:
+    """Bounded min-heap of the K best candidates (score, then higher total price)."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap = []
+        self._seen = set()
+        self._counter = itertools.count()
+
+    def can_accept(self, score_bound) -> bool:
+        if len(self._heap) < self.k:
+            return True
+        return score_bound >= self._heap[0][0]
+
+    def offer(self, candidate: "BuildCandidate"):
+        key = candidate.component_ids()
+        if key in self._seen:
+            return
+        # przy pełnym remisie wygrywa kandydat znaleziony wcześniej
+        item = (candidate.score, candidate.total_price, -next(self._counter), candidate)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[:3] > self._heap[0][:3]:
+            _, _, _, dropped = heapq.heapreplace(self._heap, item)
+            self._seen.discard(dropped.component_ids())
+        else:
+            return
+        self._seen.add(key)
+
+    def results(self) -> list["BuildCandidate"]:
+        return [item[3] for item in sorted(self._heap, key=lambda item: item[:3], reverse=True)]
+
+
+class SearchProgress:
+    """Postęp wyszukiwania, odczytywany z innego wątku (zadania /api/builder/jobs/)."""
+
+    def __init__(self):
+        self.gpus_total = 0
+        self.gpus_done = 0
+        self.candidates = 0
+        self.best: Optional[BuildCandidate] = None
+
+    def offer(self, candidate: BuildCandidate):
+        if self.best is None or (candidate.score, candidate.total_price) > (self.best.score, self.best.total_price):
+            self.best = candidate
+
+    def as_dict(self) -> dict:
+        best = self.best
+        return {
+            "gpus_total": self.gpus_total,
+            "gpus_done": self.gpus_done,
+            "candidates_explored": self.candidates,
+            "best": {"score": best.score, "total_price": str(best.total_price)} if best else None,
+        }
+
+
 class BuildBuilderService:
     GPU_LIMIT = 20
     CPU_LIMIT = 25
     MOBO_LIMIT = 25
 
+    MODE_FIRST_FIT = "first_fit"
+    MODE_OPTIMAL = "optimal"
+    MODES = (MODE_FIRST_FIT, MODE_OPTIMAL)
+    MAX_TOP_K = 10
+
+    COMPONENT_FIELDS = ("cpu", "gpu", "motherboard", "ram", "storage", "psu", "case")
+    # pole -> słownik rekordów CatalogSnapshot
+    SNAPSHOT_ATTRIBUTES = {
+        "cpu": "cpus", "gpu": "gpus", "motherboard": "motherboards", "ram": "rams",
+        "storage": "storages", "psu": "psus", "case": "cases",
+    }
+
+    # (target_ram_gb, target_storage_gb) zwracane przez get_targets
+    TARGET_TIERS = ((16, 1000), (32, 2000), (64, 2000))
+
     @staticmethod
     def get_targets(budget: Decimal) -> tuple[int, int]:
         if budget > 10000:
@@ -34,7 +158,10 @@ class BuildBuilderService:
         return 16, 1000
 
     @staticmethod
-    def build(budget: int) -> Optional[BuildResult]:
+    def build(
+        budget: int, mode: str = MODE_FIRST_FIT, progress: SearchProgress = None,
+        constraints: BuildConstraints = None,
+    ) -> Optional[BuildResult]:
         try:
             budget_value = Decimal(budget)
         except Exception:
@@ -43,67 +170,215 @@ class BuildBuilderService:
         if budget_value <= 0:
             return None
 
-        target_ram_gb, target_storage_gb = BuildBuilderService.get_targets(budget_value)
+        snapshot = BuildBuilderService.get_snapshot(constraints)
+        if mode == BuildBuilderService.MODE_OPTIMAL:
+            candidate = BuildBuilderService.search_optimal(snapshot, budget_value, progress)
+        else:
+            candidate = BuildBuilderService.search(snapshot, budget_value)
+        if not candidate:
+            return None
+        return BuildBuilderService._load_results([candidate])[0]
+
+    @staticmethod
+    def build_top(
+        budget: int, k: int, progress: SearchProgress = None, constraints: BuildConstraints = None,
+    ) -> list[BuildResult]:
+        try:
+            budget_value = Decimal(budget)
+        except Exception:
+            return []
+
+        if budget_value <= 0 or k <= 0:
+            return []
 
-        gpus = list(
-            GPU.objects.select_related("graphics_chip")
-            .filter(
-                price__isnull=False,
-                graphics_chip__isnull=False,
-                graphics_chip__pcie_max_gen__isnull=False,
-                recommended_system_power_w__isnull=False,
-            )
+        k = min(k, BuildBuilderService.MAX_TOP_K)
+        candidates = BuildBuilderService.search_top(
+            BuildBuilderService.get_snapshot(constraints), budget_value, k, progress=progress,
         )
-        gpus.sort(key=lambda gpu: (-BuildBuilderService._safe_tier_score(gpu), gpu.price))
+        return BuildBuilderService._load_results(candidates)
 
-        best_result = None
+    @staticmethod
+    def get_snapshot(constraints: BuildConstraints = None) -> CatalogSnapshot:
+        # ograniczenia zawężają katalog przed wyszukiwaniem, a nie odrzucają gotowe zestawy
+        snapshot = CatalogService.get_snapshot()
+        if not constraints:
+            return snapshot
+        return snapshot.restrict(constraints.as_dict())
+
+    @staticmethod
+    def can_use(snapshot: CatalogSnapshot, field: str, pk: int) -> bool:
+        """Czy komponent (pole BuildConstraints) może trafić do jakiegokolwiek zestawu."""
+        entry = getattr(snapshot, BuildBuilderService.SNAPSHOT_ATTRIBUTES[field]).get(pk)
+        if entry is None:
+            return False
+        # jak w pick_ram / pick_storage: komplety 2 modułów i dyski M.2 PCIe, od najniższego celu
+        min_ram_gb, min_storage_gb = BuildBuilderService.TARGET_TIERS[0]
+        if field == "ram":
+            return entry.modules_count == 2 and entry.total_capacity >= min_ram_gb
+        if field == "storage":
+            return (
+                entry.category == "M.2 PCIe"
+                and entry.version in snapshot.storages_by_pcie_gen
+                and entry.capacity_gb >= min_storage_gb
+            )
+        return True
 
-        for gpu in gpus[: BuildBuilderService.GPU_LIMIT]:
-            pcie_gen = gpu.graphics_chip.pcie_max_gen
-            if not pcie_gen:
+    @staticmethod
+    def compare(result: BuildResult, reference: BuildResult) -> list[dict]:
+        differences = []
+        for field in BuildBuilderService.COMPONENT_FIELDS:
+            component = getattr(result, field)
+            reference_component = getattr(reference, field)
+            if component.pk == reference_component.pk:
                 continue
 
-            cpu_candidates = (
-                CPU.objects.filter(
-                    price__isnull=False,
-                    supported_pcie__version=pcie_gen,
-                )
-                .prefetch_related("supported_ram", "supported_pcie")
-                .distinct()
-            )
-            cpu_list = list(cpu_candidates)
-            cpu_list.sort(
-                key=lambda cpu: (
-                    0 if BuildBuilderService._cpu_supports_ram_type(cpu, "DDR5") else 1,
-                    -BuildBuilderService._safe_tier_score(cpu),
-                    cpu.price,
-                )
-            )
+            price_delta = component.price - reference_component.price
+            if price_delta < 0:
+                change = "cheaper"
+            elif price_delta > 0:
+                change = "more_expensive"
+            else:
+                change = "different"
+            differences.append({
+                "component": field,
+                "change": change,
+                "price_delta": price_delta,
+            })
+        return differences
+
+    @staticmethod
+    def search(snapshot: CatalogSnapshot, budget: Decimal) -> Optional[BuildCandidate]:
+        target_ram_gb, target_storage_gb = BuildBuilderService.get_targets(budget)
+
+        best_result = None
+
+        for gpu in snapshot.gpus_ranked[: BuildBuilderService.GPU_LIMIT]:
+            cpu_list = snapshot.cpus_by_pcie_gen.get(gpu.pcie_gen, [])
 
             for cpu in cpu_list[: BuildBuilderService.CPU_LIMIT]:
                 result = BuildBuilderService._try_build_for_cpu_gpu(
+                    snapshot=snapshot,
                     cpu=cpu,
                     gpu=gpu,
-                    pcie_gen=pcie_gen,
                     target_ram_gb=target_ram_gb,
                     target_storage_gb=target_storage_gb,
-                    budget=budget_value,
+                    budget=budget,
                 )
-                if not result:
+                if result and BuildBuilderService._is_better(result, best_result):
+                    best_result = result
+
+        return best_result
+
+    @staticmethod
+    def search_optimal(snapshot: CatalogSnapshot, budget: Decimal, progress: SearchProgress = None) -> Optional[BuildCandidate]:
+        builds = BuildBuilderService.search_top(snapshot, budget, k=1, progress=progress)
+        return builds[0] if builds else None
+
+    @staticmethod
+    def get_workers() -> int:
+        return max(1, getattr(settings, "BUILDER_WORKERS", 1) or 1)
+
+    @staticmethod
+    def search_top(
+        snapshot: CatalogSnapshot, budget: Decimal, k: int, workers: int = None, progress: SearchProgress = None,
+    ) -> list[BuildCandidate]:
+        workers = BuildBuilderService.get_workers() if workers is None else workers
+        # pula procesów jest związana z pełną migawką; zawężony katalog przeszukujemy na miejscu
+        if workers > 1 and not snapshot.restricted:
+            return ParallelSearchService.search_top(snapshot, budget, k, workers, progress)
+        return BuildBuilderService.search_shard(snapshot, budget, k, progress=progress)
+
+    @staticmethod
+    def search_shard(
+        snapshot: CatalogSnapshot, budget: Decimal, k: int, start: int = 0, step: int = 1,
+        progress: SearchProgress = None,
+    ) -> list[BuildCandidate]:
+        # Branch and bound po całym katalogu: gałęzie, których dolne ograniczenie ceny
+        # przekracza budżet albo których wynik nie może wejść do K najlepszych, są odcinane.
+        # start/step wybierają co step-tą kartę - tak dzielimy pracę między procesy.
+        target_ram_gb, target_storage_gb = BuildBuilderService.get_targets(budget)
+        min_ram_gb = BuildBuilderService._ram_target_fallbacks(target_ram_gb)[-1]
+        all_ram_types = frozenset(snapshot.rams_by_type)
+
+        top = TopBuilds(k)
+        gpus = snapshot.gpus_ranked[start::step]
+        if progress is not None:
+            progress.gpus_total += len(gpus)
+
+        for gpu in gpus:
+            if progress is not None:
+                progress.gpus_done += 1
+            max_cpu_score = snapshot.max_cpu_tier_score(gpu.pcie_gen)
+            if max_cpu_score is None:
+                continue
+            if not top.can_accept(gpu.tier_score + max_cpu_score):
+                continue
+
+            storage = BuildBuilderService._pick_storage(snapshot, gpu.pcie_gen, target_storage_gb)
+            if not storage:
+                continue
+
+            gpu_floor = BuildBuilderService._sum_floors(
+                gpu.price,
+                storage.price,
+                snapshot.cheapest_psu_price(gpu.power_w),
+                snapshot.cheapest_case_price(gpu.length_mm),
+            )
+            gpu_bound = BuildBuilderService._sum_floors(
+                gpu_floor,
+                snapshot.cheapest_cpu_price(gpu.pcie_gen),
+                snapshot.cheapest_motherboard_price(gpu.pcie_gen, gpu.pcie_width),
+                snapshot.cheapest_ram_price(all_ram_types, min_ram_gb),
+            )
+            if gpu_bound is None or gpu_bound > budget:
+                continue
+
+            for cpu in snapshot.cpus_by_pcie_gen[gpu.pcie_gen]:
+                if not top.can_accept(cpu.tier_score + gpu.tier_score):
                     continue
 
-                if best_result is None:
-                    best_result = result
+                mobo_list = snapshot.compatible_motherboards(cpu, gpu)
+                if not mobo_list:
                     continue
 
-                if result.score > best_result.score:
-                    best_result = result
+                cpu_floor = BuildBuilderService._sum_floors(
+                    gpu_floor,
+                    cpu.price,
+                    snapshot.cheapest_ram_price(cpu.ram_types, min_ram_gb),
+                )
+                if cpu_floor is None:
                     continue
 
-                if result.score == best_result.score and result.total_price > best_result.total_price:
-                    best_result = result
+                for mobo in mobo_list:
+                    # płyty są posortowane po cenie, więc dalej będzie tylko drożej
+                    if cpu_floor + mobo.price > budget:
+                        break
 
-        return best_result
+                    result = BuildBuilderService._complete_build(
+                        snapshot, cpu, gpu, mobo, target_ram_gb, target_storage_gb,
+                    )
+                    if progress is not None:
+                        progress.candidates += 1
+                    if result and result.total_price <= budget:
+                        top.offer(result)
+                        if progress is not None:
+                            progress.offer(result)
+
+        return top.results()
+
+    @staticmethod
+    def _is_better(result: BuildCandidate, best_result: Optional[BuildCandidate]) -> bool:
+        if best_result is None:
+            return True
+        if result.score != best_result.score:
+            return result.score > best_result.score
+        return result.total_price > best_result.total_price
+
+    @staticmethod
+    def _sum_floors(*prices) -> Optional[Decimal]:
+        if any(price is None for price in prices):
+            return None
+        return sum(prices, Decimal("0"))
 
     @staticmethod
     def _ram_target_fallbacks(target_ram_gb: int) -> list[int]:
@@ -121,159 +396,110 @@ class BuildBuilderService:
 
     @staticmethod
     def _try_build_for_cpu_gpu(
-        cpu: CPU,
-        gpu: GPU,
-        pcie_gen: int,
+        snapshot: CatalogSnapshot,
+        cpu: CPUEntry,
+        gpu: GPUEntry,
         target_ram_gb: int,
         target_storage_gb: int,
         budget: Decimal,
-    ) -> Optional[BuildResult]:
-        mobo_candidates = Motherboard.objects.filter(
-            price__isnull=False,
-            socket=cpu.socket,
-        ).prefetch_related("supported_ram", "motherboardconnector_set__connector")
-
-        mobo_list = [
-            mobo
-            for mobo in mobo_candidates
-            if BuildBuilderService._mobo_supports_pcie(mobo, pcie_gen, gpu.graphics_chip.pcie_max_width)
-        ]
-        mobo_list.sort(key=lambda mobo: mobo.price)
+    ) -> Optional[BuildCandidate]:
+        mobo_list = snapshot.compatible_motherboards(cpu, gpu)
 
         for mobo in mobo_list[: BuildBuilderService.MOBO_LIMIT]:
-            ram = None
-            for ram_target in BuildBuilderService._ram_target_fallbacks(target_ram_gb):
-                ram = BuildBuilderService._pick_ram(cpu, mobo, ram_target)
-                if ram:
-                    break
-            if not ram:
-                continue
-
-            storage = None
-            for storage_target in BuildBuilderService._storage_target_fallbacks(target_storage_gb):
-                storage = BuildBuilderService._pick_storage(mobo, pcie_gen, storage_target)
-                if storage:
-                    break
-            if not storage:
-                continue
-
-            psu, case = BuildBuilderService._pick_psu_and_case(cpu, gpu, mobo)
-            if not psu or not case:
-                continue
-
-            total_price = BuildBuilderService._sum_prices(
-                cpu, gpu, mobo, ram, storage, psu, case
-            )
-            if total_price is None or total_price > budget:
-                continue
-
-            score = float(
-                BuildBuilderService._safe_tier_score(cpu)
-                + BuildBuilderService._safe_tier_score(gpu)
-            )
-            return BuildResult(
-                cpu=cpu,
-                gpu=gpu,
-                motherboard=mobo,
-                ram=ram,
-                storage=storage,
-                psu=psu,
-                case=case,
-                total_price=total_price,
-                score=score,
+            result = BuildBuilderService._complete_build(
+                snapshot, cpu, gpu, mobo, target_ram_gb, target_storage_gb,
             )
+            if result and result.total_price <= budget:
+                return result
 
         return None
 
     @staticmethod
-    def _sum_prices(*items) -> Optional[Decimal]:
-        total = Decimal("0")
-        for item in items:
-            price = getattr(item, "price", None)
-            if price is None:
-                return None
-            total += Decimal(price)
-        return total
-
-    @staticmethod
-    def _safe_tier_score(item) -> int:
-        try:
-            return int(item.tier_score or 0)
-        except Exception:
-            return 0
-
-    @staticmethod
-    def _cpu_supports_ram_type(cpu: CPU, ram_type: str) -> bool:
-        return any(base.type == ram_type for base in cpu.supported_ram.all())
+    def _pick_storage(snapshot: CatalogSnapshot, pcie_gen: int, target_storage_gb: int):
+        for storage_target in BuildBuilderService._storage_target_fallbacks(target_storage_gb):
+            storage = snapshot.pick_storage(pcie_gen, storage_target)
+            if storage:
+                return storage
+        return None
 
     @staticmethod
-    def _mobo_supports_pcie(mobo: Motherboard, pcie_gen: int, gpu_width: int) -> bool:
-        connectors = list(mobo.motherboardconnector_set.all())
-        has_gpu_slot = False
-        has_storage_slot = False
-
-        for conn in connectors:
-            connector = conn.connector
-            if connector.category == "PCIe" and connector.version == pcie_gen:
-                if connector.lanes >= gpu_width and conn.quantity >= 1:
-                    has_gpu_slot = True
-            if connector.category == "M.2 PCIe" and connector.version == pcie_gen:
-                if conn.quantity >= 1:
-                    has_storage_slot = True
-
-        return has_gpu_slot and has_storage_slot
+    def _complete_build(
+        snapshot: CatalogSnapshot,
+        cpu: CPUEntry,
+        gpu: GPUEntry,
+        mobo: MotherboardEntry,
+        target_ram_gb: int,
+        target_storage_gb: int,
+    ) -> Optional[BuildCandidate]:
+        ram = None
+        for ram_target in BuildBuilderService._ram_target_fallbacks(target_ram_gb):
+            ram = snapshot.pick_ram(cpu, mobo, ram_target)
+            if ram:
+                break
+        if not ram:
+            return None
 
-    @staticmethod
-    def _pick_ram(cpu: CPU, mobo: Motherboard, target_ram_gb: int) -> Optional[RAM]:
-        cpu_types = set(cpu.supported_ram.values_list("type", flat=True).distinct())
-        mobo_types = set(mobo.supported_ram.values_list("type", flat=True).distinct())
-        allowed_types = cpu_types.intersection(mobo_types)
-        if not allowed_types:
+        storage = BuildBuilderService._pick_storage(snapshot, gpu.pcie_gen, target_storage_gb)
+        if not storage:
             return None
-        qs = RAM.objects.select_related("base").filter(
-            price__isnull=False,
-            modules_count=2,
-            total_capacity__gte=target_ram_gb,
-            base__type__in=allowed_types,
-            total_capacity__lte=mobo.max_ram_capacity,
-        )
-        if cpu.max_internal_memory_gb:
-            qs = qs.filter(total_capacity__lte=cpu.max_internal_memory_gb)
 
-        preferred = qs.filter(base__type="DDR5")
-        if preferred.exists():
-            qs = preferred
+        psu, case = snapshot.pick_psu_and_case(gpu, mobo)
+        if not psu or not case:
+            return None
 
-        return qs.order_by("price", "total_capacity").first()
+        total_price = BuildBuilderService._sum_prices(
+            cpu, gpu, mobo, ram, storage, psu, case
+        )
+        if total_price is None:
+            return None
 
-    @staticmethod
-    def _pick_storage(mobo: Motherboard, pcie_gen: int, target_storage_gb: int) -> Optional[Storage]:
-        qs = Storage.objects.select_related("connector").filter(
-            price__isnull=False,
-            capacity_gb__gte=target_storage_gb,
-            connector__category="M.2 PCIe",
-            connector__version=pcie_gen,
+        score = float(cpu.tier_score + gpu.tier_score)
+        return BuildCandidate(
+            cpu_id=cpu.id,
+            gpu_id=gpu.id,
+            motherboard_id=mobo.id,
+            ram_id=ram.id,
+            storage_id=storage.id,
+            psu_id=psu.id,
+            case_id=case.id,
+            total_price=total_price,
+            score=score,
         )
 
-        return qs.order_by("price", "capacity_gb").first()
+    @staticmethod
+    def _load_results(candidates: list[BuildCandidate]) -> list[BuildResult]:
+        def load(queryset, field):
+            return queryset.in_bulk({getattr(candidate, f"{field}_id") for candidate in candidates})
+
+        cpus = load(CPU.objects.all(), "cpu")
+        gpus = load(GPU.objects.select_related("graphics_chip"), "gpu")
+        mobos = load(Motherboard.objects.all(), "motherboard")
+        rams = load(RAM.objects.select_related("base"), "ram")
+        storages = load(Storage.objects.select_related("connector"), "storage")
+        psus = load(PSU.objects.all(), "psu")
+        cases = load(Case.objects.all(), "case")
+
+        return [
+            BuildResult(
+                cpu=cpus[candidate.cpu_id],
+                gpu=gpus[candidate.gpu_id],
+                motherboard=mobos[candidate.motherboard_id],
+                ram=rams[candidate.ram_id],
+                storage=storages[candidate.storage_id],
+                psu=psus[candidate.psu_id],
+                case=cases[candidate.case_id],
+                total_price=candidate.total_price,
+                score=candidate.score,
+            )
+            for candidate in candidates
+        ]
 
     @staticmethod
-    def _pick_psu_and_case(
-        cpu: CPU,
-        gpu: GPU,
-        mobo: Motherboard,
-    ) -> Tuple[Optional[PSU], Optional[Case]]:
-        psu_candidates = PSUService.get_compatible_psus(
-            data={"gpu": gpu.id, "cpu": cpu.id, "mobo": mobo.id}
-        ).filter(price__isnull=False)
-
-        for psu in psu_candidates.order_by("price"):
-            case_qs = CaseService.get_compatible_cases(
-                data={"mobo": mobo.id, "psu": psu.id, "gpu": gpu.id}
-            ).filter(price__isnull=False)
-
-            case = case_qs.order_by("price").first()
-            if case:
-                return psu, case
-
-        return None, None
+    def _sum_prices(*items) -> Optional[Decimal]:
+        total = Decimal("0")
+        for item in items:
+            price = getattr(item, "price", None)
+            if price is None:
+                return None
+            total += Decimal(price)
+        return total
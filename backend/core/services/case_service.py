@@ -1,41 +1,27 @@
 from core.models import Case, Motherboard, PSU, GPU
+from core.services.build_selection import BuildSelection
 
 
 class CaseService:
     
     @staticmethod
-    def get_compatible_cases(data: dict[str, int]):
+    def get_compatible_cases(data: dict[str, int], selection: BuildSelection = None):
         qs = Case.objects.all()
+        selection = selection or BuildSelection(data)
         
-        mobo_pk = data.get("mobo")
-        psu_pk = data.get("psu")
-        gpu_pk = data.get("gpu")
-        
-        if mobo_pk:
-            mobo_form_factor = (
-                Motherboard.objects
-                .filter(pk=mobo_pk)
-                .values_list("form_factor", flat=True)
-                .first()
-            )
+        if selection.pk("mobo"):
+            mobo = selection.get("mobo")
+            mobo_form_factor = mobo.form_factor_id if mobo else None
             qs = qs.filter(mobo_form_factor_support=mobo_form_factor)
             
-        if psu_pk:
-            psu_form_factor = (
-                PSU.objects
-                .filter(pk=psu_pk)
-                .values_list("form_factor", flat=True)
-                .first()
-            )
+        if selection.pk("psu"):
+            psu = selection.get("psu")
+            psu_form_factor = psu.form_factor_id if psu else None
             qs = qs.filter(psu_form_factor_support=psu_form_factor)
             
-        if gpu_pk:
-            gpu_length = (
-                GPU.objects
-                .filter(pk=gpu_pk)
-                .values_list("length_mm", flat=True)
-                .first()
-            )
+        if selection.pk("gpu"):
+            gpu = selection.get("gpu")
+            gpu_length = gpu.length_mm if gpu else None
             qs = qs.filter(max_gpu_length_mm__gte=gpu_length)
         
         return qs
\ No newline at end of file
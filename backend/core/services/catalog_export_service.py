@@ -0,0 +1,135 @@
+import gzip
+import json
+import threading
+from decimal import Decimal
+from typing import Optional
+
+from core.models import (
+    CPU, GPU, Motherboard, RAM, Storage, PSU, Case, Manufacturer, Socket, RAMBase,
+    Connector, GraphicsChip, MotherboardFormFactor, PSUFormFactor,
+)
+from core.services.catalog_service import CatalogService
+
+
+class CatalogExport:
+    def __init__(self, version: int, body: bytes):
+        self.version = version
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+
+
+class CatalogExportService:
+    """Kolumnowy zrzut katalogu dla filtrowania po stronie klienta.
+
+    Każda tabela to {"ids": [...], "columns": {...}, "relations": {...}}:
+    liczby jako tablice, napisy zakodowane słownikiem ({"values": [...], "codes": [...]}),
+    klucze obce jako tablice ID, a relacje M2M jako listy ID dla każdego wiersza.
+    """
+
+    TABLES = (
+        ("cpus", CPU),
+        ("gpus", GPU),
+        ("motherboards", Motherboard),
+        ("rams", RAM),
+        ("mems", Storage),
+        ("psus", PSU),
+        ("cases", Case),
+        ("manufacturers", Manufacturer),
+        ("sockets", Socket),
+        ("rambases", RAMBase),
+        ("connectors", Connector),
+        ("graphicschips", GraphicsChip),
+        ("motherboardformfactors", MotherboardFormFactor),
+        ("psuformfactors", PSUFormFactor),
+    )
+
+    TEXT_FIELD_TYPES = {"CharField", "TextField", "SlugField"}
+    SKIPPED_FIELD_TYPES = {"JSONField"}
+
+    _lock = threading.Lock()
+    _export: Optional[CatalogExport] = None
+
+    @staticmethod
+    def get_export() -> CatalogExport:
+        version = CatalogService.get_version()
+        with CatalogExportService._lock:
+            export = CatalogExportService._export
+            if export is None or export.version != version:
+                body = json.dumps(
+                    {"version": version, "tables": CatalogExportService.build_tables()},
+                    separators=(",", ":"),
+                ).encode()
+                export = CatalogExport(version, body)
+                CatalogExportService._export = export
+            return export
+
+    @staticmethod
+    def clear():
+        with CatalogExportService._lock:
+            CatalogExportService._export = None
+
+    @staticmethod
+    def build_tables() -> dict:
+        return {
+            name: CatalogExportService._build_table(model)
+            for name, model in CatalogExportService.TABLES
+        }
+
+    @staticmethod
+    def _build_table(model) -> dict:
+        scalar_fields = []
+        m2m_fields = []
+        for field in model._meta.get_fields():
+            if field.many_to_many and not field.auto_created:
+                m2m_fields.append(field)
+            elif getattr(field, "concrete", False) and field.name != "id":
+                if field.get_internal_type() not in CatalogExportService.SKIPPED_FIELD_TYPES:
+                    scalar_fields.append(field)
+
+        rows = list(
+            model.objects.order_by("id").values_list("id", *(field.attname for field in scalar_fields))
+        )
+        ids = [row[0] for row in rows]
+
+        columns = {}
+        for offset, field in enumerate(scalar_fields, start=1):
+            values = [row[offset] for row in rows]
+            if field.get_internal_type() in CatalogExportService.TEXT_FIELD_TYPES:
+                columns[field.name] = CatalogExportService._dictionary_encode(values)
+            else:
+                columns[field.attname] = [CatalogExportService._number(value) for value in values]
+
+        relations = {}
+        for field in m2m_fields:
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            related = {pk: [] for pk in ids}
+            pairs = through.objects.order_by(f"{source}_id", f"{target}_id").values_list(
+                f"{source}_id", f"{target}_id"
+            )
+            for pk, related_pk in pairs.distinct():
+                if pk in related:
+                    related[pk].append(related_pk)
+            relations[field.name] = [related[pk] for pk in ids]
+
+        return {"ids": ids, "columns": columns, "relations": relations}
+
+    @staticmethod
+    def _dictionary_encode(values) -> dict:
+        dictionary = {}
+        codes = []
+        for value in values:
+            if value is None:
+                codes.append(None)
+                continue
+            codes.append(dictionary.setdefault(value, len(dictionary)))
+        return {"values": list(dictionary), "codes": codes}
+
+    @staticmethod
+    def _number(value):
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, Decimal):
+            return float(value)
+        return value
@@ -0,0 +1,648 @@
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+
+from django.core.cache import cache
+
+from core.models import (
+    CPU, GPU, Motherboard, RAM, Storage, PSU, Case, MotherboardConnector,
+    CPUSupportedPCIe, PSUConnectorItem,
+)
+from core.services.psu_service import PSUService
+
+
+@dataclass(frozen=True, slots=True)
+class CPUEntry:
+    id: int
+    price: Decimal
+    socket_id: int
+    tier_score: int
+    ram_types: frozenset
+    max_memory_gb: Optional[int]
+    pcie_gens: frozenset
+    integrated_gpu: bool
+
+
+@dataclass(frozen=True, slots=True)
+class GPUEntry:
+    id: int
+    price: Decimal
+    tier_score: int
+    pcie_gen: int
+    pcie_width: int
+    power_w: int
+    length_mm: int
+
+
+@dataclass(frozen=True, slots=True)
+class MotherboardEntry:
+    id: int
+    price: Decimal
+    socket_id: int
+    form_factor_id: int
+    ram_types: frozenset
+    max_ram_capacity: int
+    gpu_slots: tuple
+    m2_pcie_gens: frozenset
+    power_requirements: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class RAMEntry:
+    id: int
+    price: Decimal
+    ram_type: str
+    modules_count: int
+    total_capacity: int
+
+
+@dataclass(frozen=True, slots=True)
+class StorageEntry:
+    id: int
+    price: Decimal
+    capacity_gb: int
+    category: str
+    version: Optional[Decimal]
+    type: str
+
+
+@dataclass(frozen=True, slots=True)
+class PSUEntry:
+    id: int
+    price: Decimal
+    wattage: int
+    form_factor_id: int
+    connector_items: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class CaseEntry:
+    id: int
+    price: Decimal
+    max_gpu_length_mm: int
+    mobo_form_factor_ids: frozenset
+    psu_form_factor_ids: frozenset
+
+
+class CatalogSnapshot:
+    """Priced catalog loaded once into plain records plus index maps used by the builder."""
+
+    def __init__(self, version, ids: Optional[dict] = None):
+        self.version = version
+        # None = cały katalog z cenami; {kategoria: ID} = tylko te komponenty (load_components)
+        self._ids = ids
+        # True dla kopii z restrict()
+        self.restricted = False
+        self.cpus: dict[int, CPUEntry] = {}
+        self.gpus: dict[int, GPUEntry] = {}
+        self.motherboards: dict[int, MotherboardEntry] = {}
+        self.rams: dict[int, RAMEntry] = {}
+        self.storages: dict[int, StorageEntry] = {}
+        self.psus: dict[int, PSUEntry] = {}
+        self.cases: dict[int, CaseEntry] = {}
+
+        self.gpus_ranked: list[GPUEntry] = []
+        self.cpus_by_pcie_gen: dict = {}
+        self.motherboards_by_socket: dict = {}
+        self.rams_by_type: dict = {}
+        self.storages_by_pcie_gen: dict = {}
+        self.psus_by_price: list[PSUEntry] = []
+        self.cases_by_form_factors: dict = {}
+
+        self._ram_picks = {}
+        self._storage_picks = {}
+        self._motherboards_by_slot = {}
+        self._psus_by_motherboard = {}
+        self._psu_case_picks = {}
+        self._price_floors = {}
+
+    @classmethod
+    def load(cls, version) -> "CatalogSnapshot":
+        snapshot = cls(version)
+        snapshot._load_cpus()
+        snapshot._load_gpus()
+        snapshot._load_motherboards()
+        snapshot._load_rams()
+        snapshot._load_storages()
+        snapshot._load_psus()
+        snapshot._load_cases()
+        return snapshot
+
+    @classmethod
+    def load_components(cls, ids: dict) -> "CatalogSnapshot":
+        """Records for the given ids only ({"cpu": ids, "gpu": ids, ...}), without the builder's
+        filters: unpriced parts and GPUs missing power or PCIe data are included too.
+        """
+        snapshot = cls(None, ids=ids)
+        loaders = {
+            "cpu": snapshot._load_cpus,
+            "gpu": snapshot._load_gpus,
+            "motherboard": snapshot._load_motherboards,
+            "ram": snapshot._load_rams,
+            "storage": snapshot._load_storages,
+            "psu": snapshot._load_psus,
+            "case": snapshot._load_cases,
+        }
+        for category, load in loaders.items():
+            if ids.get(category):
+                load()
+        return snapshot
+
+    def _scope(self, category, prefix="") -> dict:
+        if self._ids is None:
+            return {f"{prefix}price__isnull": False}
+        return {f"{prefix}id__in": self._ids.get(category, ())}
+
+    def _load_cpus(self):
+        pcie_gens = defaultdict(set)
+        for cpu_id, version in CPUSupportedPCIe.objects.filter(
+            **self._scope("cpu", "cpu__"),
+        ).values_list("cpu_id", "connector__version"):
+            if version is not None:
+                pcie_gens[cpu_id].add(version)
+
+        ram_types = defaultdict(set)
+        for cpu_id, ram_type in CPU.supported_ram.through.objects.filter(
+            **self._scope("cpu", "cpu__"),
+        ).values_list("cpu_id", "rambase__type"):
+            ram_types[cpu_id].add(ram_type)
+
+        by_gen = defaultdict(list)
+        # kolejność z indeksu (tier_score, price); sortowanie niżej jest stabilne i tylko dokłada DDR5
+        for cpu in CPU.objects.filter(**self._scope("cpu")).order_by("-tier_score", "price", "id"):
+            entry = CPUEntry(
+                id=cpu.id,
+                price=cpu.price,
+                socket_id=cpu.socket_id,
+                tier_score=cpu.tier_score,
+                ram_types=frozenset(ram_types[cpu.id]),
+                max_memory_gb=cpu.max_internal_memory_gb,
+                pcie_gens=frozenset(pcie_gens[cpu.id]),
+                integrated_gpu=cpu.integrated_gpu,
+            )
+            self.cpus[entry.id] = entry
+            for gen in entry.pcie_gens:
+                by_gen[gen].append(entry)
+
+        for gen, entries in by_gen.items():
+            entries.sort(key=lambda cpu: 0 if "DDR5" in cpu.ram_types else 1)
+        self.cpus_by_pcie_gen = dict(by_gen)
+
+    def _load_gpus(self):
+        gpus = GPU.objects.select_related("graphics_chip").filter(**self._scope("gpu"))
+        if self._ids is None:
+            gpus = gpus.filter(
+                graphics_chip__isnull=False,
+                graphics_chip__pcie_max_gen__isnull=False,
+                recommended_system_power_w__isnull=False,
+            )
+        for gpu in gpus.order_by("-tier_score", "price", "id"):
+            chip = gpu.graphics_chip
+            entry = GPUEntry(
+                id=gpu.id,
+                price=gpu.price,
+                tier_score=gpu.tier_score,
+                pcie_gen=chip.pcie_max_gen if chip else None,
+                pcie_width=chip.pcie_max_width if chip else None,
+                power_w=gpu.recommended_system_power_w,
+                length_mm=gpu.length_mm,
+            )
+            self.gpus[entry.id] = entry
+
+        self.gpus_ranked = list(self.gpus.values())
+
+    def _load_motherboards(self):
+        gpu_slots = defaultdict(list)
+        m2_pcie_gens = defaultdict(set)
+        power_requirements = defaultdict(list)
+        links = MotherboardConnector.objects.filter(
+            **self._scope("motherboard", "motherboard__"),
+        ).values_list(
+            "motherboard_id", "quantity", "connector__category",
+            "connector__version", "connector__lanes", "connector__is_power",
+        ).order_by("id")
+        for mobo_id, quantity, category, version, lanes, is_power in links:
+            if is_power:
+                power_requirements[mobo_id].append(
+                    {"category": category, "lanes": lanes, "version": version}
+                )
+            if quantity < 1:
+                continue
+            if category == "PCIe":
+                gpu_slots[mobo_id].append((version, lanes))
+            elif category == "M.2 PCIe" and version is not None:
+                m2_pcie_gens[mobo_id].add(version)
+
+        ram_types = defaultdict(set)
+        for mobo_id, ram_type in Motherboard.supported_ram.through.objects.filter(
+            **self._scope("motherboard", "motherboard__"),
+        ).values_list("motherboard_id", "rambase__type"):
+            ram_types[mobo_id].add(ram_type)
+
+        by_socket = defaultdict(list)
+        for mobo in Motherboard.objects.filter(**self._scope("motherboard")).order_by("id"):
+            entry = MotherboardEntry(
+                id=mobo.id,
+                price=mobo.price,
+                socket_id=mobo.socket_id,
+                form_factor_id=mobo.form_factor_id,
+                ram_types=frozenset(ram_types[mobo.id]),
+                max_ram_capacity=mobo.max_ram_capacity,
+                gpu_slots=tuple(gpu_slots[mobo.id]),
+                m2_pcie_gens=frozenset(m2_pcie_gens[mobo.id]),
+                power_requirements=tuple(power_requirements[mobo.id]),
+            )
+            self.motherboards[entry.id] = entry
+            by_socket[entry.socket_id].append(entry)
+
+        for entries in by_socket.values():
+            entries.sort(key=lambda mobo: (mobo.price, mobo.id))
+        self.motherboards_by_socket = dict(by_socket)
+
+    def _load_rams(self):
+        by_type = defaultdict(list)
+        rams = RAM.objects.filter(**self._scope("ram")).values_list(
+            "id", "price", "base__type", "modules_count", "total_capacity",
+        ).order_by("id")
+        for ram_id, price, ram_type, modules_count, total_capacity in rams:
+            entry = RAMEntry(
+                id=ram_id,
+                price=price,
+                ram_type=ram_type,
+                modules_count=modules_count,
+                total_capacity=total_capacity,
+            )
+            self.rams[entry.id] = entry
+            by_type[entry.ram_type].append(entry)
+
+        for entries in by_type.values():
+            entries.sort(key=lambda ram: (ram.price, ram.total_capacity, ram.id))
+        self.rams_by_type = dict(by_type)
+
+    def _load_storages(self):
+        by_gen = defaultdict(list)
+        storages = Storage.objects.filter(**self._scope("storage")).values_list(
+            "id", "price", "capacity_gb", "connector__category", "connector__version",
+        ).order_by("id")
+        for storage_id, price, capacity_gb, category, version in storages:
+            entry = StorageEntry(
+                id=storage_id,
+                price=price,
+                capacity_gb=capacity_gb,
+                category=category,
+                version=version,
+                type=Storage.type_for_category(category),
+            )
+            self.storages[entry.id] = entry
+            if category == "M.2 PCIe" and version is not None:
+                by_gen[version].append(entry)
+
+        for entries in by_gen.values():
+            entries.sort(key=lambda storage: (storage.price, storage.capacity_gb, storage.id))
+        self.storages_by_pcie_gen = dict(by_gen)
+
+    def _load_psus(self):
+        items = defaultdict(list)
+        for item in PSUConnectorItem.objects.filter(**self._scope("psu", "psu__")).values(
+            "psu_id", "category", "lanes", "version",
+        ):
+            items[item["psu_id"]].append(item)
+
+        psus = PSU.objects.filter(**self._scope("psu")).values_list(
+            "id", "price", "wattage", "form_factor_id", "connectors", "connector_inventory_synced",
+        ).order_by("id")
+        for psu_id, price, wattage, form_factor_id, connectors, synced in psus:
+            entry = PSUEntry(
+                id=psu_id,
+                price=price,
+                wattage=wattage,
+                form_factor_id=form_factor_id,
+                # inwentarz nieprzeliczony (przed backfill_psu_connectors) - złącza z PSU.connectors
+                connector_items=tuple(
+                    items[psu_id] if synced else PSUService.normalize_connectors(connectors)
+                ),
+            )
+            self.psus[entry.id] = entry
+
+        self.psus_by_price = sorted(self.psus.values(), key=lambda psu: (psu.price, psu.id))
+
+    def _load_cases(self):
+        mobo_form_factors = defaultdict(set)
+        for case_id, form_factor_id in Case.mobo_form_factor_support.through.objects.filter(
+            **self._scope("case", "case__"),
+        ).values_list("case_id", "motherboardformfactor_id"):
+            mobo_form_factors[case_id].add(form_factor_id)
+
+        psu_form_factors = defaultdict(set)
+        for case_id, form_factor_id in Case.psu_form_factor_support.through.objects.filter(
+            **self._scope("case", "case__"),
+        ).values_list("case_id", "psuformfactor_id"):
+            psu_form_factors[case_id].add(form_factor_id)
+
+        by_form_factors = defaultdict(list)
+        cases = Case.objects.filter(**self._scope("case")).values_list(
+            "id", "price", "max_gpu_length_mm",
+        ).order_by("id")
+        for case_id, price, max_gpu_length_mm in cases:
+            entry = CaseEntry(
+                id=case_id,
+                price=price,
+                max_gpu_length_mm=max_gpu_length_mm,
+                mobo_form_factor_ids=frozenset(mobo_form_factors[case_id]),
+                psu_form_factor_ids=frozenset(psu_form_factors[case_id]),
+            )
+            self.cases[entry.id] = entry
+            for mobo_ff in entry.mobo_form_factor_ids:
+                for psu_ff in entry.psu_form_factor_ids:
+                    by_form_factors[(mobo_ff, psu_ff)].append(entry)
+
+        for entries in by_form_factors.values():
+            entries.sort(key=lambda case: (case.price, case.id))
+        self.cases_by_form_factors = dict(by_form_factors)
+
+    def restrict(self, allowed: dict) -> "CatalogSnapshot":
+        """Copy limited to allowed ids per category ({"cpu": ids, "case": ids, ...}; missing key = all).
+
+        Components that cannot fit any build with what is left are dropped as well (a pinned
+        case removes motherboards of other form factors and GPUs too long for it, a pinned
+        motherboard removes CPUs for other sockets, ...). Indexes keep their order, so the
+        builder searches the smaller catalog exactly as it would the full one.
+        """
+        def allows(category, entries):
+            ids = allowed.get(category)
+            return [entry for entry in entries if ids is None or entry.id in ids]
+
+        # tylko warunki konieczne sprawdzane przez builder - nic, co mogłoby trafić do zestawu, nie znika
+        cases = allows("case", self.cases.values())
+        mobo_form_factors = {form_factor for case in cases for form_factor in case.mobo_form_factor_ids}
+        psu_form_factors = {form_factor for case in cases for form_factor in case.psu_form_factor_ids}
+        max_gpu_length = max((case.max_gpu_length_mm for case in cases), default=None)
+
+        psus = [psu for psu in allows("psu", self.psus.values()) if psu.form_factor_id in psu_form_factors]
+        max_power = max((psu.wattage for psu in psus), default=None)
+
+        rams = allows("ram", self.rams.values())
+        ram_types = {ram.ram_type for ram in rams if ram.modules_count == 2}
+
+        storages = allows("storage", self.storages.values())
+        storage_gens = {
+            storage.version for storage in storages
+            if storage.category == "M.2 PCIe" and storage.version is not None
+        }
+
+        motherboards = [
+            mobo for mobo in allows("motherboard", self.motherboards.values())
+            if mobo.form_factor_id in mobo_form_factors and mobo.ram_types & ram_types
+        ]
+        sockets = {mobo.socket_id for mobo in motherboards}
+
+        cpus = [
+            cpu for cpu in allows("cpu", self.cpus.values())
+            if cpu.socket_id in sockets and cpu.ram_types & ram_types
+        ]
+        gpu_gens = {gen for cpu in cpus for gen in cpu.pcie_gens} & storage_gens
+
+        gpus = [
+            gpu for gpu in allows("gpu", self.gpus.values())
+            if gpu.pcie_gen in gpu_gens
+            and gpu.length_mm <= max_gpu_length
+            and gpu.power_w <= max_power
+        ] if cases and psus else []
+
+        kept = {
+            "cpu": {cpu.id for cpu in cpus},
+            "gpu": {gpu.id for gpu in gpus},
+            "motherboard": {mobo.id for mobo in motherboards},
+            "ram": {ram.id for ram in rams},
+            "storage": {storage.id for storage in storages},
+            "psu": {psu.id for psu in psus},
+            "case": {case.id for case in cases},
+        }
+
+        def keep(category, entries):
+            ids = kept[category]
+            return [entry for entry in entries if entry.id in ids]
+
+        def keep_index(category, index):
+            filtered = {key: keep(category, entries) for key, entries in index.items()}
+            return {key: entries for key, entries in filtered.items() if entries}
+
+        snapshot = CatalogSnapshot(self.version)
+        snapshot.restricted = True
+        snapshot.cpus = {cpu.id: cpu for cpu in cpus}
+        snapshot.gpus = {gpu.id: gpu for gpu in gpus}
+        snapshot.motherboards = {mobo.id: mobo for mobo in motherboards}
+        snapshot.rams = {ram.id: ram for ram in rams}
+        snapshot.storages = {storage.id: storage for storage in storages}
+        snapshot.psus = {psu.id: psu for psu in psus}
+        snapshot.cases = {case.id: case for case in cases}
+
+        snapshot.gpus_ranked = keep("gpu", self.gpus_ranked)
+        snapshot.cpus_by_pcie_gen = keep_index("cpu", self.cpus_by_pcie_gen)
+        snapshot.motherboards_by_socket = keep_index("motherboard", self.motherboards_by_socket)
+        snapshot.rams_by_type = keep_index("ram", self.rams_by_type)
+        snapshot.storages_by_pcie_gen = keep_index("storage", self.storages_by_pcie_gen)
+        snapshot.psus_by_price = keep("psu", self.psus_by_price)
+        snapshot.cases_by_form_factors = keep_index("case", self.cases_by_form_factors)
+        return snapshot
+
+    @staticmethod
+    def motherboard_supports_pcie(mobo: MotherboardEntry, pcie_gen: int, gpu_width: int) -> bool:
+        has_gpu_slot = any(
+            version == pcie_gen and lanes is not None and lanes >= gpu_width
+            for version, lanes in mobo.gpu_slots
+        )
+        return has_gpu_slot and pcie_gen in mobo.m2_pcie_gens
+
+    def compatible_motherboards(self, cpu: CPUEntry, gpu: GPUEntry) -> list[MotherboardEntry]:
+        key = (cpu.socket_id, gpu.pcie_gen, gpu.pcie_width)
+        mobos = self._motherboards_by_slot.get(key)
+        if mobos is None:
+            mobos = [
+                mobo
+                for mobo in self.motherboards_by_socket.get(cpu.socket_id, [])
+                if self.motherboard_supports_pcie(mobo, gpu.pcie_gen, gpu.pcie_width)
+            ]
+            self._motherboards_by_slot[key] = mobos
+        return mobos
+
+    def pick_ram(self, cpu: CPUEntry, mobo: MotherboardEntry, target_ram_gb: int) -> Optional[RAMEntry]:
+        allowed_types = cpu.ram_types & mobo.ram_types
+        if not allowed_types:
+            return None
+
+        max_capacity = mobo.max_ram_capacity
+        if cpu.max_memory_gb:
+            max_capacity = min(max_capacity, cpu.max_memory_gb)
+
+        key = (allowed_types, target_ram_gb, max_capacity)
+        if key not in self._ram_picks:
+            self._ram_picks[key] = self._find_ram(allowed_types, target_ram_gb, max_capacity)
+        return self._ram_picks[key]
+
+    def _find_ram(self, allowed_types, min_capacity, max_capacity) -> Optional[RAMEntry]:
+        def first_match(ram_type):
+            for ram in self.rams_by_type.get(ram_type, []):
+                if ram.modules_count == 2 and min_capacity <= ram.total_capacity <= max_capacity:
+                    return ram
+            return None
+
+        # DDR5 wins whenever any kit qualifies, as in the original ORM query
+        if "DDR5" in allowed_types:
+            preferred = first_match("DDR5")
+            if preferred:
+                return preferred
+
+        candidates = [ram for ram in map(first_match, allowed_types) if ram]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda ram: (ram.price, ram.total_capacity, ram.id))
+
+    def pick_storage(self, pcie_gen: int, target_storage_gb: int) -> Optional[StorageEntry]:
+        key = (pcie_gen, target_storage_gb)
+        if key not in self._storage_picks:
+            self._storage_picks[key] = next(
+                (
+                    storage
+                    for storage in self.storages_by_pcie_gen.get(pcie_gen, [])
+                    if storage.capacity_gb >= target_storage_gb
+                ),
+                None,
+            )
+        return self._storage_picks[key]
+
+    def psus_for_motherboard(self, mobo: MotherboardEntry) -> list[PSUEntry]:
+        # płyty o tych samych wymaganiach zasilania dzielą listę zasilaczy
+        key = tuple(
+            (requirement["category"], requirement["lanes"], requirement["version"])
+            for requirement in mobo.power_requirements
+        )
+        psus = self._psus_by_motherboard.get(key)
+        if psus is None:
+            psus = [
+                psu
+                for psu in self.psus_by_price
+                if all(
+                    PSUService.inventory_supports_connector(psu.connector_items, requirement)
+                    for requirement in mobo.power_requirements
+                )
+            ]
+            self._psus_by_motherboard[key] = psus
+        return psus
+
+    def pick_psu_and_case(self, gpu: GPUEntry, mobo: MotherboardEntry):
+        key = (mobo.id, gpu.power_w, gpu.length_mm)
+        if key not in self._psu_case_picks:
+            self._psu_case_picks[key] = self._find_psu_and_case(gpu, mobo)
+        return self._psu_case_picks[key]
+
+    def _find_psu_and_case(self, gpu: GPUEntry, mobo: MotherboardEntry):
+        for psu in self.psus_for_motherboard(mobo):
+            if psu.wattage < gpu.power_w:
+                continue
+            cases = self.cases_by_form_factors.get((mobo.form_factor_id, psu.form_factor_id), [])
+            case = next(
+                (case for case in cases if case.max_gpu_length_mm >= gpu.length_mm),
+                None,
+            )
+            if case:
+                return psu, case
+        return None, None
+
+    # Dolne ograniczenia cen (ignorują część warunków zgodności), używane do przycinania gałęzi.
+
+    def _price_floor(self, key, compute):
+        if key not in self._price_floors:
+            self._price_floors[key] = compute()
+        return self._price_floors[key]
+
+    @staticmethod
+    def _min_price(items):
+        return min((item.price for item in items), default=None)
+
+    def max_cpu_tier_score(self, pcie_gen: int) -> Optional[int]:
+        return self._price_floor(
+            ("cpu_score", pcie_gen),
+            lambda: max((cpu.tier_score for cpu in self.cpus_by_pcie_gen.get(pcie_gen, [])), default=None),
+        )
+
+    def cheapest_cpu_price(self, pcie_gen: int) -> Optional[Decimal]:
+        return self._price_floor(
+            ("cpu", pcie_gen),
+            lambda: self._min_price(self.cpus_by_pcie_gen.get(pcie_gen, [])),
+        )
+
+    def cheapest_motherboard_price(self, pcie_gen: int, gpu_width: int) -> Optional[Decimal]:
+        return self._price_floor(
+            ("mobo", pcie_gen, gpu_width),
+            lambda: self._min_price(
+                mobo
+                for mobo in self.motherboards.values()
+                if self.motherboard_supports_pcie(mobo, pcie_gen, gpu_width)
+            ),
+        )
+
+    def cheapest_ram_price(self, ram_types: frozenset, min_capacity: int) -> Optional[Decimal]:
+        return self._price_floor(
+            ("ram", ram_types, min_capacity),
+            lambda: self._min_price(
+                ram
+                for ram_type in ram_types
+                for ram in self.rams_by_type.get(ram_type, [])
+                if ram.modules_count == 2 and ram.total_capacity >= min_capacity
+            ),
+        )
+
+    def cheapest_psu_price(self, power_w: int) -> Optional[Decimal]:
+        return self._price_floor(
+            ("psu", power_w),
+            lambda: self._min_price(psu for psu in self.psus_by_price if psu.wattage >= power_w),
+        )
+
+    def cheapest_case_price(self, gpu_length_mm: int) -> Optional[Decimal]:
+        return self._price_floor(
+            ("case", gpu_length_mm),
+            lambda: self._min_price(
+                case for case in self.cases.values() if case.max_gpu_length_mm >= gpu_length_mm
+            ),
+        )
+
+
+class CatalogService:
+    VERSION_CACHE_KEY = "core:catalog_version"
+
+    _snapshot: Optional[CatalogSnapshot] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_version() -> int:
+        version = cache.get(CatalogService.VERSION_CACHE_KEY)
+        if version is None:
+            # nowa wartość startowa, żeby nie pomylić się z wersją sprzed wyczyszczenia cache
+            cache.add(CatalogService.VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+            version = cache.get(CatalogService.VERSION_CACHE_KEY)
+        return version
+
+    @staticmethod
+    def bump_version() -> int:
+        try:
+            return cache.incr(CatalogService.VERSION_CACHE_KEY)
+        except ValueError:
+            return CatalogService.get_version()
+
+    @staticmethod
+    def get_snapshot() -> CatalogSnapshot:
+        version = CatalogService.get_version()
+        snapshot = CatalogService._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with CatalogService._lock:
+            snapshot = CatalogService._snapshot
+            if snapshot is None or snapshot.version != version:
+                snapshot = CatalogSnapshot.load(version)
+                CatalogService._snapshot = snapshot
+        return snapshot
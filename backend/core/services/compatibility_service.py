@@ -0,0 +1,35 @@
+from core.services.build_selection import BuildSelection
+from core.services.cpu_service import CPUService
+from core.services.gpu_service import GPUService
+from core.services.motherboard_service import MotherboardService
+from core.services.ram_service import RAMService
+from core.services.storage_service import StorageService
+from core.services.psu_service import PSUService
+from core.services.case_service import CaseService
+
+
+class CompatibilityService:
+
+    # klucze odpowiedzi jak w ścieżkach /api/<kategoria>/
+    CATEGORIES = (
+        ("cpus", CPUService.get_compatible_cpus),
+        ("gpus", GPUService.get_compatible_gpus),
+        ("motherboards", MotherboardService.get_compatible_motherboards),
+        ("rams", RAMService.get_compatible_rams),
+        ("mems", StorageService.get_compatible_m2),
+        ("psus", PSUService.get_compatible_psus),
+        ("cases", CaseService.get_compatible_cases),
+    )
+
+    @staticmethod
+    def get_compatible_ids(data: dict[str, int], categories=None) -> dict[str, list[int]]:
+        # Jeden BuildSelection na wszystkie kategorie: wybrane komponenty i ich złącza
+        # są pobierane raz, a nie osobno dla każdej listy.
+        selection = BuildSelection(data)
+        result = {}
+        for name, get_compatible in CompatibilityService.CATEGORIES:
+            if categories is not None and name not in categories:
+                continue
+            qs = get_compatible(data, selection=selection)
+            result[name] = list(qs.order_by("id").values_list("id", flat=True))
+        return result
@@ -1,5 +1,6 @@
 from core.models import CPU, Motherboard, RAM, PSU, GPU
 from core.services.psu_service import PSUService
+from core.services.build_selection import BuildSelection
 
 
 class CPUService:
@@ -28,22 +29,17 @@ class CPUService:
         return qs
     
     @staticmethod
-    def get_compatible_cpus(data: dict[str, int]):
+    def get_compatible_cpus(data: dict[str, int], selection: BuildSelection = None):
         qs = CPU.objects.all()                              # qs = queryset -> zestaw wszystkich procesorów
+        selection = selection or BuildSelection(data)       # wybrane komponenty, pobierane z bazy raz
         
-        mobo_pk = data.get("mobo")                          # pobieranie klkucza płyty głównej
-        ram_pk = data.get("ram")                            # pobieranie klucza pamięci RAM
-        
-        if mobo_pk:
-            mobo_socket = (                                 # pobieranie socket'u płyty głównej
-                Motherboard.objects.filter(pk=mobo_pk)      # filtrujemy po kluczu
-                .values_list("socket", flat=True)           # spłycamy konkretne wartości (z jendoelementowych krotek do listy)
-                .first()
-            )
+        if selection.pk("mobo"):
+            mobo = selection.get("mobo")                    # płyta główna (None, gdy klucz nie istnieje)
+            mobo_socket = mobo.socket_id if mobo else None
             qs = qs.filter(socket=mobo_socket)              # filtrujemy cpu po socket'cie płyty głównej
             
-        if ram_pk:
-            ram = RAM.objects.select_related("base").filter(pk=ram_pk).first()
+        if selection.pk("ram"):
+            ram = selection.get("ram")
             ram_type = ram.base.type if ram and ram.base else None
             if ram_type:
                 qs = qs.filter(supported_ram__type=ram_type)    # cpu może wspierać różne częstotliwości pamięci ram
@@ -0,0 +1,325 @@
+import dataclasses
+import json
+import operator
+import re
+import threading
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional
+
+from django.core.exceptions import ImproperlyConfigured
+
+from core.services.catalog_service import (
+    CatalogService, CatalogSnapshot, CPUEntry, GPUEntry, MotherboardEntry, RAMEntry,
+    StorageEntry, PSUEntry, CaseEntry,
+)
+from core.services.psu_service import PSUService
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CompiledProfile:
+    id: str
+    name: str
+    description: str
+    # (id reguły, [(warunek, punkty, komentarz), ...]) - pierwszy spełniony warunek wygrywa
+    rules: tuple
+
+
+class BuildEvaluationService:
+    """Ocena zestawu (punkty per profil użycia + uwagi o zgodności) z samych ID komponentów.
+
+    Reguły punktacji są w core/rules/scoring.json; przy pierwszym użyciu kompilujemy je
+    do funkcji działających na rekordach CatalogSnapshot, więc ocena zestawu to kilka
+    odczytów ze słowników - bez zapytań do bazy, także dla wielu zestawów naraz.
+    """
+
+    RULES_PATH = Path(__file__).resolve().parent.parent / "rules" / "scoring.json"
+    MAX_BATCH = 1000
+
+    # klucze jak w tools.COMPATIBILITY_KEYS ("chassis" to alias "case")
+    COMPONENTS = {
+        "cpu": ("cpus", CPUEntry),
+        "gpu": ("gpus", GPUEntry),
+        "mobo": ("motherboards", MotherboardEntry),
+        "ram": ("rams", RAMEntry),
+        "mem": ("storages", StorageEntry),
+        "psu": ("psus", PSUEntry),
+        "case": ("cases", CaseEntry),
+    }
+    ALIASES = {"chassis": "case"}
+    # klucz -> kategoria w CatalogSnapshot.load_components
+    CATEGORIES = {
+        "cpu": "cpu", "gpu": "gpu", "mobo": "motherboard", "ram": "ram",
+        "mem": "storage", "psu": "psu", "case": "case",
+    }
+
+    OPERATORS = {
+        "==": operator.eq,
+        "!=": operator.ne,
+        "<": operator.lt,
+        "<=": operator.le,
+        ">": operator.gt,
+        ">=": operator.ge,
+        "in": lambda value, options: value in options,
+    }
+    DERIVED_PATTERN = re.compile(r"^\s*([\w.]+)\s*([-+])\s*([\w.]+)\s*$")
+
+    _profiles: Optional[dict] = None
+    _lock = threading.Lock()
+
+    # --- kompilacja reguł ---
+
+    @staticmethod
+    def get_profiles() -> dict[str, CompiledProfile]:
+        profiles = BuildEvaluationService._profiles
+        if profiles is None:
+            with BuildEvaluationService._lock:
+                profiles = BuildEvaluationService._profiles
+                if profiles is None:
+                    with open(BuildEvaluationService.RULES_PATH, encoding="utf-8") as file:
+                        profiles = BuildEvaluationService.compile(json.load(file))
+                    BuildEvaluationService._profiles = profiles
+        return profiles
+
+    @staticmethod
+    def clear():
+        with BuildEvaluationService._lock:
+            BuildEvaluationService._profiles = None
+
+    @staticmethod
+    def compile(table: dict) -> dict[str, CompiledProfile]:
+        derived = {
+            path: BuildEvaluationService._compile_derived(path, expression)
+            for path, expression in table.get("meta", {}).get("derived_fields", {}).items()
+        }
+        profiles = {}
+        for profile_id, profile in table["profiles"].items():
+            rules = tuple(
+                (
+                    rule["id"],
+                    tuple(
+                        (
+                            BuildEvaluationService._compile_condition(case, derived),
+                            case["score"],
+                            case.get("feedback", ""),
+                        )
+                        for case in rule["logic"]
+                    ),
+                )
+                for rule in profile["rules"]
+            )
+            profiles[profile_id] = CompiledProfile(
+                id=profile_id,
+                name=profile.get("name", profile_id),
+                description=profile.get("description", ""),
+                rules=rules,
+            )
+        return profiles
+
+    @staticmethod
+    def _compile_getter(path: str, derived: dict):
+        if path in derived:
+            return derived[path]
+
+        key, _, field = path.partition(".")
+        if key not in BuildEvaluationService.COMPONENTS:
+            raise ImproperlyConfigured(f"Unknown component in rule path: {path}")
+        if not field:
+            return lambda parts: parts.get(key)
+
+        entry_class = BuildEvaluationService.COMPONENTS[key][1]
+        if field not in {item.name for item in dataclasses.fields(entry_class)}:
+            raise ImproperlyConfigured(f"Unknown field in rule path: {path}")
+        return lambda parts: getattr(parts.get(key), field, None)
+
+    @staticmethod
+    def _compile_derived(path: str, expression: str):
+        match = BuildEvaluationService.DERIVED_PATTERN.match(expression)
+        if not match:
+            raise ImproperlyConfigured(f"Unsupported derived field expression: {expression}")
+        left = BuildEvaluationService._compile_getter(match[1], {})
+        right = BuildEvaluationService._compile_getter(match[3], {})
+        combine = operator.sub if match[2] == "-" else operator.add
+
+        def getter(parts):
+            a, b = left(parts), right(parts)
+            return None if a is None or b is None else combine(a, b)
+        return getter
+
+    @staticmethod
+    def _compile_condition(case: dict, derived: dict):
+        if "when" in case:
+            conditions = tuple(
+                BuildEvaluationService._compile_condition(item, derived) for item in case["when"]
+            )
+            return lambda parts: all(condition(parts) for condition in conditions)
+
+        op = case["op"]
+        if op == "default":
+            return lambda parts: True
+
+        get = BuildEvaluationService._compile_getter(case["path"], derived)
+        if op == "missing":
+            return lambda parts: get(parts) is None
+        if op == "present":
+            return lambda parts: get(parts) is not None
+        if op not in BuildEvaluationService.OPERATORS:
+            raise ImproperlyConfigured(f"Unsupported rule operator: {op}")
+
+        compare, expected = BuildEvaluationService.OPERATORS[op], case["value"]
+
+        def condition(parts):
+            value = get(parts)
+            # brak wartości nie spełnia żadnego porównania
+            return value is not None and compare(value, expected)
+        return condition
+
+    # --- ocena ---
+
+    @staticmethod
+    def resolve(data: dict[str, int], *snapshots: CatalogSnapshot) -> tuple[dict, list[str]]:
+        """Rekordy dla wybranych ID (z pierwszej migawki, która je ma) oraz klucze, których brak."""
+        parts, missing = {}, []
+        for key, pk in data.items():
+            key = BuildEvaluationService.ALIASES.get(key, key)
+            attribute, _ = BuildEvaluationService.COMPONENTS[key]
+            entry = next(
+                (entry for snapshot in snapshots if (entry := getattr(snapshot, attribute).get(pk))),
+                None,
+            )
+            if entry is None:
+                missing.append(key)
+            else:
+                parts[key] = entry
+        return parts, missing
+
+    @staticmethod
+    def load_outside_snapshot(builds: list[dict[str, int]], snapshot: CatalogSnapshot) -> CatalogSnapshot:
+        """Komponenty, których migawka buildera nie ma (bez ceny, karty bez danych o zasilaniu
+        lub PCIe), wczytane z bazy - tylko one kosztują zapytania."""
+        ids = {}
+        for data in builds:
+            for key, pk in data.items():
+                key = BuildEvaluationService.ALIASES.get(key, key)
+                attribute, _ = BuildEvaluationService.COMPONENTS[key]
+                if pk not in getattr(snapshot, attribute):
+                    ids.setdefault(BuildEvaluationService.CATEGORIES[key], set()).add(pk)
+        return CatalogSnapshot.load_components(ids)
+
+    @staticmethod
+    def score(parts: dict, profiles) -> list[dict]:
+        results = []
+        for profile in profiles:
+            total, feedback = 0, []
+            for _, cases in profile.rules:
+                for condition, points, comment in cases:
+                    if condition(parts):
+                        total += points
+                        if comment:
+                            feedback.append(comment)
+                        break
+            results.append({
+                "id": profile.id,
+                "name": profile.name,
+                "description": profile.description,
+                "score": total,
+                "feedback": feedback,
+            })
+        results.sort(key=lambda item: item["score"], reverse=True)
+        return results
+
+    @staticmethod
+    def remarks(parts: dict) -> list[dict]:
+        """Niezgodności ("bad") i ograniczenia ("ok") między wybranymi komponentami."""
+        cpu, gpu, mobo = parts.get("cpu"), parts.get("gpu"), parts.get("mobo")
+        ram, mem, psu, case = parts.get("ram"), parts.get("mem"), parts.get("psu"), parts.get("case")
+        remarks = []
+
+        def add(component, key, score, text):
+            remarks.append({"component": component, "key": key, "score": score, "text": text})
+
+        if cpu and mobo and cpu.socket_id != mobo.socket_id:
+            add("mobo", "socket", "bad", "Gniazdo płyty nie pasuje do CPU!")
+
+        if ram and mobo:
+            if ram.ram_type not in mobo.ram_types:
+                add("ram", "base", "bad", "Standard RAM nie jest wspierany przez płytę.")
+            if ram.total_capacity > mobo.max_ram_capacity:
+                add("ram", "total_capacity", "bad",
+                    f"Pojemność RAM przekracza limit płyty ({mobo.max_ram_capacity}GB).")
+        if ram and cpu:
+            if ram.ram_type not in cpu.ram_types:
+                add("ram", "base", "bad", "Standard RAM nie jest wspierany przez procesor.")
+            if cpu.max_memory_gb and ram.total_capacity > cpu.max_memory_gb:
+                add("ram", "total_capacity", "bad",
+                    f"Pojemność RAM przekracza limit procesora ({cpu.max_memory_gb}GB).")
+
+        if gpu and mobo and gpu.pcie_width is not None and gpu.pcie_gen is not None:
+            slots = [version for version, lanes in mobo.gpu_slots if lanes is not None and lanes >= gpu.pcie_width]
+            if not slots:
+                add("gpu", "pcie", "bad", f"Płyta nie ma slotu PCIe x{gpu.pcie_width} dla karty.")
+            elif max(slots) < gpu.pcie_gen:
+                add("gpu", "pcie", "ok", "GPU ograniczona do niższej wersji PCIe przez płytę.")
+        if gpu and cpu and cpu.pcie_gens and gpu.pcie_gen is not None and gpu.pcie_gen > max(cpu.pcie_gens):
+            add("gpu", "pcie", "ok", "GPU ograniczona do niższej wersji PCIe przez CPU.")
+        if gpu and case and gpu.length_mm > case.max_gpu_length_mm:
+            add("gpu", "length_mm", "bad",
+                f"Karta jest za długa do obudowy (max {case.max_gpu_length_mm}mm).")
+        if gpu and psu and gpu.power_w is not None and psu.wattage < gpu.power_w:
+            add("psu", "wattage", "bad", f"GPU rekomenduje: {gpu.power_w} W.")
+
+        if mem and mobo and mem.category == "M.2 PCIe" and mem.version is not None:
+            if not mobo.m2_pcie_gens:
+                add("mem", "connector", "bad", "Płyta główna nie posiada złącza M.2 PCIe.")
+            elif mem.version > max(mobo.m2_pcie_gens):
+                add("mem", "connector", "ok", "SSD ograniczony do niższej wersji PCIe.")
+
+        if psu and mobo and not all(
+            PSUService.inventory_supports_connector(psu.connector_items, requirement)
+            for requirement in mobo.power_requirements
+        ):
+            add("psu", "connectors", "bad", "Zasilacz nie ma złączy wymaganych przez płytę.")
+
+        if case and mobo and mobo.form_factor_id not in case.mobo_form_factor_ids:
+            add("case", "mobo_form_factor_support", "bad", "Format płyty nie pasuje do obudowy.")
+        if case and psu and psu.form_factor_id not in case.psu_form_factor_ids:
+            add("case", "psu_form_factor_support", "bad", "Format zasilacza nie pasuje do obudowy.")
+
+        return remarks
+
+    @staticmethod
+    def evaluate_parts(parts: dict, profiles) -> dict:
+        remarks = BuildEvaluationService.remarks(parts)
+        return {
+            "total_price": (
+                None if any(entry.price is None for entry in parts.values())
+                else str(sum((entry.price for entry in parts.values()), Decimal("0.00")))
+            ),
+            "compatible": not any(remark["score"] == "bad" for remark in remarks),
+            "profiles": BuildEvaluationService.score(parts, profiles) if parts else [],
+            "remarks": remarks,
+        }
+
+    @staticmethod
+    def evaluate_many(builds: list[dict[str, int]], profile_ids=None) -> list[dict]:
+        """Ocena wielu zestawów na jednej migawce katalogu.
+
+        Nieznane ID dają dla danego zestawu {"error": "component_not_found", "components": [...]}.
+        Komponent bez ceny jest oceniany normalnie, a total_price zestawu to wtedy null.
+        """
+        profiles = BuildEvaluationService.get_profiles()
+        if profile_ids is not None:
+            selected = [profiles[profile_id] for profile_id in profile_ids]
+        else:
+            selected = list(profiles.values())
+
+        snapshot = CatalogService.get_snapshot()
+        outside = BuildEvaluationService.load_outside_snapshot(builds, snapshot)
+        results = []
+        for data in builds:
+            parts, missing = BuildEvaluationService.resolve(data, snapshot, outside)
+            if missing:
+                results.append({"error": "component_not_found", "components": missing})
+            else:
+                results.append(BuildEvaluationService.evaluate_parts(parts, selected))
+        return results
@@ -0,0 +1,229 @@
+import threading
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+from core.models import CPU, Motherboard, RAM, Storage, GPU
+from core.services.catalog_service import CatalogService
+from core.services.compatibility_service import CompatibilityService
+from core.services.filter_options_service import OUTPUT_CATEGORIES
+
+
+class FacetIndex:
+    """Bitmapy komponentów jednej kategorii: bit i odpowiada i-temu ID w `ids`."""
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.positions = {pk: index for index, pk in enumerate(ids)}
+        self.all_bits = (1 << len(ids)) - 1
+        self.facets = {}
+        self.ranges = {}
+
+    def bits_for(self, ids) -> int:
+        bits = 0
+        for pk in ids:
+            position = self.positions.get(pk)
+            if position is not None:
+                bits |= 1 << position
+        return bits
+
+
+class FacetService:
+    """Liczniki opcji filtrów w kontekście częściowego zestawu i pozostałych aktywnych filtrów.
+
+    Indeks (wartość filtra -> bitmapa komponentów) powstaje raz na wersję katalogu;
+    zapytanie to tylko operacje AND/OR na liczbach całkowitych i popcount.
+    """
+
+    # kategoria -> (model, klucz w CompatibilityService, facety, pola zakresowe)
+    # facet: (nazwa parametru jak w filterset, ścieżka wartości, dodatkowy filtr)
+    CATEGORIES = {
+        "cpu": (CPU, "cpus", (
+            ("family", "family", None),
+            ("generation", "generation", None),
+            ("manufacturer", "manufacturer_id", None),
+            ("socket", "socket_id", None),
+            ("p_cores", "p_cores", None),
+            ("e_cores", "e_cores", None),
+            ("threads", "threads", None),
+            ("supported_ram", "supported_ram", None),
+            ("max_internal_memory_gb", "max_internal_memory_gb", None),
+            ("supported_pcie", "supported_pcie", None),
+            ("cache_mb", "cache_mb", None),
+            ("pcie_max_gen", "supported_pcie__version", None),
+            ("integrated_gpu", "integrated_gpu", None),
+        ), ("boost_clock_ghz", "tdp", "price", "tier_score")),
+        "mobo": (Motherboard, "motherboards", (
+            ("manufacturer", "manufacturer_id", None),
+            ("socket", "socket_id", None),
+            ("form_factor", "form_factor_id", None),
+            ("supported_ram", "supported_ram", None),
+            ("max_ram_capacity", "max_ram_capacity", None),
+            ("dimm_slots", "dimm_slots", None),
+            ("pcie_max_gen", "motherboardconnector__connector__version",
+                {"motherboardconnector__connector__category": "PCIe"}),
+        ), ("price",)),
+        "ram": (RAM, "rams", (
+            ("manufacturer", "manufacturer_id", None),
+            ("base", "base_id", None),
+            ("modules_count", "modules_count", None),
+            ("total_capacity", "total_capacity", None),
+        ), ("price",)),
+        "mem": (Storage, "mems", (
+            ("manufacturer", "manufacturer_id", None),
+            ("connector", "connector_id", None),
+            ("capacity_gb", "capacity_gb", None),
+            ("pcie_max_gen", "connector__version", {"connector__category": "M.2 PCIe"}),
+        ), ("price",)),
+        "gpu": (GPU, "gpus", (
+            ("manufacturer", "manufacturer_id", None),
+            ("vram_size_gb", "vram_size_gb", None),
+            ("outputs", "gpuconnector__connector__category",
+                {"gpuconnector__connector__category__in": OUTPUT_CATEGORIES}),
+            ("graphics_chip_vendor", "graphics_chip__vendor", None),
+            ("graphics_chip_marketing_name", "graphics_chip__marketing_name", None),
+            ("graphics_chip_pcie_max_gen", "graphics_chip__pcie_max_gen", None),
+            ("graphics_chip_memory_type", "graphics_chip__memory_type", None),
+            ("graphics_chip_ray_tracing_gen", "graphics_chip__ray_tracing_gen", None),
+            ("graphics_chip_upscaling_technology", "graphics_chip__upscaling_technology", None),
+        ), (
+            "base_clock_mhz", "boost_clock_mhz", "tdp", "recommended_system_power_w",
+            "length_mm", "slot_width", "price", "tier_score",
+        )),
+    }
+
+    _lock = threading.Lock()
+    _version = None
+    _indexes: dict = {}
+
+    @staticmethod
+    def get_index(category: str) -> FacetIndex:
+        version = CatalogService.get_version()
+        with FacetService._lock:
+            if FacetService._version != version:
+                FacetService._indexes = {}
+                FacetService._version = version
+            index = FacetService._indexes.get(category)
+            if index is None:
+                index = FacetService._build_index(category)
+                FacetService._indexes[category] = index
+            return index
+
+    @staticmethod
+    def clear():
+        with FacetService._lock:
+            FacetService._version = None
+            FacetService._indexes = {}
+
+    @staticmethod
+    def _build_index(category: str) -> FacetIndex:
+        model, _, facets, range_fields = FacetService.CATEGORIES[category]
+        rows = list(model.objects.order_by("id").values_list("id", *range_fields))
+        index = FacetIndex([row[0] for row in rows])
+
+        for offset, field in enumerate(range_fields, start=1):
+            index.ranges[field] = [row[offset] for row in rows]
+
+        for name, lookup, extra_filter in facets:
+            qs = model.objects.all()
+            if extra_filter:
+                qs = qs.filter(**extra_filter)
+            bitmaps = {}
+            for pk, value in qs.values_list("id", lookup).distinct():
+                if value is None or value == "":
+                    continue
+                bitmaps[value] = bitmaps.get(value, 0) | (1 << index.positions[pk])
+            index.facets[name] = dict(sorted(bitmaps.items()))
+
+        return index
+
+    @staticmethod
+    def _parse_value(raw: str, sample):
+        if isinstance(sample, bool):
+            return raw.strip().lower() in ("true", "1")
+        if isinstance(sample, int):
+            return int(raw)
+        if isinstance(sample, Decimal):
+            return Decimal(raw)
+        return raw
+
+    @staticmethod
+    def _selected_bits(bitmaps: dict, raw: str) -> int:
+        if not bitmaps:
+            return 0
+        sample = next(iter(bitmaps))
+        bits = 0
+        for part in raw.split(","):
+            if not part.strip():
+                continue
+            try:
+                value = FacetService._parse_value(part, sample)
+            except (ValueError, InvalidOperation):
+                continue
+            bits |= bitmaps.get(value, 0)
+        return bits
+
+    @staticmethod
+    def _range_bits(values: list, low: Optional[Decimal], high: Optional[Decimal]) -> int:
+        bits = 0
+        for position, value in enumerate(values):
+            if value is None:
+                continue
+            if low is not None and value < low:
+                continue
+            if high is not None and value > high:
+                continue
+            bits |= 1 << position
+        return bits
+
+    @staticmethod
+    def _parse_bound(raw):
+        if raw in (None, ""):
+            return None
+        try:
+            return Decimal(raw)
+        except InvalidOperation:
+            return None
+
+    @staticmethod
+    def get_facets(category: str, compatibility: dict[str, int], params) -> dict:
+        """Dla każdej wartości każdego facetu: liczba komponentów zgodnych z częściowym
+        zestawem (`compatibility`) i z aktywnymi filtrami pozostałych facetów (`params`)."""
+        index = FacetService.get_index(category)
+        _, compatibility_key, _, range_fields = FacetService.CATEGORIES[category]
+
+        base = index.all_bits
+        if compatibility:
+            compatible = CompatibilityService.get_compatible_ids(
+                compatibility, categories={compatibility_key}
+            )[compatibility_key]
+            base = index.bits_for(compatible)
+
+        for field in range_fields:
+            low = FacetService._parse_bound(params.get(f"{field}_min"))
+            high = FacetService._parse_bound(params.get(f"{field}_max"))
+            if low is not None or high is not None:
+                base &= FacetService._range_bits(index.ranges[field], low, high)
+
+        selected = {
+            name: FacetService._selected_bits(bitmaps, params[name])
+            for name, bitmaps in index.facets.items()
+            if params.get(name)
+        }
+
+        matching = base
+        for bits in selected.values():
+            matching &= bits
+
+        facets = {}
+        for name, bitmaps in index.facets.items():
+            # liczniki facetu uwzględniają wszystkie aktywne filtry poza nim samym
+            others = base
+            for other, bits in selected.items():
+                if other != name:
+                    others &= bits
+            facets[name] = [
+                {"value": value, "count": (others & bits).bit_count()}
+                for value, bits in bitmaps.items()
+            ]
+
+        return {"category": category, "total": matching.bit_count(), "facets": facets}
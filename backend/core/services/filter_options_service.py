@@ -0,0 +1,261 @@
+import threading
+import time
+from typing import Optional
+
+from core.models import CPU, Motherboard, RAM, Storage, GPU, GraphicsChip, Connector, RAMBase
+from core.services.catalog_service import CatalogService
+
+OUTPUT_CATEGORIES = ("HDMI", "DisplayPort", "DVI", "VGA", "USB-C")
+
+
+def build_options(values, label_fn=None):
+    return [
+        {"value": value, "label": label_fn(value) if label_fn else str(value)}
+        for value in values
+    ]
+
+
+def values_to_options(rows, value_key, label_key):
+    return [
+        {"value": row[value_key], "label": row[label_key]}
+        for row in rows
+    ]
+
+
+def rambase_options(qs):
+    return [
+        {"value": base.id, "label": f"{base.type}-{base.mts}"}
+        for base in qs.order_by("type", "mts")
+    ]
+
+
+def connector_options(qs):
+    return [
+        {"value": connector.id, "label": str(connector)}
+        for connector in qs.order_by("category", "version", "lanes")
+    ]
+
+
+def _resolve_field(model, field):
+    current_model = model
+    field_obj = None
+    for part in field.split("__"):
+        try:
+            field_obj = current_model._meta.get_field(part)
+        except Exception:
+            return None
+        if getattr(field_obj, "is_relation", False) and hasattr(field_obj, "related_model"):
+            current_model = field_obj.related_model
+    return field_obj
+
+
+def distinct_values(qs, field, order=True):
+    field_obj = _resolve_field(qs.model, field)
+    if field_obj is not None and getattr(field_obj, "null", False):
+        qs = qs.exclude(**{f"{field}__isnull": True})
+    if field_obj is not None and field_obj.get_internal_type() in {
+        "CharField",
+        "TextField",
+        "SlugField",
+        "EmailField",
+        "URLField",
+    }:
+        qs = qs.exclude(**{field: ""})
+    values = qs.values_list(field, flat=True).distinct()
+    if order:
+        values = values.order_by(field)
+    return list(values)
+
+
+TEXT_FIELD_TYPES = {"CharField", "TextField", "SlugField", "EmailField", "URLField"}
+
+
+def distinct_values_many(qs, fields):
+    """distinct_values dla kilku pól naraz: jedno zapytanie zamiast jednego na pole."""
+    fields = list(fields)
+    skip_empty = []
+    for field in fields:
+        field_obj = _resolve_field(qs.model, field)
+        skip_empty.append(
+            field_obj is not None and field_obj.get_internal_type() in TEXT_FIELD_TYPES
+        )
+
+    seen = [set() for _ in fields]
+    for row in qs.values_list(*fields).distinct():
+        for index, value in enumerate(row):
+            if value is None or (skip_empty[index] and value == ""):
+                continue
+            seen[index].add(value)
+    return {field: sorted(values) for field, values in zip(fields, seen)}
+
+
+class FilterOptionsService:
+    """Opcje filtrów konfiguratora, liczone raz na wersję katalogu i trzymane w procesie."""
+
+    _lock = threading.Lock()
+    _version = None
+    _options: Optional[dict] = None
+    _last_modified: Optional[float] = None
+
+    @staticmethod
+    def get_options() -> tuple[dict, int, float]:
+        """Zwraca (opcje, wersja katalogu, czas wyliczenia jako timestamp)."""
+        version = CatalogService.get_version()
+        with FilterOptionsService._lock:
+            if FilterOptionsService._version != version:
+                FilterOptionsService._options = FilterOptionsService.compute()
+                FilterOptionsService._version = version
+                FilterOptionsService._last_modified = time.time()
+            return (
+                FilterOptionsService._options,
+                FilterOptionsService._version,
+                FilterOptionsService._last_modified,
+            )
+
+    @staticmethod
+    def clear():
+        with FilterOptionsService._lock:
+            FilterOptionsService._version = None
+            FilterOptionsService._options = None
+            FilterOptionsService._last_modified = None
+
+    @staticmethod
+    def compute() -> dict:
+        cpu_qs = CPU.objects.all()
+        mobo_qs = Motherboard.objects.all()
+        ram_qs = RAM.objects.all()
+        storage_qs = Storage.objects.all()
+        gpu_qs = GPU.objects.all()
+        chip_qs = GraphicsChip.objects.filter(gpu__isnull=False).distinct()
+
+        cpu_values = distinct_values_many(cpu_qs, (
+            "family", "generation", "p_cores", "e_cores", "threads",
+            "max_internal_memory_gb", "cache_mb",
+        ))
+        mobo_values = distinct_values_many(mobo_qs, ("max_ram_capacity", "dimm_slots"))
+        ram_values = distinct_values_many(ram_qs, ("modules_count", "total_capacity"))
+        chip_values = distinct_values_many(chip_qs, (
+            "vendor", "marketing_name", "pcie_max_gen", "memory_type",
+            "ray_tracing_gen", "upscaling_technology",
+        ))
+
+        cpu_options = {
+            "family": build_options(cpu_values["family"]),
+            "generation": build_options(cpu_values["generation"]),
+            "manufacturer": values_to_options(
+                cpu_qs.values("manufacturer_id", "manufacturer__name").distinct().order_by("manufacturer__name"),
+                "manufacturer_id",
+                "manufacturer__name",
+            ),
+            "socket": values_to_options(
+                cpu_qs.values("socket_id", "socket__name").distinct().order_by("socket__name"),
+                "socket_id",
+                "socket__name",
+            ),
+            "p_cores": build_options(cpu_values["p_cores"]),
+            "e_cores": build_options(cpu_values["e_cores"]),
+            "threads": build_options(cpu_values["threads"]),
+            "supported_ram": rambase_options(
+                RAMBase.objects.filter(cpu__isnull=False).distinct()
+            ),
+            "max_internal_memory_gb": build_options(cpu_values["max_internal_memory_gb"]),
+            "supported_pcie": connector_options(
+                Connector.objects.filter(cpu_supported_pcie__isnull=False, category="PCIe").distinct()
+            ),
+            "cache_mb": build_options(cpu_values["cache_mb"]),
+            "pcie_max_gen": build_options(
+                distinct_values(
+                    Connector.objects.filter(cpu_supported_pcie__isnull=False, category="PCIe"),
+                    "version",
+                )
+            ),
+        }
+
+        motherboard_options = {
+            "manufacturer": values_to_options(
+                mobo_qs.values("manufacturer_id", "manufacturer__name").distinct().order_by("manufacturer__name"),
+                "manufacturer_id",
+                "manufacturer__name",
+            ),
+            "socket": values_to_options(
+                mobo_qs.values("socket_id", "socket__name").distinct().order_by("socket__name"),
+                "socket_id",
+                "socket__name",
+            ),
+            "form_factor": values_to_options(
+                mobo_qs.values("form_factor_id", "form_factor__name").distinct().order_by("form_factor__name"),
+                "form_factor_id",
+                "form_factor__name",
+            ),
+            "supported_ram": rambase_options(
+                RAMBase.objects.filter(motherboard__isnull=False).distinct()
+            ),
+            "max_ram_capacity": build_options(mobo_values["max_ram_capacity"]),
+            "dimm_slots": build_options(mobo_values["dimm_slots"]),
+            "pcie_max_gen": build_options(
+                distinct_values(
+                    Connector.objects.filter(motherboardconnector__isnull=False, category="PCIe"),
+                    "version",
+                )
+            ),
+        }
+
+        ram_options = {
+            "manufacturer": values_to_options(
+                ram_qs.values("manufacturer_id", "manufacturer__name").distinct().order_by("manufacturer__name"),
+                "manufacturer_id",
+                "manufacturer__name",
+            ),
+            "base": rambase_options(
+                RAMBase.objects.filter(variants__isnull=False).distinct()
+            ),
+            "modules_count": build_options(ram_values["modules_count"]),
+            "total_capacity": build_options(ram_values["total_capacity"]),
+        }
+
+        storage_options = {
+            "manufacturer": values_to_options(
+                storage_qs.values("manufacturer_id", "manufacturer__name").distinct().order_by("manufacturer__name"),
+                "manufacturer_id",
+                "manufacturer__name",
+            ),
+            "connector": connector_options(
+                Connector.objects.filter(storage__isnull=False).distinct()
+            ),
+            "capacity_gb": build_options(distinct_values(storage_qs, "capacity_gb")),
+            "pcie_max_gen": build_options(
+                distinct_values(
+                    Connector.objects.filter(storage__isnull=False, category="M.2 PCIe"),
+                    "version",
+                )
+            ),
+        }
+
+        gpu_output_values = distinct_values(
+            Connector.objects.filter(gpuconnector__isnull=False, category__in=OUTPUT_CATEGORIES),
+            "category",
+        )
+
+        gpu_options = {
+            "manufacturer": values_to_options(
+                gpu_qs.values("manufacturer_id", "manufacturer__name").distinct().order_by("manufacturer__name"),
+                "manufacturer_id",
+                "manufacturer__name",
+            ),
+            "vram_size_gb": build_options(distinct_values(gpu_qs, "vram_size_gb")),
+            "outputs": build_options(gpu_output_values),
+            "graphics_chip_vendor": build_options(chip_values["vendor"]),
+            "graphics_chip_marketing_name": build_options(chip_values["marketing_name"]),
+            "graphics_chip_pcie_max_gen": build_options(chip_values["pcie_max_gen"]),
+            "graphics_chip_memory_type": build_options(chip_values["memory_type"]),
+            "graphics_chip_ray_tracing_gen": build_options(chip_values["ray_tracing_gen"]),
+            "graphics_chip_upscaling_technology": build_options(chip_values["upscaling_technology"]),
+        }
+
+        return {
+            "cpu": cpu_options,
+            "mobo": motherboard_options,
+            "ram": ram_options,
+            "mem": storage_options,
+            "gpu": gpu_options,
+        }
@@ -0,0 +1,361 @@
+import threading
+from bisect import bisect_right
+from dataclasses import replace
+from decimal import Decimal
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from core.models import BuildFrontierPoint
+from core.services.builder_service import BuildBuilderService, BuildCandidate
+from core.services.catalog_service import CatalogService, CatalogSnapshot
+
+
+class _Witnesses:
+    """Najniższa znana cena zestawu dla każdego wyniku."""
+
+    def __init__(self):
+        self._min_prices = {}
+        self._thresholds = {}
+
+    def add(self, score: float, price: Decimal):
+        current = self._min_prices.get(score)
+        if current is None or price < current:
+            self._min_prices[score] = price
+            self._thresholds = {}
+
+    def threshold(self, score: float) -> Optional[Decimal]:
+        """Najniższa cena zestawu o wyższym wyniku; zestaw za tyle lub drożej nie trafi na front."""
+        if score not in self._thresholds:
+            self._thresholds[score] = min(
+                (price for known_score, price in self._min_prices.items() if known_score > score),
+                default=None,
+            )
+        return self._thresholds[score]
+
+    def dominates(self, score: float, price: Decimal) -> bool:
+        threshold = self.threshold(score)
+        return threshold is not None and price >= threshold
+
+
+class _MotherboardOptions:
+    """(cena płyty, cena zestawu bez procesora i karty, zestaw) dla kolejnych zgodnych płyt.
+
+    Zestawy są składane leniwie, bo przeszukiwanie zwykle kończy się na kilku
+    najtańszych płytach. Płyty dające tę samą cenę co wcześniejsza są pomijane -
+    ich zestawy byłyby duplikatami.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot, cpu, gpu, tier):
+        self._options = []
+        self._pending = self._generate(snapshot, cpu, gpu, tier)
+
+    def __iter__(self):
+        index = 0
+        while True:
+            if index == len(self._options):
+                option = next(self._pending, None)
+                if option is None:
+                    return
+                self._options.append(option)
+            yield self._options[index]
+            index += 1
+
+    @staticmethod
+    def _generate(snapshot: CatalogSnapshot, cpu, gpu, tier):
+        target_ram_gb, target_storage_gb = tier
+        rest_prices = set()
+        for mobo in snapshot.compatible_motherboards(cpu, gpu):
+            build = BuildBuilderService._complete_build(
+                snapshot, cpu, gpu, mobo, target_ram_gb, target_storage_gb,
+            )
+            if not build:
+                continue
+            rest_price = build.total_price - cpu.price - gpu.price
+            if rest_price in rest_prices:
+                continue
+            rest_prices.add(rest_price)
+            yield mobo.price, rest_price, build
+
+
+class FrontierService:
+    """Pareto frontier of (total_price, score) builds per target tier.
+
+    For a budget the answer is the last frontier point not above it, which is
+    exactly what BuildBuilderService.search_optimal would return.
+    """
+
+    VERSION_CACHE_KEY = "core:frontier_version"
+
+    _lock = threading.Lock()
+    _rebuild_lock = threading.Lock()
+    _worker: Optional[threading.Thread] = None
+    _pending = False
+
+    # (migawka, zestawy wg poziomu i klasy) z ostatniej przebudowy w tym procesie
+    _options: Optional[tuple] = None
+
+    _loaded_version = None
+    _loaded: dict = {}
+
+    @staticmethod
+    def is_ready() -> bool:
+        version = CatalogService.get_version()
+        # wiersze mogły zniknąć (np. po ręcznym czyszczeniu tabeli) - wtedy pytamy wyszukiwanie
+        return cache.get(FrontierService.VERSION_CACHE_KEY) == version and bool(FrontierService._load())
+
+    @staticmethod
+    def lookup(budget: Decimal) -> Optional[BuildCandidate]:
+        tier = BuildBuilderService.get_targets(budget)
+        prices, candidates = FrontierService._load().get(tier, ([], []))
+        index = bisect_right(prices, budget) - 1
+        if index < 0:
+            return None
+        return candidates[index]
+
+    @staticmethod
+    def _load() -> dict:
+        version = cache.get(FrontierService.VERSION_CACHE_KEY)
+        if FrontierService._loaded_version == version:
+            return FrontierService._loaded
+
+        frontier = FrontierService._read_points(version)
+        FrontierService._loaded = frontier
+        FrontierService._loaded_version = version
+        return frontier
+
+    @staticmethod
+    def _read_points(version) -> dict:
+        frontier = {}
+        points = BuildFrontierPoint.objects.filter(catalog_version=version).order_by(
+            "target_ram_gb", "target_storage_gb", "total_price",
+        )
+        for point in points:
+            prices, candidates = frontier.setdefault(
+                (point.target_ram_gb, point.target_storage_gb), ([], [])
+            )
+            prices.append(point.total_price)
+            candidates.append(
+                BuildCandidate(
+                    cpu_id=point.cpu_id,
+                    gpu_id=point.gpu_id,
+                    motherboard_id=point.motherboard_id,
+                    ram_id=point.ram_id,
+                    storage_id=point.storage_id,
+                    psu_id=point.psu_id,
+                    case_id=point.case_id,
+                    total_price=point.total_price,
+                    score=point.score,
+                )
+            )
+        return frontier
+
+    @staticmethod
+    def schedule_rebuild():
+        if not getattr(settings, "BUILDER_FRONTIER_AUTO_REBUILD", False):
+            return
+
+        with FrontierService._lock:
+            if FrontierService._worker is not None:
+                FrontierService._pending = True
+                return
+            FrontierService._worker = threading.Thread(
+                target=FrontierService._run_worker, name="build-frontier", daemon=True,
+            )
+            FrontierService._worker.start()
+
+    @staticmethod
+    def _run_worker():
+        try:
+            while True:
+                FrontierService.rebuild()
+                with FrontierService._lock:
+                    if not FrontierService._pending:
+                        FrontierService._worker = None
+                        return
+                    FrontierService._pending = False
+        except Exception:
+            with FrontierService._lock:
+                FrontierService._worker = None
+            raise
+        finally:
+            connection.close()
+
+    @staticmethod
+    def rebuild() -> int:
+        with FrontierService._rebuild_lock:
+            return FrontierService._rebuild()
+
+    @staticmethod
+    def _rebuild() -> int:
+        snapshot = CatalogService.get_snapshot()
+        previous_version = cache.get(FrontierService.VERSION_CACHE_KEY)
+        options = FrontierService._reusable_options(snapshot)
+
+        points = []
+        for tier in BuildBuilderService.TARGET_TIERS:
+            frontier = FrontierService._sweep(
+                FrontierService._tier_leaves(snapshot, tier, options.setdefault(tier, {}))
+            )
+            points.extend(FrontierService._to_point(candidate, tier, snapshot.version) for candidate in frontier)
+
+        with transaction.atomic():
+            # tylko wersja zastępowana przez ten proces: przy kilku procesach z osobnym
+            # LocMemCache każdy ma własną wersję katalogu i nie kasuje cudzych wierszy
+            BuildFrontierPoint.objects.filter(
+                catalog_version__in={snapshot.version, previous_version} - {None},
+            ).delete()
+            BuildFrontierPoint.objects.bulk_create(points, batch_size=500)
+        cache.set(FrontierService.VERSION_CACHE_KEY, snapshot.version, timeout=None)
+        FrontierService._options = (snapshot, options)
+        return len(points)
+
+    @staticmethod
+    def _reusable_options(snapshot: CatalogSnapshot) -> dict:
+        """Zestawy złożone przy poprzedniej przebudowie, których nie dotknęła zmiana katalogu.
+
+        Ceny procesorów i kart nie wchodzą do zestawów bez procesora i karty, więc ich zmiany
+        niczego nie unieważniają; zmiana płyty - tylko jej gniazdo, dysku - tylko klasy, dla
+        których zmienił się wybrany dysk. Pamięć, zasilacze i obudowy wybierane są dla całego
+        katalogu, więc ich zmiana oznacza przebudowę od zera.
+        """
+        if FrontierService._options is None:
+            return {}
+        previous, options = FrontierService._options
+        if (previous.rams, previous.psus, previous.cases) != (snapshot.rams, snapshot.psus, snapshot.cases):
+            return {}
+
+        changed_sockets = {
+            mobo.socket_id
+            for old, new in (
+                (previous.motherboards, snapshot.motherboards),
+                (snapshot.motherboards, previous.motherboards),
+            )
+            for mobo_id, mobo in old.items()
+            if new.get(mobo_id) != mobo
+        }
+        reused = {}
+        for tier, tier_options in options.items():
+            _, target_storage_gb = tier
+            storage_changed = {}
+            for gpu_pcie_gen in snapshot.storages_by_pcie_gen.keys() | previous.storages_by_pcie_gen.keys():
+                storage_changed[gpu_pcie_gen] = BuildBuilderService._pick_storage(
+                    previous, gpu_pcie_gen, target_storage_gb,
+                ) != BuildBuilderService._pick_storage(snapshot, gpu_pcie_gen, target_storage_gb)
+            reused[tier] = {
+                key: value
+                for key, value in tier_options.items()
+                if key[0] not in changed_sockets and not storage_changed.get(key[3], True)
+            }
+        return reused
+
+    @staticmethod
+    def _tier_leaves(snapshot: CatalogSnapshot, tier, options: dict) -> list[BuildCandidate]:
+        """Zestawy, które mogą leżeć na froncie, w kolejności wyszukiwania (karty wg rankingu).
+
+        Zestaw jest pomijany, gdy znany jest już zestaw o wyższym wyniku i nie wyższej cenie -
+        taki nie trafiłby na front. Dolne ograniczenia cen z migawki pozwalają odciąć całe
+        karty i procesory bez składania zestawów. Zestawy bez procesora i karty są wspólne dla
+        wszystkich par o tych samych cechach (`options`, zachowywane między przebudowami).
+        """
+        target_ram_gb, target_storage_gb = tier
+        min_ram_gb = BuildBuilderService._ram_target_fallbacks(target_ram_gb)[-1]
+        all_ram_types = frozenset(snapshot.rams_by_type)
+        witnesses = _Witnesses()
+
+        leaves = []
+        seen = set()
+        searched = set()
+        for gpu in snapshot.gpus_ranked:
+            max_cpu_score = snapshot.max_cpu_tier_score(gpu.pcie_gen)
+            if max_cpu_score is None:
+                continue
+            storage = BuildBuilderService._pick_storage(snapshot, gpu.pcie_gen, target_storage_gb)
+            if not storage:
+                continue
+
+            gpu_floor = BuildBuilderService._sum_floors(
+                gpu.price,
+                storage.price,
+                snapshot.cheapest_psu_price(gpu.power_w),
+                snapshot.cheapest_case_price(gpu.length_mm),
+            )
+            gpu_bound = BuildBuilderService._sum_floors(
+                gpu_floor,
+                snapshot.cheapest_cpu_price(gpu.pcie_gen),
+                snapshot.cheapest_motherboard_price(gpu.pcie_gen, gpu.pcie_width),
+                snapshot.cheapest_ram_price(all_ram_types, min_ram_gb),
+            )
+            if gpu_bound is None or witnesses.dominates(float(gpu.tier_score + max_cpu_score), gpu_bound):
+                continue
+
+            for cpu in snapshot.cpus_by_pcie_gen[gpu.pcie_gen]:
+                cpu_floor = BuildBuilderService._sum_floors(
+                    gpu_floor,
+                    cpu.price,
+                    snapshot.cheapest_ram_price(cpu.ram_types, min_ram_gb),
+                )
+                score = float(cpu.tier_score + gpu.tier_score)
+                if cpu_floor is None or witnesses.dominates(score, cpu_floor):
+                    continue
+
+                # dobór płyty, pamięci, dysku, zasilacza i obudowy zależy tylko od tych cech
+                key = (
+                    cpu.socket_id, cpu.ram_types, cpu.max_memory_gb,
+                    gpu.pcie_gen, gpu.pcie_width, gpu.power_w, gpu.length_mm,
+                )
+                # para o tych samych cechach, wyniku i sumie cen dałaby tylko duplikaty
+                pair = (key, score, cpu.price + gpu.price)
+                if pair in searched:
+                    continue
+                searched.add(pair)
+                if key not in options:
+                    options[key] = _MotherboardOptions(snapshot, cpu, gpu, tier)
+
+                threshold = witnesses.threshold(score)
+                for mobo_price, rest_price, build in options[key]:
+                    # płyty są posortowane po cenie, więc dalej będzie tylko drożej
+                    if threshold is not None and cpu_floor + mobo_price >= threshold:
+                        break
+                    total_price = cpu.price + gpu.price + rest_price
+                    if threshold is not None and total_price >= threshold:
+                        continue
+                    # ten sam wynik i cena: na froncie zostaje pierwszy znaleziony
+                    if (score, total_price) in seen:
+                        continue
+                    seen.add((score, total_price))
+                    leaves.append(
+                        replace(build, cpu_id=cpu.id, gpu_id=gpu.id, total_price=total_price, score=score)
+                    )
+                    witnesses.add(score, total_price)
+        return leaves
+
+    @staticmethod
+    def _sweep(candidates: list[BuildCandidate]) -> list[BuildCandidate]:
+        # sortowanie stabilne: przy pełnym remisie zostaje kolejność przeszukiwania
+        ordered = sorted(candidates, key=lambda candidate: (candidate.total_price, -candidate.score))
+        frontier = []
+        for candidate in ordered:
+            if BuildBuilderService._is_better(candidate, frontier[-1] if frontier else None):
+                frontier.append(candidate)
+        return frontier
+
+    @staticmethod
+    def _to_point(candidate: BuildCandidate, tier, version) -> BuildFrontierPoint:
+        target_ram_gb, target_storage_gb = tier
+        return BuildFrontierPoint(
+            target_ram_gb=target_ram_gb,
+            target_storage_gb=target_storage_gb,
+            total_price=candidate.total_price,
+            score=candidate.score,
+            cpu_id=candidate.cpu_id,
+            gpu_id=candidate.gpu_id,
+            motherboard_id=candidate.motherboard_id,
+            ram_id=candidate.ram_id,
+            storage_id=candidate.storage_id,
+            psu_id=candidate.psu_id,
+            case_id=candidate.case_id,
+            catalog_version=version,
+        )
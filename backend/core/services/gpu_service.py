@@ -1,10 +1,12 @@
 from collections import defaultdict
 
 from core.models import (
-    Motherboard, GPU, Case, GPUConnector, MotherboardConnector,
+    Motherboard, GPU, Case, GPUConnector,
     CPU, PSU
 )
 from core.services.psu_service import PSUService
+from core.services.motherboard_service import MotherboardService
+from core.services.build_selection import BuildSelection
 from core import tools
 
 class GPUService:
@@ -21,46 +23,29 @@ class GPUService:
         if not gpu_chip:
             return Motherboard.objects.none()
 
-        return Motherboard.objects.filter(
-            motherboardconnector__connector__category="PCIe",
-            motherboardconnector__connector__lanes__gte=gpu_chip.pcie_max_width,
-            motherboardconnector__quantity__gte=1
-        ).distinct()
+        return MotherboardService.filter_by_gpu_lanes(Motherboard.objects.all(), gpu_chip.pcie_max_width)
 
     @staticmethod
-    def get_compatible_gpus(data: dict[str, int]): # TODO: check ram and adjust CPU!
+    def get_compatible_gpus(data: dict[str, int], selection: BuildSelection = None): # TODO: check ram and adjust CPU!
         qs = GPU.objects.all()
+        selection = selection or BuildSelection(data)
         
-        psu_pk = data.get("psu")
-        case_pk = data.get("case")
-        mobo_pk = data.get("mobo")
-        
-        if mobo_pk:
-            mobo = Motherboard.objects.get(pk=mobo_pk)
-            mobo_slot = (
-                MotherboardConnector.objects
-                .filter(motherboard=mobo, connector__category="PCIe")
-                .order_by("-connector__lanes", "-connector__version")
-                .values("connector__lanes")
-                .first()
-            )
+        if selection.pk("mobo"):
+            selection.require("mobo")
+            lanes = selection.mobo_pcie_lanes()
 
-            if not mobo_slot:
+            if lanes is None:
                 return GPU.objects.none()
 
-            lanes = mobo_slot["connector__lanes"]
             qs = qs.filter(
                 graphics_chip__pcie_max_width__lte=lanes,
             )
 
-        if psu_pk:
-            psu_connectors = (
-                PSU.objects.filter(pk=psu_pk)
-                .values_list("connectors", flat=True)
-                .first()
-            ) or []
+        if selection.pk("psu"):
+            psu = selection.get("psu")
+            pcie_pins, psu_connectors = (psu.pcie_pins, psu.connectors) if psu else (None, [])
 
-            available_pins = PSUService.get_pcie_pins_list(psu_connectors)
+            available_pins = PSUService.get_psu_pcie_pins(pcie_pins, psu_connectors)
             if available_pins is None:
                 return GPU.objects.none()
 
@@ -84,12 +69,9 @@ class GPUService:
 
             qs = qs.filter(pk__in=compatible_ids)
 
-        if case_pk:
-            case_max_gpu_length = (
-                Case.objects.filter(pk=case_pk)
-                .values_list("max_gpu_length_mm", flat=True)
-                .first()
-            )
+        if selection.pk("case"):
+            case = selection.get("case")
+            case_max_gpu_length = case.max_gpu_length_mm if case else None
             if case_max_gpu_length:
                 qs = qs.filter(length_mm__lte=case_max_gpu_length)
             
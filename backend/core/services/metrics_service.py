@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+
+
+class RequestMetricsService:
+    """Zagregowane pomiary żądań per widok i akcja (w pamięci procesu).
+
+    Dla każdego klucza trzymamy licznik wszystkich żądań i ostatnie SAMPLES próbek,
+    z których liczone są percentyle. Przy kilku workerach każdy ma własne statystyki.
+    """
+
+    METRICS = ("total_ms", "db_ms", "queries", "serialize_ms", "render_ms", "size_bytes")
+    PERCENTILES = (50, 90, 99)
+
+    _lock = threading.Lock()
+    _samples: dict = {}
+    _counts: dict = {}
+
+    @staticmethod
+    def get_config() -> dict:
+        config = {"ENABLED": True, "SAMPLES": 1000, "PUBLIC": settings.DEBUG}
+        config.update(getattr(settings, "REQUEST_METRICS", {}))
+        return config
+
+    @staticmethod
+    @contextmanager
+    def phase(request, name: str):
+        """Dolicza czas bloku do fazy `name` żądania (request._metrics_phases ustawia middleware)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phases = getattr(request, "_metrics_phases", None)
+            if phases is not None:
+                phases[name] = phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def record(key: str, sample: dict):
+        with RequestMetricsService._lock:
+            samples = RequestMetricsService._samples.get(key)
+            if samples is None:
+                samples = deque(maxlen=RequestMetricsService.get_config()["SAMPLES"])
+                RequestMetricsService._samples[key] = samples
+            samples.append(tuple(sample.get(metric) for metric in RequestMetricsService.METRICS))
+            RequestMetricsService._counts[key] = RequestMetricsService._counts.get(key, 0) + 1
+
+    @staticmethod
+    def clear():
+        with RequestMetricsService._lock:
+            RequestMetricsService._samples = {}
+            RequestMetricsService._counts = {}
+
+    @staticmethod
+    def _percentile(ordered: list, percentile: int):
+        # metoda najbliższej rangi
+        index = max(0, -(-percentile * len(ordered) // 100) - 1)
+        return ordered[index]
+
+    @staticmethod
+    def summary() -> dict:
+        with RequestMetricsService._lock:
+            samples = {key: list(values) for key, values in RequestMetricsService._samples.items()}
+            counts = dict(RequestMetricsService._counts)
+
+        result = {}
+        for key in sorted(samples):
+            stats = {"count": counts[key], "samples": len(samples[key])}
+            for position, metric in enumerate(RequestMetricsService.METRICS):
+                values = sorted(row[position] for row in samples[key] if row[position] is not None)
+                if not values:
+                    stats[metric] = None
+                    continue
+                stats[metric] = {
+                    **{
+                        f"p{percentile}": RequestMetricsService._percentile(values, percentile)
+                        for percentile in RequestMetricsService.PERCENTILES
+                    },
+                    "max": values[-1],
+                }
+            result[key] = stats
+        return result
@@ -0,0 +1,116 @@
+from django.db.models import Q
+
+from core.models import Motherboard, MotherboardConnector, MotherboardCapability
+
+
+class MotherboardCapabilityService:
+    """Przelicza MotherboardCapability z MotherboardConnector i supported_ram.
+
+    Serwisy kompatybilności porównują pojedyncze kolumny podsumowania zamiast
+    za każdym razem sortować złącza płyty w podzapytaniach.
+    """
+
+    FIELDS = (
+        "gpu_slot_gen", "gpu_slot_lanes", "m2_pcie_gen", "m2_pcie_lanes",
+        "m2_sata", "sata_ports", "power_connectors", "ram_types",
+    )
+    BATCH_SIZE = 500
+
+    # slot M.2 PCIe z niepustym `extra` (CharField) przyjmuje też dyski M.2 SATA;
+    # ta sama reguła w compute() i w zapytaniach dla płyt bez podsumowania
+    ACCEPTS_SATA = Q(connector__extra__isnull=False) & ~Q(connector__extra="")
+
+    @staticmethod
+    def accepts_sata(extra) -> bool:
+        return extra is not None and extra != ""
+
+    @staticmethod
+    def _empty():
+        return {
+            "gpu_slot_gen": None,
+            "gpu_slot_lanes": None,
+            "m2_pcie_gen": None,
+            "m2_pcie_lanes": None,
+            "m2_sata": False,
+            "sata_ports": 0,
+            "power_connectors": [],
+            "ram_types": 0,
+        }
+
+    @staticmethod
+    def _rank(*values):
+        # None na końcu, jak przy ORDER BY ... DESC w SQLite
+        return tuple(-1 if value is None else value for value in values)
+
+    @staticmethod
+    def compute(motherboard_ids) -> dict:
+        """motherboard_id -> pola podsumowania."""
+        summaries = {pk: MotherboardCapabilityService._empty() for pk in motherboard_ids}
+        power = {pk: set() for pk in motherboard_ids}
+        rank = MotherboardCapabilityService._rank
+
+        links = MotherboardConnector.objects.filter(motherboard_id__in=motherboard_ids).values_list(
+            "motherboard_id", "quantity", "connector__category", "connector__version",
+            "connector__lanes", "connector__extra", "connector__is_power",
+        )
+        for mobo_id, quantity, category, version, lanes, extra, is_power in links:
+            summary = summaries[mobo_id]
+            if is_power:
+                power[mobo_id].add((category, lanes, None if version is None else str(version)))
+            if quantity < 1:
+                continue
+            if category == "PCIe":
+                # najszerszy slot, przy remisie najnowszy
+                if rank(lanes, version) > rank(summary["gpu_slot_lanes"], summary["gpu_slot_gen"]):
+                    summary["gpu_slot_lanes"], summary["gpu_slot_gen"] = lanes, version
+            elif category == "M.2 PCIe":
+                # najnowszy slot, przy remisie najszerszy
+                if rank(version, lanes) > rank(summary["m2_pcie_gen"], summary["m2_pcie_lanes"]):
+                    summary["m2_pcie_gen"], summary["m2_pcie_lanes"] = version, lanes
+                if MotherboardCapabilityService.accepts_sata(extra):
+                    summary["m2_sata"] = True
+            elif category == "M.2 SATA":
+                summary["m2_sata"] = True
+            elif category == "SATA":
+                summary["sata_ports"] += quantity
+
+        for mobo_id, items in power.items():
+            items = sorted(items, key=lambda item: (item[0], rank(item[1]), item[2] or ""))
+            summaries[mobo_id]["power_connectors"] = [
+                {"category": category, "lanes": lanes, "version": version}
+                for category, lanes, version in items
+            ]
+
+        for mobo_id, ram_type in Motherboard.supported_ram.through.objects.filter(
+            motherboard_id__in=motherboard_ids,
+        ).values_list("motherboard_id", "rambase__type"):
+            summaries[mobo_id]["ram_types"] |= MotherboardCapability.ram_type_mask([ram_type])
+
+        return summaries
+
+    @staticmethod
+    def refresh(motherboard_ids=None):
+        """Przelicza podsumowania wskazanych płyt (None = wszystkich)."""
+        qs = Motherboard.objects.all()
+        if motherboard_ids is not None:
+            qs = qs.filter(pk__in=list(motherboard_ids))
+        ids = list(qs.values_list("id", flat=True))
+        if not ids:
+            return
+        summaries = MotherboardCapabilityService.compute(ids)
+        MotherboardCapability.objects.bulk_create(
+            [MotherboardCapability(motherboard_id=pk, **fields) for pk, fields in summaries.items()],
+            update_conflicts=True,
+            unique_fields=["motherboard"],
+            update_fields=MotherboardCapabilityService.FIELDS,
+            batch_size=MotherboardCapabilityService.BATCH_SIZE,
+        )
+
+    @staticmethod
+    def get(mobo: Motherboard) -> MotherboardCapability:
+        """Podsumowanie płyty; brakujące (np. po loaddata) jest liczone na miejscu."""
+        try:
+            return mobo.capability
+        except MotherboardCapability.DoesNotExist:
+            MotherboardCapabilityService.refresh([mobo.pk])
+            return MotherboardCapability.objects.get(pk=mobo.pk)
@@ -1,4 +1,8 @@
-from core.models import Motherboard, CPU, RAM, MotherboardConnector, Case, GPU, Storage
+from django.db.models import Exists, F, OuterRef, Q
+
+from core.models import Motherboard, CPU, RAM, Case, GPU, Storage, MotherboardCapability, MotherboardConnector
+from core.services.build_selection import BuildSelection
+from core.services.motherboard_capability_service import MotherboardCapabilityService
 from core import tools
 
 class MotherboardService:
@@ -18,89 +22,104 @@ class MotherboardService:
             total_capacity__lte=mobo.max_ram_capacity,
         )
         
+    # Płyty bez wiersza MotherboardCapability (np. po loaddata, przed rebuild_motherboard_capabilities)
+    # są sprawdzane dawnymi zapytaniami po złączach i supported_ram.
+    WITHOUT_CAPABILITY = Q(capability__isnull=True)
+
+    @staticmethod
+    def _has_slot(*conditions, **lookups):
+        return Exists(MotherboardConnector.objects.filter(
+            *conditions, motherboard=OuterRef("pk"), quantity__gte=1, **lookups,
+        ))
+
+    @staticmethod
+    def filter_by_ram_types(qs, ram_types):
+        # płyty wspierające choć jeden z typów; maska z MotherboardCapability zamiast złączenia M2M
+        mask = MotherboardCapability.ram_type_mask(ram_types)
+        supported = Exists(Motherboard.supported_ram.through.objects.filter(
+            motherboard_id=OuterRef("pk"), rambase__type__in=list(ram_types),
+        ))
+        return qs.alias(shared_ram_types=F("capability__ram_types").bitand(mask)).filter(
+            Q(shared_ram_types__gt=0) | MotherboardService.WITHOUT_CAPABILITY & supported
+        )
+
+    @staticmethod
+    def filter_by_gpu_lanes(qs, lanes):
+        slot = MotherboardService._has_slot(connector__category="PCIe", connector__lanes__gte=lanes)
+        return qs.filter(Q(capability__gpu_slot_lanes__gte=lanes) | MotherboardService.WITHOUT_CAPABILITY & slot)
+
+    @staticmethod
+    def filter_by_storage(qs, connector):
+        has_slot = MotherboardService._has_slot
+        m2_sata = Q(capability__m2_sata=True) | MotherboardService.WITHOUT_CAPABILITY & (
+            has_slot(connector__category="M.2 SATA")
+            | has_slot(MotherboardCapabilityService.ACCEPTS_SATA, connector__category="M.2 PCIe")
+        )
+
+        if connector.category == "M.2 SATA":
+            slots = m2_sata
+        elif connector.category == "SATA":
+            slots = Q(capability__sata_ports__gte=1) | MotherboardService.WITHOUT_CAPABILITY & has_slot(
+                connector__category="SATA",
+            )
+        else:
+            # generacja i linie muszą pasować do tego samego slotu (płyta z 5.0 x2 i 4.0 x4
+            # przyjmuje dysk 4.0 x4), więc tu zawsze po złączach, a nie po najlepszym slocie
+            slots = Q(has_slot(
+                connector__category="M.2 PCIe",
+                connector__version__gte=connector.version,
+                connector__lanes__gte=connector.lanes,
+            ))
+            if MotherboardCapabilityService.accepts_sata(connector.extra):
+                slots |= m2_sata
+        return qs.filter(slots)
+
     @staticmethod
-    def get_compatible_motherboards(data: dict[str, int]):
+    def get_compatible_motherboards(data: dict[str, int], selection: BuildSelection = None):
         qs = Motherboard.objects.all()
+        selection = selection or BuildSelection(data)
         
-        cpu_pk = data.get("cpu")
-        ram_pk = data.get("ram")
-        gpu_pk = data.get("gpu")
-        mem_pk = data.get("mem")
-        case_pk = data.get("case")
-        
-        if cpu_pk:
-            cpu = CPU.objects.get(pk=cpu_pk)
+        if selection.pk("cpu"):
+            cpu = selection.require("cpu")
             qs = qs.filter(socket=cpu.socket)
-            cpu_types = set(cpu.supported_ram.values_list("type", flat=True).distinct())
+            cpu_types = selection.cpu_ram_types()
             if not cpu_types:
                 return qs.none()
-            qs = qs.filter(supported_ram__type__in=cpu_types)
+            qs = MotherboardService.filter_by_ram_types(qs, cpu_types)
             
-        if ram_pk:
-            ram = RAM.objects.get(pk=ram_pk)
-            qs = qs.filter(
-                supported_ram__type=ram.base.type,
+        if selection.pk("ram"):
+            ram = selection.require("ram")
+            qs = MotherboardService.filter_by_ram_types(qs, [ram.base.type]).filter(
                 dimm_slots__gte=ram.modules_count,
                 max_ram_capacity__gte=ram.total_capacity,
             )
             
-        if gpu_pk:
-            gpu = GPU.objects.get(pk=gpu_pk) # TODO: czy tutaj order_by jest konieczne?
+        if selection.pk("gpu"):
+            gpu = selection.require("gpu")
             gpu_chip = gpu.graphics_chip
             if not gpu_chip:
                 raise ValueError("GPU bez PCIe!")
 
-            qs = qs.filter(
-                motherboardconnector__connector__category="PCIe",
-                motherboardconnector__connector__lanes__gte=gpu_chip.pcie_max_width,
-                motherboardconnector__quantity__gte=1
-            )
-            
-        if mem_pk:
-            mem = Storage.objects.get(pk=mem_pk)
-            mem_conn = mem.connector
+            qs = MotherboardService.filter_by_gpu_lanes(qs, gpu_chip.pcie_max_width)
             
-            allowed_slots = [mem_conn.category]
-            if mem_conn.extra:
-                allowed_slots.append("M.2 SATA")
-                
-            if mem_conn.category == "M.2 SATA":
-                qs = qs.filter(
-                    motherboardconnector__connector__category__in=allowed_slots,
-                )
-            else:
-                qs = qs.filter(
-                    motherboardconnector__connector__category__in=allowed_slots,
-                    motherboardconnector__connector__version__gte=mem_conn.version,
-                    motherboardconnector__connector__lanes__gte=mem_conn.lanes,
-                )
+        if selection.pk("mem"):
+            mem = selection.require("mem")
+            qs = MotherboardService.filter_by_storage(qs, mem.connector)
                 
-        if case_pk: # TODO: jak działa prefetch_related? nie mam intuicji
-            case = (
-                Case.objects.filter(pk=case_pk)
-                    .prefetch_related("mobo_form_factor_support")
-                    .first()
-            )
-            supported_formats = case.mobo_form_factor_support.all()
+        if selection.pk("case"):
+            supported_formats = selection.case_mobo_form_factors()
             qs = qs.filter(form_factor__in=supported_formats)
             
         return qs.distinct()
     
     @staticmethod
     def get_compatible_gpus(mobo: Motherboard):
-        # pobierz maksymalne wartości PCIe z mobo
-        mobo_slot = (
-            MotherboardConnector.objects
-                .filter(motherboard=mobo, connector__category="PCIe")
-                .order_by("-connector__lanes", "-connector__version")
-                .values("connector__lanes")
-                .first()
-        )
+        # najszerszy slot PCIe z podsumowania płyty
+        lanes = MotherboardCapabilityService.get(mobo).gpu_slot_lanes
 
-        if not mobo_slot: # TODO: płyta główna może nie mieć PCIe?
+        if lanes is None: # TODO: płyta główna może nie mieć PCIe?
             return GPU.objects.none()
 
-        lanes = mobo_slot["connector__lanes"]
         qs = GPU.objects.filter(
             graphics_chip__pcie_max_width__lte=lanes,
         )
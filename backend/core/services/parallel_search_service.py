@@ -0,0 +1,124 @@
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from decimal import Decimal
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from core.services.catalog_service import CatalogSnapshot
+
+# migawka katalogu w procesie roboczym, wczytana raz przez _init_worker
+_worker_snapshot: Optional["CatalogSnapshot"] = None
+
+
+def _init_worker(snapshot_data: bytes):
+    # proces roboczy startuje bez Django (forkserver/spawn), więc najpierw setup,
+    # dopiero potem odpakowanie migawki, które importuje core.models
+    import django
+    django.setup()
+
+    global _worker_snapshot
+    _worker_snapshot = pickle.loads(snapshot_data)
+
+
+def _search_shard(budget, k, start, step):
+    # import tutaj: builder_service importuje ten moduł
+    from core.services.builder_service import BuildBuilderService, SearchProgress
+    progress = SearchProgress()
+    results = BuildBuilderService.search_shard(_worker_snapshot, budget, k, start, step, progress)
+    return results, progress.candidates
+
+
+class ParallelSearchService:
+    """Równoległe search_top: karty graficzne dzielone co `workers`-tą między procesy.
+
+    Pula procesów jest tworzona raz na wersję katalogu; migawka trafia do procesów
+    raz, przez initializer, więc zadanie przesyła tylko budżet i numer fragmentu.
+    Procesy robocze nie używają bazy danych. Procesy startują przez forkserver
+    (albo spawn, gdzie go nie ma), a nie fork: proces serwera ma inne wątki
+    (przebudowa frontu, zadania buildera), a fork przy zajętych przez nie blokadach
+    (logging, połączenia, cache) może zakleszczyć proces potomny.
+    """
+
+    _lock = threading.Lock()
+    _executor: Optional[ProcessPoolExecutor] = None
+    _key = None
+
+    @staticmethod
+    def get_start_method() -> str:
+        methods = multiprocessing.get_all_start_methods()
+        return "forkserver" if "forkserver" in methods else "spawn"
+
+    @staticmethod
+    def get_executor(snapshot: "CatalogSnapshot", workers: int) -> ProcessPoolExecutor:
+        key = (snapshot.version, id(snapshot), workers)
+        with ParallelSearchService._lock:
+            if ParallelSearchService._key != key:
+                if ParallelSearchService._executor is not None:
+                    # trwające wyszukiwania na starej migawce dokończą się w tle
+                    ParallelSearchService._executor.shutdown(wait=False)
+                ParallelSearchService._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context(ParallelSearchService.get_start_method()),
+                    initializer=_init_worker,
+                    initargs=(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL),),
+                )
+                ParallelSearchService._key = key
+            return ParallelSearchService._executor
+
+    @staticmethod
+    def shutdown():
+        with ParallelSearchService._lock:
+            if ParallelSearchService._executor is not None:
+                ParallelSearchService._executor.shutdown(wait=True)
+            ParallelSearchService._executor = None
+            ParallelSearchService._key = None
+
+    @staticmethod
+    def search_top(snapshot: "CatalogSnapshot", budget: Decimal, k: int, workers: int, progress=None) -> list:
+        from core.services.builder_service import BuildBuilderService
+
+        executor = ParallelSearchService.get_executor(snapshot, workers)
+        gpus_total = len(snapshot.gpus_ranked)
+        if progress is not None:
+            progress.gpus_total += gpus_total
+        try:
+            futures = {
+                executor.submit(_search_shard, budget, k, start, workers): start for start in range(workers)
+            }
+            shards = {}
+            # postęp liczony z dokładnością do ukończonych fragmentów
+            for future in as_completed(futures):
+                start = futures[future]
+                shards[start], explored = future.result()
+                if progress is not None:
+                    progress.gpus_done += len(range(start, gpus_total, workers))
+                    progress.candidates += explored
+                    if shards[start]:
+                        progress.offer(shards[start][0])
+        except (BrokenProcessPool, OSError):
+            # pula padła albo procesy nie wystartowały - liczymy na miejscu
+            ParallelSearchService.shutdown()
+            if progress is not None:
+                progress.gpus_total -= gpus_total
+                progress.gpus_done = 0
+            return BuildBuilderService.search_shard(snapshot, budget, k, progress=progress)
+        return ParallelSearchService.merge(snapshot, [shards[start] for start in range(workers)], k)
+
+    @staticmethod
+    def merge(snapshot: "CatalogSnapshot", shards: list[list], k: int) -> list:
+        """K najlepszych z wyników fragmentów, w tej samej kolejności co wyszukiwanie sekwencyjne.
+
+        Przy remisie (wynik, cena) sekwencyjnie wygrywa kandydat znaleziony wcześniej: z karty
+        wyżej w rankingu, a dla tej samej karty - wcześniejszy na liście fragmentu.
+        """
+        gpu_rank = {gpu.id: index for index, gpu in enumerate(snapshot.gpus_ranked)}
+        ranked = [
+            ((-candidate.score, -candidate.total_price, gpu_rank[candidate.gpu_id], position), candidate)
+            for shard in shards
+            for position, candidate in enumerate(shard)
+        ]
+        ranked.sort(key=lambda item: item[0])
+        return [candidate for _, candidate in ranked[:k]]
@@ -1,11 +1,21 @@
 
 import re
+from collections import defaultdict
+from decimal import Decimal
 
-from core.models import PSU, Case, Motherboard, GPU, MotherboardConnector, GPUConnector, CPU
+from django.db.models import Exists, OuterRef, Q, Value
+from django.db.models.functions import Coalesce
+
+from core.models import (
+    PSU, Case, Motherboard, GPU, MotherboardConnector, GPUConnector, CPU, PSUConnectorItem,
+)
+
+from core.services.build_selection import BuildSelection
 
 class PSUService:
     
     SAFETY_FACTOR = 0.75
+    ANY_VERSION = Decimal("9.9")
 
     @staticmethod
     def _coerce_number(value):
@@ -147,6 +157,34 @@ class PSUService:
 
     @staticmethod
     def _find_best_subset(values, target):
+        # Subset-sum DP na bitsetach: reachable[i] ma ustawiony bit s, gdy sumę s da się
+        # złożyć z values[i:]. Wynik jak w wersji wyczerpującej: najmniejsza suma >= target,
+        # a spośród takich podzbiorów pierwszy w kolejności indeksów.
+        if target <= 0:
+            return []
+
+        reachable = [0] * (len(values) + 1)
+        reachable[-1] = 1
+        for i in range(len(values) - 1, -1, -1):
+            reachable[i] = reachable[i + 1] | (reachable[i + 1] << values[i])
+
+        above_target = reachable[0] >> target
+        if not above_target:
+            return None
+        remaining = target + (above_target & -above_target).bit_length() - 1
+
+        chosen = []
+        for i, value in enumerate(values):
+            if remaining == 0:
+                break
+            if value <= remaining and (reachable[i + 1] >> (remaining - value)) & 1:
+                chosen.append(i)
+                remaining -= value
+        return chosen
+
+    @staticmethod
+    def _find_best_subset_exhaustive(values, target):
+        # Poprzednia, wykładnicza implementacja; zostaje jako punkt odniesienia dla testów i benchmarku.
         best_sum = None
         best = None
 
@@ -192,69 +230,103 @@ class PSUService:
         return True
 
     @staticmethod
-    def psu_supports_connector(psu_connectors, requirement) -> bool:
+    def normalize_connectors(connectors) -> list[dict]:
+        if not connectors:
+            return []
+        if isinstance(connectors, dict):
+            connectors = [
+                {"name": name, "quantity": count} for name, count in connectors.items()
+            ]
+
+        items = []
+        for item in connectors:
+            normalized = PSUService._normalize_connector_item(item)
+            if not normalized:
+                continue
+            category, lanes, version = normalized
+            lanes = PSUService._coerce_number(lanes)
+            version = PSUService._coerce_number(version)
+            quantity = PSUService._coerce_number(PSUService._extract_connector_quantity(item))
+            items.append({
+                "category": category,
+                "lanes": int(lanes) if lanes is not None else None,
+                "version": Decimal(str(version)) if version is not None else None,
+                "quantity": int(quantity) if quantity is not None else 1,
+            })
+        return items
+
+    @staticmethod
+    def inventory_supports_connector(items, requirement) -> bool:
         req_category, req_lanes, req_version = PSUService._extract_requirement(requirement)
         if not req_category:
             return False
 
         req_lanes = PSUService._coerce_number(req_lanes)
         req_version = PSUService._coerce_number(req_version)
-        for item in psu_connectors or []:
-            normalized = PSUService._normalize_connector_item(item)
-            if not normalized:
-                continue
-            item_category, item_lanes_raw, item_version_raw = normalized
-            if item_category != req_category:
+        for item in items:
+            if item["category"] != req_category:
                 continue
-
-            item_lanes = PSUService._coerce_number(item_lanes_raw)
-            if req_lanes is not None and (item_lanes is None or item_lanes < req_lanes):
+            if req_lanes is not None and (item["lanes"] is None or item["lanes"] < req_lanes):
                 continue
-
             if req_version is not None:
-                item_version = PSUService._coerce_number(item_version_raw)
+                item_version = PSUService._coerce_number(item["version"])
                 if item_version is not None and item_version < req_version:
                     continue
-
             return True
 
         return False
+
+    @staticmethod
+    def psu_supports_connector(psu_connectors, requirement) -> bool:
+        items = PSUService.normalize_connectors(psu_connectors)
+        return PSUService.inventory_supports_connector(items, requirement)
+
+    @staticmethod
+    def sync_connector_inventory(psu: PSU):
+        items = PSUService.normalize_connectors(psu.connectors)
+        PSUConnectorItem.objects.filter(psu=psu).delete()
+        PSUConnectorItem.objects.bulk_create(
+            [PSUConnectorItem(psu=psu, **item) for item in items]
+        )
+        psu.pcie_pins = PSUService.get_pcie_pins_list(psu.connectors)
+        psu.connector_inventory_synced = True
+        # update() zamiast save(), żeby nie wywołać ponownie sygnału post_save
+        PSU.objects.filter(pk=psu.pk).update(pcie_pins=psu.pcie_pins, connector_inventory_synced=True)
+
+    @staticmethod
+    def get_psu_pcie_pins(pcie_pins, connectors):
+        # pcie_pins == None oznacza brak danych o pinach albo rekord jeszcze nieprzeliczony
+        if pcie_pins is not None:
+            return pcie_pins
+        return PSUService.get_pcie_pins_list(connectors)
     
     @staticmethod
-    def get_compatible_psus(data: dict[str, int]):
+    def get_compatible_psus(data: dict[str, int], selection: BuildSelection = None):
         
         qs = PSU.objects.all()
-        
-        gpu_pk = data.get("gpu")
-        cpu_pk = data.get("cpu")
-        mobo_pk = data.get("mobo")
-        case_pk = data.get("case")
+        selection = selection or BuildSelection(data)
 
         min_wattage = 0
         
-        if gpu_pk:
+        if selection.pk("gpu"):
             # If a GPU is selected, its recommended system power is the primary criterion.
-            gpu = GPU.objects.select_related('graphics_chip').filter(pk=gpu_pk).first()
+            gpu = selection.get("gpu")
             if gpu:
                 if gpu.recommended_system_power_w:
                     min_wattage = gpu.recommended_system_power_w
         
-        elif cpu_pk:
+        elif selection.pk("cpu"):
             # If no GPU, estimate based on CPU TDP + a baseline for the rest of the system.
-            cpu_tdp = (
-                CPU.objects.filter(pk=cpu_pk)
-                .values_list("tdp", flat=True)
-                .first()
-            ) or 0
+            cpu = selection.get("cpu")
+            cpu_tdp = (cpu.tdp if cpu else None) or 0
             min_wattage = cpu_tdp + 250 # Baseline for a system without a powerful GPU
 
-        if mobo_pk:
-            mobo = Motherboard.objects.get(pk=mobo_pk)
+        if selection.pk("mobo"):
+            mobo = selection.require("mobo")
             qs = PSUService.filter_by_mobo(qs, mobo)
             
-        if case_pk:
-            case = Case.objects.filter(pk=case_pk).prefetch_related("psu_form_factor_support").first()
-            supported_formats = case.psu_form_factor_support.all()
+        if selection.pk("case"):
+            supported_formats = selection.case_psu_form_factors()
             qs = qs.filter(form_factor__in=supported_formats)
         
         qs = qs.filter(wattage__gte=min_wattage)
@@ -263,23 +335,49 @@ class PSUService:
     
     
     @staticmethod
-    def filter_by_mobo(qs, mobo: Motherboard): # TODO: też mi się to nie podoba
-        
-        mobo_conns = MotherboardConnector.objects.filter(
-            motherboard=mobo,
-            connector__is_power=True
+    def unsupported_power_requirements(mobo):
+        # Wymagania zasilania płyty, których nie spełnia żaden element inwentarza zasilacza
+        # z zapytania zewnętrznego. Brak lanes/version po stronie wymagania oznacza "dowolne",
+        # a brak wersji po stronie zasilacza nie dyskwalifikuje złącza.
+        matching_items = (
+            PSUConnectorItem.objects
+            .filter(psu=OuterRef(OuterRef("pk")), category=OuterRef("connector__category"))
+            .annotate(
+                item_lanes=Coalesce("lanes", Value(-1)),
+                item_version=Coalesce("version", Value(PSUService.ANY_VERSION)),
+            )
+            .filter(
+                item_lanes__gte=Coalesce(OuterRef("connector__lanes"), Value(-1)),
+                item_version__gte=Coalesce(OuterRef("connector__version"), Value(Decimal("0"))),
+            )
+        )
+        return (
+            MotherboardConnector.objects
+            .filter(motherboard=mobo, connector__is_power=True)
+            .exclude(Exists(matching_items))
         )
 
-        requirements = [conn.connector for conn in mobo_conns.select_related("connector")]
-        if not requirements:
-            return qs.distinct()
-
-        psu_ids = []
-        for psu_id, connectors in qs.values_list("id", "connectors"):
-            if all(PSUService.psu_supports_connector(connectors, req) for req in requirements):
-                psu_ids.append(psu_id)
-
-        return qs.filter(id__in=psu_ids).distinct()
+    @staticmethod
+    def filter_by_mobo(qs, mobo: Motherboard):
+        supported = ~Exists(PSUService.unsupported_power_requirements(mobo))
+        # zasilacze z nieprzeliczonym inwentarzem (loaddata/bulk_create pomijają sygnały, a
+        # backfill_psu_connectors jeszcze nie był uruchomiony) sprawdzamy na podstawie PSU.connectors
+        fallback = list(qs.filter(connector_inventory_synced=False).values_list("id", "connectors"))
+        if not fallback:
+            return qs.filter(supported).distinct()
+
+        requirements = [
+            item.connector
+            for item in MotherboardConnector.objects.filter(
+                motherboard=mobo, connector__is_power=True,
+            ).select_related("connector")
+        ]
+        fallback_ids = [
+            psu_id
+            for psu_id, connectors in fallback
+            if all(PSUService.psu_supports_connector(connectors, requirement) for requirement in requirements)
+        ]
+        return qs.filter(supported | Q(id__in=fallback_ids)).distinct()
     
     
     @staticmethod
@@ -297,11 +395,9 @@ class PSUService:
             return qs
 
         psu_ids = []
-        for psu_id, connectors in qs.values_list("id", "connectors"):
-            available_pins = PSUService.get_pcie_pins_list(connectors)
+        for psu_id, pcie_pins, connectors in qs.values_list("id", "pcie_pins", "connectors"):
+            available_pins = PSUService.get_psu_pcie_pins(pcie_pins, connectors)
             if PSUService.can_satisfy_gpu_power(available_pins, required_pins):
                 psu_ids.append(psu_id)
 
         return qs.filter(id__in=psu_ids)
-        
-        
@@ -1,4 +1,6 @@
 from core.models import RAM, CPU, Motherboard
+from core.services.build_selection import BuildSelection
+from core.services.motherboard_service import MotherboardService
 
 
 class RAMService:
@@ -15,37 +17,25 @@ class RAMService:
     
     @staticmethod
     def get_compatible_motherboards(ram: RAM):
-        return Motherboard.objects.filter(
-            supported_ram__type=ram.base.type,
+        return MotherboardService.filter_by_ram_types(Motherboard.objects.all(), [ram.base.type]).filter(
             dimm_slots__gte=ram.modules_count,
             max_ram_capacity__gte=ram.total_capacity,
-        ).distinct()
+        )
         
     @staticmethod
-    def get_compatible_rams(data: dict[str, int]):
+    def get_compatible_rams(data: dict[str, int], selection: BuildSelection = None):
         qs = RAM.objects.all()
+        selection = selection or BuildSelection(data)
         
-        cpu_pk = data.get("cpu")
-        mobo_pk = data.get("mobo")
-        cpu = None
-        mobo = None
-        
-        # print(f"\n\n\nCMP RAM: {cpu_pk} | {mobo_pk}")
-        
-        if cpu_pk:
-            cpu = CPU.objects.get(pk=cpu_pk)
-            # print(f"\nCMP RAM cpu: {qs}")
-        
-        if mobo_pk:
-            mobo = Motherboard.objects.get(pk=mobo_pk)
-            # print(f"\nCMP RAM mobo: {qs}\n\n\n")
+        cpu = selection.require("cpu")
+        mobo = selection.require("mobo")
         
         if cpu or mobo:
             types = None
             if cpu:
-                types = RAMService._get_supported_ram_types(cpu)
+                types = selection.cpu_ram_types()
             if mobo:
-                mobo_types = RAMService._get_supported_ram_types(mobo)
+                mobo_types = selection.mobo_ram_types()
                 types = mobo_types if types is None else types.intersection(mobo_types)
             if not types:
                 return qs.none()
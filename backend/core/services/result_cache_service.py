@@ -0,0 +1,193 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from core.services.builder_service import BuildBuilderService
+from core.services.catalog_service import CatalogService
+
+
+class LocalMemoryCacheBackend:
+    def __init__(self, max_entries=1024, **options):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class FileCacheBackend:
+    # LRU po czasie modyfikacji pliku, odczyt "dotyka" plik
+    def __init__(self, location, max_entries=1024, **options):
+        self.location = Path(location)
+        self.max_entries = max_entries
+        self.evictions = 0
+        self.location.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key):
+        return self.location / f"{hashlib.sha1(key.encode()).hexdigest()}.pickle"
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                stored_key, value = pickle.load(handle)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return value if stored_key == key else None
+
+    def set(self, key, value):
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as handle:
+            pickle.dump((key, value), handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._cull()
+
+    def _cull(self):
+        entries = list(self.location.glob("*.pickle"))
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self.max_entries]:
+            entry.unlink(missing_ok=True)
+            self.evictions += 1
+
+    def clear(self):
+        for entry in self.location.glob("*.pickle"):
+            entry.unlink(missing_ok=True)
+
+
+class DjangoCacheBackend:
+    # eksmisja po stronie skonfigurowanego backendu Django, więc jej nie liczymy
+    evictions = None
+
+    def __init__(self, alias="default", timeout=None, **options):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value):
+        self.cache.set(key, value, timeout=self.timeout)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class BuilderResultCache:
+    """Builder responses keyed by catalog version, mode, target tier and budget.
+
+    Concurrent misses for the same key wait for the first caller instead of
+    running their own search.
+    """
+
+    WAIT_TIMEOUT = 30
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    @classmethod
+    def get_default(cls) -> "BuilderResultCache":
+        with cls._default_lock:
+            if cls._default is None:
+                config = dict(getattr(settings, "BUILDER_RESULT_CACHE", {}))
+                backend_class = import_string(
+                    config.pop("BACKEND", "core.services.result_cache_service.LocalMemoryCacheBackend")
+                )
+                options = {key.lower(): value for key, value in config.items()}
+                cls._default = cls(backend_class(**options))
+            return cls._default
+
+    @staticmethod
+    def make_key(budget: int, mode: str, k=None, constraints=None) -> str:
+        target_ram_gb, target_storage_gb = BuildBuilderService.get_targets(budget)
+        parts = [
+            "builder", CatalogService.get_version(), mode, k or 1,
+            f"{target_ram_gb}-{target_storage_gb}", budget,
+        ]
+        if constraints:
+            parts.append(constraints.cache_key())
+        return ":".join(str(part) for part in parts)
+
+    def get_or_compute(self, key, compute):
+        value = self.backend.get(key)
+        if value is not None:
+            self._count_hit()
+            return value
+
+        with self._lock:
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = threading.Event()
+                self._inflight[key] = event
+
+        if not leader:
+            event.wait(self.WAIT_TIMEOUT)
+            value = self.backend.get(key)
+            if value is not None:
+                self._count_hit()
+                return value
+
+        try:
+            value = compute()
+            self.backend.set(key, value)
+            with self._lock:
+                self.misses += 1
+            return value
+        finally:
+            if leader:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    def _count_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "evictions": self.backend.evictions,
+            }
+
+    def clear(self):
+        self.backend.clear()
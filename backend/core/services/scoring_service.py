@@ -0,0 +1,221 @@
+import heapq
+import threading
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, Coalesce
+
+from core.models import CPU, GPU, GraphicsChip
+from core.services.catalog_service import CatalogService
+
+try:
+    import numpy as np
+except ImportError:  # numpy jest opcjonalne - bez niego liczymy na listach
+    np = None
+
+
+@dataclass(frozen=True)
+class FeatureTable:
+    """Cechy wszystkich komponentów kategorii jako kolumny (tablice numpy albo listy)."""
+    ids: object
+    columns: dict
+    tier_scores: object
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class ScoringService:
+    """Wektorowe liczenie ocen dla całego katalogu i wybór najlepszych N.
+
+    Profil wag to {kategoria: {"weights": {cecha: waga}, "max_score": ...}};
+    ocena = min(suma(waga * cecha) / max_score, 1) * 10. Profil "default" odtwarza
+    wzory compute_tier_score z modeli (z nich pochodzą zapisane kolumny tier_score).
+    Dodatkowe lub zmienione profile: settings.TIER_SCORE_PROFILES.
+    """
+
+    # kolumny cech: nazwa -> wyrażenie ORM (brakujące wartości jak w compute_tier_score)
+    FEATURES = {
+        "cpu": (CPU, {
+            "p_cores": F("p_cores"),
+            "e_cores": F("e_cores"),
+            "threads": F("threads"),
+            "cache_mb": Coalesce("cache_mb", 0, output_field=FloatField()),
+            "clock_ghz": Cast(Coalesce("boost_clock_ghz", "base_clock_ghz"), FloatField()),
+        }),
+        "gpu": (GPU, {
+            "clock_mhz": Coalesce("boost_clock_mhz", "base_clock_mhz", 0, output_field=FloatField()),
+            "vram_gb": Coalesce("vram_size_gb", 0, output_field=FloatField()),
+            "bus_width": Coalesce("graphics_chip__memory_bus_width", 0, output_field=FloatField()),
+        }),
+        "chip": (GraphicsChip, {
+            "bus_width": Coalesce("memory_bus_width", 0, output_field=FloatField()),
+        }),
+    }
+
+    PROFILES = {
+        "default": {
+            "cpu": {
+                "weights": {"p_cores": 4, "e_cores": 1, "threads": 1, "cache_mb": 0.5, "clock_ghz": 2},
+                "max_score": 125,
+            },
+            "gpu": {"weights": {"clock_mhz": 0.1, "vram_gb": 1}, "max_score": 314 + 241},
+            "chip": {"weights": {"bus_width": 0.1}, "max_score": 250},
+        },
+        # gry: zegar i cache procesora, szyna i VRAM karty
+        "gaming": {
+            "cpu": {
+                "weights": {"p_cores": 5, "e_cores": 0.5, "threads": 0.5, "cache_mb": 1, "clock_ghz": 6},
+                "max_score": 180,
+            },
+            "gpu": {"weights": {"clock_mhz": 0.1, "vram_gb": 2, "bus_width": 0.5}, "max_score": 500},
+            "chip": {"weights": {"bus_width": 0.1}, "max_score": 250},
+        },
+        # biuro: liczba rdzeni ważniejsza niż cache, karta ma znaczenie marginalne
+        "office": {
+            "cpu": {
+                "weights": {"p_cores": 2, "e_cores": 2, "threads": 0.5, "cache_mb": 0.25, "clock_ghz": 4},
+                "max_score": 90,
+            },
+            "gpu": {"weights": {"clock_mhz": 0.05, "vram_gb": 0.5, "bus_width": 0.1}, "max_score": 200},
+            "chip": {"weights": {"bus_width": 0.1}, "max_score": 250},
+        },
+    }
+
+    # największe N dla /api/rankings/
+    MAX_TOP_N = 100
+
+    _lock = threading.Lock()
+    _version = None
+    _tables: dict = {}
+    _scores: dict = {}
+
+    @staticmethod
+    def get_profiles() -> dict:
+        return {**ScoringService.PROFILES, **getattr(settings, "TIER_SCORE_PROFILES", {})}
+
+    @staticmethod
+    def load_table(category: str) -> FeatureTable:
+        """Jedno zapytanie na kategorię; wiersze w kolejności id."""
+        model, expressions = ScoringService.FEATURES[category]
+        names = list(expressions)
+        rows = list(
+            model.objects.order_by("id")
+            .annotate(**{f"feature_{name}": expression for name, expression in expressions.items()})
+            .values_list("id", "tier_score", *(f"feature_{name}" for name in names))
+        )
+        columns = list(zip(*rows)) or [() for _ in range(len(names) + 2)]
+        ids, tier_scores, values = columns[0], columns[1], columns[2:]
+
+        if np is None:
+            return FeatureTable(
+                ids=list(ids),
+                columns={name: [float(value) for value in column] for name, column in zip(names, values)},
+                tier_scores=list(tier_scores),
+            )
+        return FeatureTable(
+            ids=np.array(ids, dtype=np.int64),
+            columns={name: np.array(column, dtype=np.float64) for name, column in zip(names, values)},
+            tier_scores=np.array(tier_scores, dtype=np.int64),
+        )
+
+    @staticmethod
+    def compute(table: FeatureTable, category: str, profile: str = "default"):
+        """Oceny 0-10 (float) dla wszystkich wierszy tabeli naraz."""
+        config = ScoringService.get_profiles()[profile][category]
+        weights, max_score = config["weights"], config["max_score"]
+
+        if np is None:
+            raw = [0.0] * len(table)
+            for name, weight in weights.items():
+                raw = [total + value * weight for total, value in zip(raw, table.columns[name])]
+            return [min(total / max_score * 10, 10) for total in raw]
+
+        # kolejność dodawania jak we wzorach modeli, żeby wyniki były identyczne co do bitu
+        raw = np.zeros(len(table))
+        for name, weight in weights.items():
+            raw = raw + table.columns[name] * weight
+        return np.minimum(raw / max_score * 10, 10)
+
+    @staticmethod
+    def round_scores(scores):
+        # round() i np.round zaokrąglają połówki do parzystej, tak jak compute_tier_score
+        if np is None:
+            return [round(score) for score in scores]
+        return np.round(scores).astype(np.int64)
+
+    @staticmethod
+    def top_indices(scores, n: int, positions=None) -> list[int]:
+        """Pozycje N najwyższych ocen (remisy: niższa pozycja, czyli niższe id, wygrywa)."""
+        if n < 1:
+            return []
+        if np is None:
+            candidates = range(len(scores)) if positions is None else positions
+            return heapq.nsmallest(n, candidates, key=lambda i: (-scores[i], i))
+
+        candidates = np.arange(len(scores)) if positions is None else np.asarray(positions, dtype=np.int64)
+        if n < len(candidates):
+            # partition: O(len) próg N-tej oceny, sortujemy tylko to, co go osiąga (z remisami)
+            selected = scores[candidates]
+            threshold = -np.partition(-selected, n - 1)[n - 1]
+            candidates = candidates[selected >= threshold]
+        order = np.lexsort((candidates, -scores[candidates]))
+        return candidates[order][:n].tolist()
+
+    # --- wyniki dla bieżącej wersji katalogu ---
+
+    @staticmethod
+    def _check_version():
+        version = CatalogService.get_version()
+        if ScoringService._version != version:
+            with ScoringService._lock:
+                if ScoringService._version != version:
+                    ScoringService._tables = {}
+                    ScoringService._scores = {}
+                    ScoringService._version = version
+
+    @staticmethod
+    def clear():
+        with ScoringService._lock:
+            ScoringService._version = None
+            ScoringService._tables = {}
+            ScoringService._scores = {}
+
+    @staticmethod
+    def get_table(category: str) -> FeatureTable:
+        ScoringService._check_version()
+        table = ScoringService._tables.get(category)
+        if table is None:
+            table = ScoringService.load_table(category)
+            ScoringService._tables[category] = table
+        return table
+
+    @staticmethod
+    def get_scores(category: str, profile: str = "default"):
+        ScoringService._check_version()
+        key = (category, profile)
+        scores = ScoringService._scores.get(key)
+        if scores is None:
+            scores = ScoringService.compute(ScoringService.get_table(category), category, profile)
+            ScoringService._scores[key] = scores
+        return scores
+
+    @staticmethod
+    def top(category: str, n: int, profile: str = "default", ids=None) -> list[tuple[int, float]]:
+        """N najlepszych (id, ocena) w kategorii; `ids` zawęża wybór do podanych komponentów."""
+        table = ScoringService.get_table(category)
+        scores = ScoringService.get_scores(category, profile)
+
+        positions = None
+        if ids is not None:
+            if np is None:
+                wanted = set(ids)
+                positions = [i for i, pk in enumerate(table.ids) if pk in wanted]
+            else:
+                positions = np.flatnonzero(np.isin(table.ids, list(ids)))
+
+        return [
+            (int(table.ids[i]), float(scores[i]))
+            for i in ScoringService.top_indices(scores, n, positions)
+        ]
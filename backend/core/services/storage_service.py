@@ -1,44 +1,33 @@
-from core.models import Storage, MotherboardConnector
+from django.db.models import Q
+
+from core.models import Storage
+from core.services.build_selection import BuildSelection
 
 class StorageService:
     
     @staticmethod
-    def get_compatible_m2(data: dict[str, int]):
+    def get_compatible_m2(data: dict[str, int], selection: BuildSelection = None):
         qs = Storage.objects.all()
+        selection = selection or BuildSelection(data)
         
-        mobo_pk = data.get("mobo")
-        slot = StorageService.get_mobo_slot(mobo_pk)
-            
-        if slot:
-            slot_category = slot["connector__category"]
-            slot_version = slot["connector__version"]
-            slot_lanes = slot["connector__lanes"]
-            
-            allowed_categories = [slot_category]
-            if slot_category == "M.2 PCIe" and slot.get("connector__extra"):
-                allowed_categories = ["M.2 PCIe", "M.2 SATA"]
+        capability = selection.mobo_capability()
+
+        # płyta bez slotów M.2 nie ogranicza wyboru (jak dotąd)
+        if capability and (capability.m2_pcie_gen is not None or capability.m2_sata):
+            allowed = Q()
+            if capability.m2_pcie_gen is not None:
+                # każdy slot osobno: na płycie z 5.0 x2 i 4.0 x4 pasuje też dysk 4.0 x4;
+                # podsumowanie mówi tylko, czy płyta ma jakikolwiek slot M.2 PCIe
+                for version, lanes in selection.mobo_m2_pcie_slots():
+                    slot = Q(connector__category="M.2 PCIe")
+                    if version is not None:
+                        slot &= Q(connector__version__lte=version)
+                    if lanes is not None:
+                        slot &= Q(connector__lanes__lte=lanes)
+                    allowed |= slot
+            if capability.m2_sata:
+                allowed |= Q(connector__category="M.2 SATA")
+            qs = qs.filter(allowed)
 
-            qs = qs.filter(
-                connector__category__in=allowed_categories,
-                connector__version__lte=slot_version,
-                connector__lanes__lte=slot_lanes,
-            )
-        
         return qs.distinct()
-    
-    def get_mobo_slot(mobo_pk, categories=["M.2 PCIe", "M.2 SATA"]):
-        if not mobo_pk:
-            return None
-        return (
-            MotherboardConnector.objects
-            .filter(motherboard_id=mobo_pk, connector__category__in=categories)
-            .order_by("-connector__version", "-connector__lanes")
-            .values(
-                "connector__category",
-                "connector__version",
-                "connector__lanes",
-                "connector__extra",
-            )
-            .first()
-        )
 
@@ -0,0 +1,341 @@
+import random
+from decimal import Decimal
+
+from django.db import transaction
+
+from core.models import (
+    Manufacturer, Connector, RAMBase, RAM, Socket, CPU, CPUSupportedPCIe,
+    Storage, PSUFormFactor, PSU, PSUConnectorItem, GraphicsChip, GPU, GPUConnector,
+    MotherboardFormFactor, Case, Motherboard, MotherboardConnector,
+)
+from core.services.catalog_service import CatalogService
+from core.services.motherboard_capability_service import MotherboardCapabilityService
+from core.services.psu_service import PSUService
+
+
+class SyntheticCatalogService:
+    """Generator dużego, spójnego katalogu do testów wydajności.
+
+    Komponenty trafiają do bazy przez bulk_create, więc pola liczone w save() i dane
+    utrzymywane przez sygnały (tier_score, inwentarz złączy PSU, podsumowania płyt,
+    wersja katalogu) są uzupełniane tutaj. Wszystkie rekordy należą do producentów
+    z prefiksem MANUFACTURER_PREFIX, co pozwala je potem usunąć.
+    """
+
+    MANUFACTURER_PREFIX = "Synthetic"
+    MANUFACTURERS = 8
+    BATCH_SIZE = 1000
+
+    DEFAULT_COUNTS = {
+        "cpus": 2000,
+        "gpus": 10000,
+        "motherboards": 5000,
+        "rams": 20000,
+        "storages": 5000,
+        "psus": 3000,
+        "cases": 3000,
+    }
+
+    # socket -> (typy RAM, generacja PCIe, rodzina CPU)
+    PLATFORMS = {
+        "AM4": (("DDR4",), 4, "Ryzen 5000"),
+        "AM5": (("DDR5",), 5, "Ryzen 7000"),
+        "LGA 1700": (("DDR4", "DDR5"), 5, "Core 14th Gen"),
+        "LGA 1851": (("DDR5",), 5, "Core Ultra 200"),
+    }
+    RAM_SPEEDS = {"DDR4": (3200, 3600), "DDR5": (5600, 6000, 6400)}
+    MOBO_FORM_FACTORS = ("ATX", "mATX", "ITX")
+    PSU_FORM_FACTORS = ("ATX", "SFX")
+    CHIPS = 60
+
+    @staticmethod
+    def _connector(category, version=None, lanes=None, is_power=False):
+        version = Decimal(version) if version is not None else None
+        connector = Connector.objects.filter(
+            category=category, version=version, lanes=lanes, is_power=is_power,
+        ).first()
+        return connector or Connector.objects.create(
+            category=category, version=version, lanes=lanes, is_power=is_power,
+        )
+
+    @staticmethod
+    def _price(rng, low, high):
+        return Decimal(rng.randrange(low, high, 10))
+
+    @staticmethod
+    def clear() -> int:
+        """Usuwa komponenty i producentów wygenerowanych wcześniej."""
+        makers = Manufacturer.objects.filter(name__startswith=SyntheticCatalogService.MANUFACTURER_PREFIX)
+        deleted = 0
+        with transaction.atomic():
+            for model in (Motherboard, CPU, GPU, RAM, Storage, PSU, Case):
+                deleted += model.objects.filter(manufacturer__in=makers).delete()[0]
+            GraphicsChip.objects.filter(
+                marketing_name__startswith=SyntheticCatalogService.MANUFACTURER_PREFIX
+            ).delete()
+            makers.delete()
+        CatalogService.bump_version()
+        return deleted
+
+    @staticmethod
+    def generate(counts: dict = None, seed: int = 0) -> dict:
+        counts = {**SyntheticCatalogService.DEFAULT_COUNTS, **(counts or {})}
+        generator = SyntheticCatalogService(random.Random(seed))
+        with transaction.atomic():
+            created = {name: getattr(generator, f"_create_{name}")(count) for name, count in counts.items()}
+            MotherboardCapabilityService.refresh()
+        CatalogService.bump_version()
+        return created
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        prefix = self.MANUFACTURER_PREFIX
+        self.makers = [
+            Manufacturer.objects.get_or_create(name=f"{prefix} {index}")[0] for index in range(self.MANUFACTURERS)
+        ]
+        self.sockets = {name: Socket.objects.get_or_create(name=name)[0] for name in self.PLATFORMS}
+        self.ram_bases = {
+            ram_type: [RAMBase.objects.get_or_create(type=ram_type, mts=mts)[0] for mts in speeds]
+            for ram_type, speeds in self.RAM_SPEEDS.items()
+        }
+        self.mobo_form_factors = [
+            MotherboardFormFactor.objects.get_or_create(name=name)[0] for name in self.MOBO_FORM_FACTORS
+        ]
+        self.psu_form_factors = [
+            PSUFormFactor.objects.get_or_create(name=name)[0] for name in self.PSU_FORM_FACTORS
+        ]
+        self.pcie_x16 = {gen: self._connector("PCIe", f"{gen}.0", 16) for gen in (3, 4, 5)}
+        self.pcie_x4 = {gen: self._connector("PCIe", f"{gen}.0", 4) for gen in (4, 5)}
+        self.m2 = {gen: self._connector("M.2 PCIe", f"{gen}.0", 4) for gen in (3, 4, 5)}
+        self.sata = self._connector("SATA", "3.0")
+        self.atx_24 = self._connector("ATX Power", lanes=24, is_power=True)
+        self.eps_8 = self._connector("CPU Power", lanes=8, is_power=True)
+        self.pcie_power = {pins: self._connector("PCIe Power", lanes=pins, is_power=True) for pins in (8, 16)}
+
+    def _bulk(self, model, objects):
+        return model.objects.bulk_create(objects, batch_size=self.BATCH_SIZE)
+
+    def _ram_bases_for(self, socket_name):
+        ram_types, _, _ = self.PLATFORMS[socket_name]
+        return [base for ram_type in ram_types for base in self.ram_bases[ram_type]]
+
+    def _create_cpus(self, count):
+        rng = self.rng
+        cpus = []
+        for index in range(count):
+            socket_name = rng.choice(tuple(self.PLATFORMS))
+            p_cores = rng.choice((4, 6, 8, 12, 16))
+            e_cores = rng.choice((0, 0, 4, 8, 16)) if socket_name.startswith("LGA") else 0
+            base_clock = Decimal(rng.randrange(300, 420)) / 100
+            cpu = CPU(
+                name=f"{self.MANUFACTURER_PREFIX} CPU {index}",
+                family=self.PLATFORMS[socket_name][2],
+                manufacturer=rng.choice(self.makers),
+                socket=self.sockets[socket_name],
+                p_cores=p_cores,
+                e_cores=e_cores,
+                threads=p_cores * 2 + e_cores,
+                base_clock_ghz=base_clock,
+                boost_clock_ghz=base_clock + Decimal(rng.randrange(50, 150)) / 100,
+                cache_mb=rng.choice((16, 32, 36, 64, 96)),
+                max_internal_memory_gb=rng.choice((128, 192)),
+                tdp=rng.choice((65, 105, 125, 170)),
+                price=self._price(rng, 300, 3500),
+            )
+            cpu.tier_score = cpu.compute_tier_score()
+            cpus.append(cpu)
+        cpus = self._bulk(CPU, cpus)
+
+        ram_links, pcie_links = [], []
+        for cpu in cpus:
+            socket_name = cpu.socket.name
+            gen = self.PLATFORMS[socket_name][1]
+            ram_links += [
+                CPU.supported_ram.through(cpu_id=cpu.id, rambase_id=base.id)
+                for base in self._ram_bases_for(socket_name)
+            ]
+            pcie_links += [
+                CPUSupportedPCIe(cpu_id=cpu.id, connector=self.pcie_x16[gen]),
+                CPUSupportedPCIe(cpu_id=cpu.id, connector=self.pcie_x4[gen]),
+            ]
+        self._bulk(CPU.supported_ram.through, ram_links)
+        self._bulk(CPUSupportedPCIe, pcie_links)
+        return len(cpus)
+
+    def _create_motherboards(self, count):
+        rng = self.rng
+        mobos = self._bulk(Motherboard, [
+            Motherboard(
+                name=f"{self.MANUFACTURER_PREFIX} Board {index}",
+                manufacturer=rng.choice(self.makers),
+                socket=self.sockets[rng.choice(tuple(self.PLATFORMS))],
+                form_factor=rng.choice(self.mobo_form_factors),
+                max_ram_capacity=rng.choice((64, 128, 192, 256)),
+                dimm_slots=rng.choice((2, 4)),
+                price=self._price(rng, 300, 3000),
+            )
+            for index in range(count)
+        ])
+
+        ram_links, connectors = [], []
+        for mobo in mobos:
+            socket_name = mobo.socket.name
+            bases = self._ram_bases_for(socket_name)
+            if len(self.PLATFORMS[socket_name][0]) > 1:
+                # płyty LGA 1700 mają albo DDR4, albo DDR5
+                ram_type = rng.choice(self.PLATFORMS[socket_name][0])
+                bases = [base for base in bases if base.type == ram_type]
+            ram_links += [Motherboard.supported_ram.through(motherboard_id=mobo.id, rambase_id=base.id) for base in bases]
+
+            gen = self.PLATFORMS[socket_name][1] if rng.random() < 0.6 else 4
+            connectors += [
+                MotherboardConnector(motherboard_id=mobo.id, connector=self.pcie_x16[gen]),
+                MotherboardConnector(motherboard_id=mobo.id, connector=self.m2[gen], quantity=rng.randint(1, 4)),
+                MotherboardConnector(motherboard_id=mobo.id, connector=self.sata, quantity=rng.choice((2, 4, 6))),
+                MotherboardConnector(motherboard_id=mobo.id, connector=self.atx_24),
+                MotherboardConnector(motherboard_id=mobo.id, connector=self.eps_8, quantity=rng.randint(1, 2)),
+            ]
+        self._bulk(Motherboard.supported_ram.through, ram_links)
+        self._bulk(MotherboardConnector, connectors)
+        return len(mobos)
+
+    def _create_rams(self, count):
+        rng = self.rng
+        rams = []
+        for index in range(count):
+            base = rng.choice(rng.choice(tuple(self.ram_bases.values())))
+            modules_count = rng.choice((1, 2, 2, 4))
+            module_memory = rng.choice((8, 16, 16, 32, 48))
+            cycle_latency = rng.randint(14, 20) if base.type == "DDR4" else rng.randint(28, 40)
+            rams.append(RAM(
+                name=f"{self.MANUFACTURER_PREFIX} RAM {index}",
+                manufacturer=rng.choice(self.makers),
+                base=base,
+                modules_count=modules_count,
+                module_memory=module_memory,
+                total_capacity=modules_count * module_memory,
+                cycle_latency=cycle_latency,
+                ram_latency_ns=Decimal(cycle_latency * 2000 / base.mts).quantize(Decimal("0.01")),
+                price=self._price(rng, 100, 1500),
+            ))
+        return len(self._bulk(RAM, rams))
+
+    def _create_storages(self, count):
+        rng = self.rng
+        return len(self._bulk(Storage, [
+            Storage(
+                manufacturer=rng.choice(self.makers),
+                name=f"{self.MANUFACTURER_PREFIX} SSD {index}",
+                connector=self.m2[rng.choice((3, 4, 4, 5))],
+                capacity_gb=rng.choice((500, 1000, 2000, 4000)),
+                price=self._price(rng, 150, 1500),
+            )
+            for index in range(count)
+        ]))
+
+    def _create_chips(self):
+        rng = self.rng
+        chips = []
+        for index in range(self.CHIPS):
+            chip = GraphicsChip(
+                vendor=rng.choice(("NVIDIA", "AMD", "Intel")),
+                marketing_name=f"{self.MANUFACTURER_PREFIX} Chip {index}",
+                pcie_max_gen=rng.choice((3, 4, 4, 5)),
+                pcie_max_width=rng.choice((8, 16, 16, 16)),
+                memory_type=rng.choice(("GDDR6", "GDDR6X", "GDDR7")),
+                memory_bus_width=rng.choice((128, 192, 256, 384)),
+            )
+            chip.tier_score = chip.compute_tier_score()
+            chips.append(chip)
+        return self._bulk(GraphicsChip, chips)
+
+    def _create_gpus(self, count):
+        rng = self.rng
+        chips = self._create_chips()
+        gpus = []
+        for index in range(count):
+            base_clock = rng.randrange(1300, 2400)
+            gpu = GPU(
+                manufacturer=rng.choice(self.makers),
+                model_name=f"{self.MANUFACTURER_PREFIX} GPU {index}",
+                graphics_chip=rng.choice(chips),
+                vram_size_gb=rng.choice((8, 12, 16, 24)),
+                base_clock_mhz=base_clock,
+                boost_clock_mhz=base_clock + rng.randrange(100, 500),
+                tdp=rng.choice((120, 200, 285, 350, 450)),
+                recommended_system_power_w=rng.choice((450, 550, 650, 750, 850, 1000)),
+                length_mm=rng.randrange(170, 360),
+                slot_width=Decimal(rng.choice(("2.0", "2.5", "3.0"))),
+                outputs={"HDMI": 1, "DisplayPort": 3},
+                price=self._price(rng, 800, 9000),
+            )
+            gpu.tier_score = gpu.compute_tier_score()
+            gpus.append(gpu)
+        gpus = self._bulk(GPU, gpus)
+
+        power = []
+        for gpu in gpus:
+            if rng.random() < 0.3:
+                power.append(GPUConnector(gpu_id=gpu.id, connector=self.pcie_power[16]))
+            else:
+                power.append(GPUConnector(gpu_id=gpu.id, connector=self.pcie_power[8], quantity=rng.randint(1, 3)))
+        self._bulk(GPUConnector, power)
+        return len(gpus)
+
+    def _create_psus(self, count):
+        rng = self.rng
+        psus = []
+        for index in range(count):
+            wattage = rng.choice((450, 550, 650, 750, 850, 1000, 1200))
+            connectors = {
+                "ATX 24-pin (20+4)": 1,
+                "EPS CPU 8-pin (4+4)": 2 if wattage >= 650 else 1,
+                "PCIe 8-pin (6+2)": max(2, wattage // 150),
+                "SATA": 6,
+            }
+            if wattage >= 850:
+                connectors["12VHPWR / 12V-2x6"] = 1
+            psus.append(PSU(
+                manufacturer=rng.choice(self.makers),
+                name=f"{self.MANUFACTURER_PREFIX} PSU {index}",
+                wattage=wattage,
+                connectors=connectors,
+                pcie_pins=PSUService.get_pcie_pins_list(connectors),
+                connector_inventory_synced=True,
+                form_factor=rng.choice(self.psu_form_factors),
+                price=self._price(rng, 200, 1500),
+            ))
+        psus = self._bulk(PSU, psus)
+        self._bulk(PSUConnectorItem, [
+            PSUConnectorItem(psu_id=psu.id, **item)
+            for psu in psus
+            for item in PSUService.normalize_connectors(psu.connectors)
+        ])
+        return len(psus)
+
+    def _create_cases(self, count):
+        rng = self.rng
+        cases = self._bulk(Case, [
+            Case(
+                manufacturer=rng.choice(self.makers),
+                name=f"{self.MANUFACTURER_PREFIX} Case {index}",
+                max_gpu_length_mm=rng.randrange(250, 450),
+                price=self._price(rng, 150, 1200),
+            )
+            for index in range(count)
+        ])
+        mobo_links, psu_links = [], []
+        for case in cases:
+            # większa obudowa mieści też mniejsze płyty
+            supported = self.mobo_form_factors[rng.randrange(len(self.mobo_form_factors)):]
+            mobo_links += [
+                Case.mobo_form_factor_support.through(case_id=case.id, motherboardformfactor_id=ff.id)
+                for ff in supported
+            ]
+            psu_links += [
+                Case.psu_form_factor_support.through(case_id=case.id, psuformfactor_id=ff.id)
+                for ff in self.psu_form_factors[:rng.randint(1, len(self.psu_form_factors))]
+            ]
+        self._bulk(Case.mobo_form_factor_support.through, mobo_links)
+        self._bulk(Case.psu_form_factor_support.through, psu_links)
+        return len(cases)
@@ -0,0 +1,46 @@
+from core.services.scoring_service import ScoringService
+
+
+class TierScoreService:
+    """Przeliczanie zapisanych w bazie kolumn tier_score (np. po zmianie wzoru)."""
+
+    BATCH_SIZE = 500
+
+    @staticmethod
+    def recompute(queryset, compute=None) -> int:
+        """Aktualizuje tier_score wierszy, których zapisana wartość jest nieaktualna.
+
+        `compute` pozwala podać wzór jawnie (migracje operują na modelach historycznych,
+        które nie mają metod). Zwraca liczbę zmienionych wierszy.
+        """
+        compute = compute or queryset.model.compute_tier_score
+        changed = []
+        for obj in queryset.iterator(chunk_size=TierScoreService.BATCH_SIZE):
+            score = compute(obj)
+            if obj.tier_score != score:
+                obj.tier_score = score
+                changed.append(obj)
+        queryset.model.objects.bulk_update(changed, ["tier_score"], batch_size=TierScoreService.BATCH_SIZE)
+        return len(changed)
+
+    @staticmethod
+    def recompute_category(category: str) -> int:
+        """Jak recompute() dla całej kategorii, ale wzór liczony wektorowo w ScoringService
+        (wynik identyczny z compute_tier_score, bez tworzenia obiektów modelu)."""
+        model = ScoringService.FEATURES[category][0]
+        table = ScoringService.load_table(category)
+        scores = ScoringService.round_scores(ScoringService.compute(table, category))
+        changed = [
+            model(pk=int(pk), tier_score=int(score))
+            for pk, score, stored in zip(table.ids, scores, table.tier_scores)
+            if score != stored
+        ]
+        model.objects.bulk_update(changed, ["tier_score"], batch_size=TierScoreService.BATCH_SIZE)
+        return len(changed)
+
+    @staticmethod
+    def recompute_all() -> dict[str, int]:
+        return {
+            ScoringService.FEATURES[category][0].__name__: TierScoreService.recompute_category(category)
+            for category in ("cpu", "chip", "gpu")
+        }
@@ -0,0 +1,92 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+from core.models import (
+    Manufacturer, Connector, RAMBase, RAM, Socket, CPU, CPUSupportedPCIe,
+    Storage, PSUFormFactor, PSU, GraphicsChip, GPU, GPUConnector, Cooler,
+    MotherboardFormFactor, Case, Motherboard, MotherboardConnector,
+)
+from core.services.catalog_service import CatalogService
+from core.services.motherboard_capability_service import MotherboardCapabilityService
+from core.services.psu_service import PSUService
+
+
+CATALOG_MODELS = (
+    Manufacturer, Connector, RAMBase, RAM, Socket, CPU, CPUSupportedPCIe,
+    Storage, PSUFormFactor, PSU, GraphicsChip, GPU, GPUConnector, Cooler,
+    MotherboardFormFactor, Case, Motherboard, MotherboardConnector,
+)
+
+CATALOG_M2M_THROUGH = (
+    CPU.supported_ram.through,
+    Motherboard.supported_ram.through,
+    Case.mobo_form_factor_support.through,
+    Case.psu_form_factor_support.through,
+)
+
+
+def bump_catalog_version(sender, **kwargs):
+    CatalogService.bump_version()
+
+
+def bump_catalog_version_on_m2m(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        CatalogService.bump_version()
+
+
+def sync_psu_connector_inventory(sender, instance, raw=False, **kwargs):
+    if not raw:
+        PSUService.sync_connector_inventory(instance)
+
+
+post_save.connect(sync_psu_connector_inventory, sender=PSU, dispatch_uid="psu_connector_inventory")
+
+
+def refresh_capability_of_motherboard(sender, instance, raw=False, **kwargs):
+    if not raw:
+        MotherboardCapabilityService.refresh([instance.pk])
+
+
+def refresh_capability_of_connector_owner(sender, instance, raw=False, origin=None, **kwargs):
+    # przy kasowaniu całej płyty jej podsumowanie znika kaskadowo
+    if raw or isinstance(origin, Motherboard) or getattr(origin, "model", None) is Motherboard:
+        return
+    MotherboardCapabilityService.refresh([instance.motherboard_id])
+
+
+def refresh_all_capabilities(sender, raw=False, **kwargs):
+    # zmiana słownika złączy/pamięci jest rzadka, więc przeliczamy wszystkie płyty
+    if not raw:
+        MotherboardCapabilityService.refresh()
+
+
+def refresh_capability_on_ram_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        MotherboardCapabilityService.refresh([instance.pk])
+    else:
+        MotherboardCapabilityService.refresh(pk_set)
+
+
+post_save.connect(refresh_capability_of_motherboard, sender=Motherboard, dispatch_uid="mobo_capability")
+post_save.connect(
+    refresh_capability_of_connector_owner, sender=MotherboardConnector, dispatch_uid="mobo_capability_connector_save"
+)
+post_delete.connect(
+    refresh_capability_of_connector_owner, sender=MotherboardConnector, dispatch_uid="mobo_capability_connector_delete"
+)
+for model in (Connector, RAMBase):
+    post_save.connect(refresh_all_capabilities, sender=model, dispatch_uid=f"mobo_capability_save_{model.__name__}")
+    post_delete.connect(refresh_all_capabilities, sender=model, dispatch_uid=f"mobo_capability_delete_{model.__name__}")
+m2m_changed.connect(
+    refresh_capability_on_ram_change, sender=Motherboard.supported_ram.through, dispatch_uid="mobo_capability_ram"
+)
+
+for model in CATALOG_MODELS:
+    post_save.connect(bump_catalog_version, sender=model, dispatch_uid=f"catalog_save_{model.__name__}")
+    post_delete.connect(bump_catalog_version, sender=model, dispatch_uid=f"catalog_delete_{model.__name__}")
+
+for through in CATALOG_M2M_THROUGH:
+    m2m_changed.connect(
+        bump_catalog_version_on_m2m, sender=through, dispatch_uid=f"catalog_m2m_{through.__name__}"
+    )
@@ -0,0 +1,136 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+from core.models import (
+    Manufacturer, Connector, RAMBase, RAM, Socket, CPU, CPUSupportedPCIe,
+    Storage, PSUFormFactor, PSU, GraphicsChip, GPU, GPUConnector,
+    MotherboardFormFactor, Case, Motherboard, MotherboardConnector,
+)
+
+
+PSU_CONNECTORS = {
+    "ATX 24-pin (20+4)": 1,
+    "EPS CPU 8-pin (4+4)": 2,
+    "PCIe 8-pin (6+2)": 4,
+    "SATA": 6,
+}
+
+
+def make_catalog():
+    """Mały, ale kompletny katalog: jeden zestaw AM5/DDR5 i jeden tańszy AM4/DDR4."""
+    c = SimpleNamespace()
+    c.maker = Manufacturer.objects.create(name="Acme")
+
+    c.pcie4_x16 = Connector.objects.create(category="PCIe", version=Decimal("4.0"), lanes=16)
+    c.m2_pcie4 = Connector.objects.create(category="M.2 PCIe", version=Decimal("4.0"), lanes=4)
+    c.atx_24 = Connector.objects.create(category="ATX Power", lanes=24, is_power=True)
+    c.eps_8 = Connector.objects.create(category="CPU Power", lanes=8, is_power=True)
+    c.pcie_power_8 = Connector.objects.create(category="PCIe Power", lanes=8, is_power=True)
+
+    c.ddr4 = RAMBase.objects.create(type="DDR4", mts=3200)
+    c.ddr5 = RAMBase.objects.create(type="DDR5", mts=6000)
+    c.am4 = Socket.objects.create(name="AM4")
+    c.am5 = Socket.objects.create(name="AM5")
+    c.atx = MotherboardFormFactor.objects.create(name="ATX")
+    c.psu_atx = PSUFormFactor.objects.create(name="ATX")
+
+    c.cpu_am4 = _cpu(c, "Ryzen 5 5600", c.am4, c.ddr4, p_cores=6, threads=12, price="500")
+    c.cpu_am5 = _cpu(c, "Ryzen 7 7800X3D", c.am5, c.ddr5, p_cores=8, threads=16, price="1500")
+
+    c.mobo_am4 = _motherboard(c, "B550", c.am4, c.ddr4, price="400")
+    c.mobo_am5 = _motherboard(c, "B650", c.am5, c.ddr5, price="800")
+
+    c.chip = GraphicsChip.objects.create(
+        vendor="NVIDIA", marketing_name="RTX 4060", pcie_max_gen=4, pcie_max_width=16,
+        memory_bus_width=128,
+    )
+    c.gpu = GPU.objects.create(
+        manufacturer=c.maker, model_name="Dual", graphics_chip=c.chip, vram_size_gb=8,
+        boost_clock_mhz=2460, recommended_system_power_w=550, length_mm=250,
+        price=Decimal("1300"),
+    )
+    GPUConnector.objects.create(gpu=c.gpu, connector=c.pcie4_x16)
+    GPUConnector.objects.create(gpu=c.gpu, connector=c.pcie_power_8)
+
+    c.ram_ddr4 = RAM.objects.create(
+        name="Fury", manufacturer=c.maker, base=c.ddr4, modules_count=2,
+        module_memory=8, cycle_latency=16, price=Decimal("150"),
+    )
+    c.ram_ddr5 = RAM.objects.create(
+        name="Trident", manufacturer=c.maker, base=c.ddr5, modules_count=2,
+        module_memory=16, cycle_latency=30, price=Decimal("450"),
+    )
+    c.storage = Storage.objects.create(
+        manufacturer=c.maker, name="SN770", connector=c.m2_pcie4,
+        capacity_gb=1000, price=Decimal("250"),
+    )
+    c.psu = PSU.objects.create(
+        manufacturer=c.maker, name="Focus 650", wattage=650,
+        connectors=PSU_CONNECTORS, form_factor=c.psu_atx, price=Decimal("350"),
+    )
+    c.case = Case.objects.create(
+        manufacturer=c.maker, name="Pop Air", max_gpu_length_mm=400, price=Decimal("300"),
+    )
+    c.case.mobo_form_factor_support.add(c.atx)
+    c.case.psu_form_factor_support.add(c.psu_atx)
+    return c
+
+
+def add_copies(c, count):
+    """Dokłada do katalogu `count` kopii każdego komponentu (z relacjami) od nowego producenta."""
+    maker = Manufacturer.objects.create(name=f"Copy {Manufacturer.objects.count()}")
+    for i in range(count):
+        cpu = _cpu(c, f"CPU copy {i}", c.am5, c.ddr5, p_cores=8, threads=16, price="1500")
+        cpu.manufacturer = maker
+        cpu.save()
+        mobo = _motherboard(c, f"Mobo copy {i}", c.am5, c.ddr5, price="800")
+        mobo.manufacturer = maker
+        mobo.save()
+
+        gpu = GPU.objects.create(
+            manufacturer=maker, model_name=f"GPU copy {i}", graphics_chip=c.chip,
+            vram_size_gb=8, length_mm=250, price=Decimal("1300"),
+            outputs={"HDMI": 1},
+        )
+        GPUConnector.objects.create(gpu=gpu, connector=c.pcie4_x16)
+        GPUConnector.objects.create(gpu=gpu, connector=c.pcie_power_8)
+
+        RAM.objects.create(
+            name=f"RAM copy {i}", manufacturer=maker, base=c.ddr5, modules_count=2,
+            module_memory=16, cycle_latency=30, price=Decimal("450"),
+        )
+        Storage.objects.create(
+            manufacturer=maker, name=f"SSD copy {i}", connector=c.m2_pcie4,
+            capacity_gb=1000, price=Decimal("250"),
+        )
+        PSU.objects.create(
+            manufacturer=maker, name=f"PSU copy {i}", wattage=650,
+            connectors=PSU_CONNECTORS, form_factor=c.psu_atx, price=Decimal("350"),
+        )
+        case = Case.objects.create(
+            manufacturer=maker, name=f"Case copy {i}", max_gpu_length_mm=400, price=Decimal("300"),
+        )
+        case.mobo_form_factor_support.add(c.atx)
+        case.psu_form_factor_support.add(c.psu_atx)
+
+
+def _cpu(c, name, socket, ram_base, p_cores, threads, price):
+    cpu = CPU.objects.create(
+        name=name, manufacturer=c.maker, socket=socket, p_cores=p_cores, threads=threads,
+        base_clock_ghz=Decimal("4.00"), boost_clock_ghz=Decimal("5.00"), tdp=105,
+        cache_mb=32, max_internal_memory_gb=128, price=Decimal(price),
+    )
+    cpu.supported_ram.add(ram_base)
+    CPUSupportedPCIe.objects.create(cpu=cpu, connector=c.pcie4_x16)
+    return cpu
+
+
+def _motherboard(c, name, socket, ram_base, price):
+    mobo = Motherboard.objects.create(
+        name=name, manufacturer=c.maker, socket=socket, form_factor=c.atx,
+        max_ram_capacity=128, dimm_slots=4, price=Decimal(price),
+    )
+    mobo.supported_ram.add(ram_base)
+    for connector in (c.pcie4_x16, c.m2_pcie4, c.atx_24, c.eps_8):
+        MotherboardConnector.objects.create(motherboard=mobo, connector=connector)
+    return mobo
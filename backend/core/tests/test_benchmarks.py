@@ -0,0 +1,68 @@
+from django.test import TestCase
+
+from core.models import GPU, Motherboard, MotherboardCapability, PSUConnectorItem, RAM
+from core.services.benchmark_service import BenchmarkService
+from core.services.builder_service import BuildBuilderService
+from core.services.synthetic_catalog_service import SyntheticCatalogService
+
+SMALL_CATALOG = {
+    "cpus": 10, "gpus": 20, "motherboards": 10, "rams": 20, "storages": 10, "psus": 10, "cases": 10,
+}
+
+
+class SyntheticCatalogTest(TestCase):
+    def test_generated_catalog_is_consistent(self):
+        created = SyntheticCatalogService.generate(SMALL_CATALOG, seed=1)
+
+        self.assertEqual(created, SMALL_CATALOG)
+        self.assertEqual(MotherboardCapability.objects.count(), Motherboard.objects.count())
+        self.assertTrue(PSUConnectorItem.objects.exists())
+        for ram in RAM.objects.all():
+            self.assertEqual(ram.total_capacity, ram.modules_count * ram.module_memory)
+        for gpu in GPU.objects.all():
+            self.assertEqual(gpu.tier_score, gpu.compute_tier_score())
+        self.assertIsNotNone(BuildBuilderService.build(20000))
+
+    def test_clear_removes_generated_components(self):
+        SyntheticCatalogService.generate(SMALL_CATALOG, seed=1)
+        SyntheticCatalogService.clear()
+
+        self.assertFalse(GPU.objects.exists())
+        self.assertFalse(Motherboard.objects.exists())
+
+
+class BenchmarkServiceTest(TestCase):
+    def setUp(self):
+        SyntheticCatalogService.generate(SMALL_CATALOG, seed=1)
+
+    def test_run_records_queries_time_and_memory(self):
+        results = BenchmarkService.run(repeat=1, only=["compatible_cpus", "filter_options", "list_gpus"])
+
+        self.assertEqual(
+            set(results["scenarios"]),
+            {"compatible_cpus", "filter_options_cold", "filter_options_warm", "list_gpus", "list_gpus_page"},
+        )
+        self.assertEqual(results["meta"]["catalog"]["gpu"], 20)
+        self.assertEqual(results["scenarios"]["filter_options_warm"]["queries"], 0)
+        for result in results["scenarios"].values():
+            self.assertEqual(set(result), {"queries", "wall_ms", "wall_ms_max", "peak_kb"})
+
+    def test_compare_flags_extra_queries_and_slowdowns(self):
+        baseline = {"scenarios": {
+            "a": {"queries": 2, "wall_ms": 10.0},
+            "b": {"queries": 2, "wall_ms": 10.0},
+            "c": {"queries": 2, "wall_ms": 10.0},
+        }}
+        current = {"scenarios": {
+            "a": {"queries": 3, "wall_ms": 10.0},
+            "b": {"queries": 2, "wall_ms": 30.0},
+            "c": {"queries": 2, "wall_ms": 11.0},
+            "d": {"queries": 1, "wall_ms": 1.0},
+        }}
+
+        rows = {row["name"]: row for row in BenchmarkService.compare(current, baseline, max_slowdown=2)}
+
+        self.assertTrue(rows["a"]["regression"])
+        self.assertTrue(rows["b"]["regression"])
+        self.assertFalse(rows["c"]["regression"])
+        self.assertIsNone(rows["d"]["baseline"])
@@ -0,0 +1,183 @@
+import threading
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from core.services.builder_job_service import BuilderJobService
+from core.services.builder_service import BuildBuilderService, BuildConstraints
+from core.services.catalog_service import CatalogService
+from core.services.parallel_search_service import ParallelSearchService
+from core.tests.factories import add_copies, make_catalog
+
+
+class BuildBuilderServiceTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+
+    def test_build_picks_best_scoring_build_within_budget(self):
+        result = BuildBuilderService.build(5000)
+
+        self.assertEqual(result.cpu, self.catalog.cpu_am5)
+        self.assertEqual(result.motherboard, self.catalog.mobo_am5)
+        self.assertEqual(result.ram, self.catalog.ram_ddr5)
+        self.assertEqual(result.total_price, Decimal("4950"))
+
+    def test_build_falls_back_to_cheaper_platform(self):
+        result = BuildBuilderService.build(3500)
+
+        self.assertEqual(result.cpu, self.catalog.cpu_am4)
+        self.assertEqual(result.ram, self.catalog.ram_ddr4)
+        self.assertEqual(result.total_price, Decimal("3250"))
+
+    def test_build_returns_none_when_budget_too_low(self):
+        self.assertIsNone(BuildBuilderService.build(1000))
+        self.assertIsNone(BuildBuilderService.build(0))
+
+    def test_build_runs_without_queries_on_warm_snapshot(self):
+        snapshot = CatalogService.get_snapshot()
+        with self.assertNumQueries(0):
+            candidate = BuildBuilderService.search(snapshot, Decimal("5000"))
+        self.assertEqual(candidate.cpu_id, self.catalog.cpu_am5.id)
+
+    def test_snapshot_rebuilds_after_catalog_change(self):
+        snapshot = CatalogService.get_snapshot()
+        self.catalog.cpu_am5.price = Decimal("5000")
+        self.catalog.cpu_am5.save()
+
+        self.assertIsNot(CatalogService.get_snapshot(), snapshot)
+        self.assertEqual(BuildBuilderService.build(5000).cpu, self.catalog.cpu_am4)
+
+    def test_optimal_mode_matches_exhaustive_search(self):
+        snapshot = CatalogService.get_snapshot()
+        for budget in (3000, 3500, 4500, 5000, 9000):
+            budget = Decimal(budget)
+            expected = None
+            target_ram_gb, target_storage_gb = BuildBuilderService.get_targets(budget)
+            for gpu in snapshot.gpus.values():
+                for cpu in snapshot.cpus.values():
+                    for mobo in snapshot.compatible_motherboards(cpu, gpu):
+                        result = BuildBuilderService._complete_build(
+                            snapshot, cpu, gpu, mobo, target_ram_gb, target_storage_gb,
+                        )
+                        if result and result.total_price <= budget and BuildBuilderService._is_better(result, expected):
+                            expected = result
+
+            self.assertEqual(BuildBuilderService.search_optimal(snapshot, budget), expected)
+
+    def test_optimal_mode_is_not_truncated_by_candidate_limits(self):
+        with mock.patch.object(BuildBuilderService, "CPU_LIMIT", 0):
+            self.assertIsNone(BuildBuilderService.build(5000))
+            result = BuildBuilderService.build(5000, mode=BuildBuilderService.MODE_OPTIMAL)
+        self.assertEqual(result.cpu, self.catalog.cpu_am5)
+
+    def test_constraints_keep_pinned_components(self):
+        result = BuildBuilderService.build(
+            5000, mode=BuildBuilderService.MODE_OPTIMAL,
+            constraints=BuildConstraints(cpu=frozenset({self.catalog.cpu_am4.id})),
+        )
+
+        self.assertEqual(result.cpu, self.catalog.cpu_am4)
+        self.assertEqual(result.motherboard, self.catalog.mobo_am4)
+
+    def test_restricted_snapshot_drops_incompatible_components(self):
+        snapshot = CatalogService.get_snapshot()
+
+        pinned = snapshot.restrict({"motherboard": {self.catalog.mobo_am4.id}})
+        self.assertEqual(set(pinned.cpus), {self.catalog.cpu_am4.id})
+        self.assertEqual(set(pinned.gpus), {self.catalog.gpu.id})
+
+        no_case = snapshot.restrict({"case": set()})
+        self.assertEqual((no_case.gpus, no_case.motherboards, no_case.cpus), ({}, {}, {}))
+        self.assertIsNone(BuildBuilderService.search_optimal(no_case, Decimal("9000")))
+
+    def test_unrestricted_copy_searches_like_full_snapshot(self):
+        add_copies(self.catalog, 2)
+        snapshot = CatalogService.get_snapshot()
+        restricted = snapshot.restrict({})
+
+        for budget in (3500, 5000, 9000):
+            self.assertEqual(
+                BuildBuilderService.search_top(restricted, Decimal(budget), k=3),
+                BuildBuilderService.search_top(snapshot, Decimal(budget), k=3),
+            )
+
+    def test_top_builds_are_distinct_and_ranked(self):
+        snapshot = CatalogService.get_snapshot()
+        builds = BuildBuilderService.search_top(snapshot, Decimal("5000"), k=5)
+
+        self.assertEqual(builds[0], BuildBuilderService.search_optimal(snapshot, Decimal("5000")))
+        self.assertEqual(len({build.component_ids() for build in builds}), len(builds))
+        ranking = [(build.score, build.total_price) for build in builds]
+        self.assertEqual(ranking, sorted(ranking, reverse=True))
+
+
+class ParallelSearchTest(TestCase):
+    def setUp(self):
+        # kopie komponentów dają dużo remisów - kolejność musi zgadzać się z sekwencyjną
+        self.catalog = make_catalog()
+        add_copies(self.catalog, 3)
+        self.addCleanup(ParallelSearchService.shutdown)
+
+    def test_parallel_search_matches_sequential(self):
+        snapshot = CatalogService.get_snapshot()
+        for budget in (3000, 5000, 9000):
+            for k in (1, 5):
+                self.assertEqual(
+                    BuildBuilderService.search_top(snapshot, Decimal(budget), k, workers=3),
+                    BuildBuilderService.search_top(snapshot, Decimal(budget), k, workers=1),
+                    (budget, k),
+                )
+
+    def test_workers_are_not_forked_from_server_process(self):
+        # fork z wielowątkowego procesu serwera może zakleszczyć proces potomny
+        executor = ParallelSearchService.get_executor(CatalogService.get_snapshot(), 2)
+        self.assertIn(executor._mp_context.get_start_method(), ("forkserver", "spawn"))
+
+    def test_builds_use_worker_setting(self):
+        with self.settings(BUILDER_WORKERS=2), mock.patch.object(
+            ParallelSearchService, "search_top", wraps=ParallelSearchService.search_top,
+        ) as search_top:
+            result = BuildBuilderService.build(5000, mode=BuildBuilderService.MODE_OPTIMAL)
+
+        self.assertEqual(search_top.call_args.args[3], 2)
+        self.assertEqual(result.cpu, self.catalog.cpu_am5)
+
+
+@override_settings(BUILDER_JOB_WORKERS=2)
+class BuilderJobServiceTest(TestCase):
+    def setUp(self):
+        self.addCleanup(BuilderJobService.clear)
+
+    def test_identical_jobs_in_flight_are_shared(self):
+        release = threading.Event()
+        calls = []
+
+        def compute(progress):
+            calls.append(progress)
+            progress.candidates = 7
+            release.wait(5)
+            return {"ok": True}, 200
+
+        first = BuilderJobService.submit("job-test:dedupe", compute)
+        second = BuilderJobService.submit("job-test:dedupe", compute)
+        other = BuilderJobService.submit("job-test:other", compute)
+        release.set()
+        BuilderJobService.clear()
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(first.status, BuilderJobService.STATUS_DONE)
+        self.assertEqual(first.result, ({"ok": True}, 200))
+        self.assertEqual(first.progress.as_dict()["candidates_explored"], 7)
+
+    def test_failed_job_is_reported(self):
+        def compute(progress):
+            raise RuntimeError("boom")
+
+        with self.assertLogs("core.services.builder_job_service", "ERROR"):
+            job = BuilderJobService.submit("job-test:fail", compute)
+            BuilderJobService.clear()
+
+        self.assertEqual(BuilderJobService.as_dict(job)["error"], "search_failed")
@@ -0,0 +1,134 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.services.catalog_service import CatalogService
+from core.services.evaluation_service import BuildEvaluationService
+from core.tests.factories import make_catalog
+
+
+class RuleCompilerTest(SimpleTestCase):
+    TABLE = {
+        "meta": {"derived_fields": {"derived.delta": "cpu.tier_score - gpu.tier_score"}},
+        "profiles": {
+            "test": {
+                "rules": [
+                    {"id": "delta", "logic": [
+                        {"path": "gpu", "op": "missing", "score": 0, "feedback": "Brak GPU."},
+                        {"path": "derived.delta", "op": ">=", "value": 2, "score": -5, "feedback": "CPU za mocny."},
+                        {"op": "default", "score": 10, "feedback": ""},
+                    ]},
+                    {"id": "igpu", "logic": [
+                        {"when": [
+                            {"path": "gpu", "op": "missing"},
+                            {"path": "cpu.integrated_gpu", "op": "==", "value": True},
+                        ], "score": 3, "feedback": ""},
+                    ]},
+                ],
+            },
+        },
+    }
+
+    def evaluate(self, **parts):
+        profiles = BuildEvaluationService.compile(self.TABLE).values()
+        return BuildEvaluationService.score(parts, profiles)[0]
+
+    def test_first_matching_case_wins(self):
+        cpu = type("Part", (), {"tier_score": 7, "integrated_gpu": True})()
+        gpu = type("Part", (), {"tier_score": 4})()
+
+        self.assertEqual(self.evaluate(cpu=cpu, gpu=gpu), {
+            "id": "test", "name": "test", "description": "", "score": -5, "feedback": ["CPU za mocny."],
+        })
+        self.assertEqual(self.evaluate(cpu=cpu)["score"], 3)
+
+    def test_unknown_paths_and_operators_are_rejected(self):
+        for case in (
+            {"path": "cpu.not_a_field", "op": "==", "value": 1, "score": 0},
+            {"path": "cooler.tier_score", "op": "==", "value": 1, "score": 0},
+            {"path": "cpu.tier_score", "op": "~", "value": 1, "score": 0},
+        ):
+            table = {"profiles": {"x": {"rules": [{"id": "r", "logic": [case]}]}}}
+            with self.assertRaises(ImproperlyConfigured):
+                BuildEvaluationService.compile(table)
+
+    def test_bundled_rules_compile(self):
+        BuildEvaluationService.clear()
+        self.assertEqual(
+            set(BuildEvaluationService.get_profiles()), {"gaming", "office", "professional"}
+        )
+
+
+class BuildEvaluateViewTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+
+    def full_build(self, **overrides):
+        c = self.catalog
+        return {
+            "cpu": c.cpu_am5.id, "mobo": c.mobo_am5.id, "ram": c.ram_ddr5.id, "gpu": c.gpu.id,
+            "mem": c.storage.id, "psu": c.psu.id, "chassis": c.case.id, **overrides,
+        }
+
+    def test_single_build(self):
+        response = self.client.post("/api/builds/evaluate/", self.full_build(), content_type="application/json")
+
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(data["compatible"])
+        self.assertEqual(data["remarks"], [])
+        self.assertEqual(data["total_price"], "4950.00")
+        self.assertEqual({profile["id"] for profile in data["profiles"]}, {"gaming", "office", "professional"})
+        scores = [profile["score"] for profile in data["profiles"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_batch_reports_incompatibilities_without_queries(self):
+        c = self.catalog
+        CatalogService.get_snapshot()
+        builds = [
+            self.full_build(),
+            self.full_build(mobo=c.mobo_am4.id),
+            {"gpu": 10**6},
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/builds/evaluate/", {"builds": builds, "profiles": ["office"]},
+                content_type="application/json",
+            )
+
+        results = response.json()["results"]
+        self.assertTrue(results[0]["compatible"])
+        self.assertEqual([profile["id"] for profile in results[0]["profiles"]], ["office"])
+        self.assertFalse(results[1]["compatible"])
+        self.assertIn(("mobo", "socket"), {(r["component"], r["key"]) for r in results[1]["remarks"]})
+        self.assertEqual(results[2], {"error": "component_not_found", "components": ["gpu"]})
+        # zestawy z katalogu bez zapytań; jedno zapytanie szuka w bazie nieznanej karty
+        self.assertEqual(len(queries), 1)
+
+    def test_components_outside_builder_catalog_are_evaluated(self):
+        c = self.catalog
+        c.gpu.price = None
+        c.gpu.recommended_system_power_w = None
+        c.gpu.save()
+        c.chip.pcie_max_gen = None
+        c.chip.save()
+
+        response = self.client.post("/api/builds/evaluate/", self.full_build(), content_type="application/json")
+
+        data = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(data["compatible"])
+        self.assertIsNone(data["total_price"])
+        self.assertTrue(data["profiles"])
+
+    def test_invalid_payload(self):
+        for body in (
+            {"builds": "x"}, {"builds": [1]}, {"cpu": "abc"},
+            {"cpu": 1, "profiles": ["nope"]}, {"cpu": 1, "profiles": [{}]},
+        ):
+            response = self.client.post("/api/builds/evaluate/", body, content_type="application/json")
+            self.assertEqual(response.status_code, 400, body)
+        response = self.client.post("/api/builds/evaluate/", {"cpu": 10**6}, content_type="application/json")
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,101 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from core.models import BuildFrontierPoint
+from core.services.builder_service import BuildBuilderService
+from core.services.catalog_service import CatalogService
+from core.services.frontier_service import FrontierService
+from core.tests.factories import add_copies, make_catalog
+
+
+@override_settings(BUILDER_FRONTIER_AUTO_REBUILD=False)
+class FrontierServiceTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+        # zestawy z poprzedniego testu pochodzą z innej bazy
+        FrontierService._options = None
+
+    def test_lookup_matches_optimal_search(self):
+        FrontierService.rebuild()
+        self.assertTrue(FrontierService.is_ready())
+        self.assert_lookup_matches_search()
+
+    def assert_lookup_matches_search(self):
+        snapshot = CatalogService.get_snapshot()
+        for budget in range(2000, 12001, 250):
+            budget = Decimal(budget)
+            self.assertEqual(
+                FrontierService.lookup(budget),
+                BuildBuilderService.search_optimal(snapshot, budget),
+                budget,
+            )
+
+    def test_catalog_change_marks_frontier_stale(self):
+        FrontierService.rebuild()
+        self.catalog.gpu.price = Decimal("1100")
+        self.catalog.gpu.save()
+
+        self.assertFalse(FrontierService.is_ready())
+        FrontierService.rebuild()
+        self.assertEqual(
+            BuildFrontierPoint.objects.filter(gpu=self.catalog.gpu).order_by("total_price").first().total_price,
+            Decimal("3050"),
+        )
+
+    def test_cpu_price_change_reuses_assembled_builds(self):
+        add_copies(self.catalog, 2)
+        self.catalog.cpu_am4.price = Decimal("900")
+        self.catalog.cpu_am4.save()
+
+        with mock.patch.object(
+            BuildBuilderService, "_complete_build", wraps=BuildBuilderService._complete_build,
+        ) as complete_build:
+            FrontierService.rebuild()
+            self.assertTrue(complete_build.called)
+            self.catalog.cpu_am4.price = Decimal("950")
+            self.catalog.cpu_am4.save()
+            complete_build.reset_mock()
+            FrontierService.rebuild()
+            self.assertFalse(complete_build.called)
+        self.assert_lookup_matches_search()
+
+    def test_rebuild_after_motherboard_and_storage_changes_matches_search(self):
+        add_copies(self.catalog, 2)
+        FrontierService.rebuild()
+
+        self.catalog.mobo_am5.price = Decimal("600")
+        self.catalog.mobo_am5.save()
+        FrontierService.rebuild()
+        self.assert_lookup_matches_search()
+
+        self.catalog.storage.price = Decimal("90")
+        self.catalog.storage.save()
+        FrontierService.rebuild()
+        self.assert_lookup_matches_search()
+
+    def test_missing_rows_make_frontier_not_ready(self):
+        FrontierService.rebuild()
+        BuildFrontierPoint.objects.all().delete()
+
+        self.assertFalse(FrontierService.is_ready())
+
+    def test_rebuild_keeps_rows_of_other_catalog_versions(self):
+        FrontierService.rebuild()
+        other = BuildFrontierPoint.objects.first()
+        other.pk = None
+        # wiersze innego procesu (z własnym LocMemCache i wersją katalogu)
+        other.catalog_version = 1
+        other.save()
+
+        self.catalog.gpu.price = Decimal("1100")
+        self.catalog.gpu.save()
+        FrontierService.rebuild()
+
+        self.assertTrue(BuildFrontierPoint.objects.filter(pk=other.pk).exists())
+        self.assertFalse(
+            BuildFrontierPoint.objects.exclude(pk=other.pk).exclude(
+                catalog_version=CatalogService.get_version(),
+            ).exists()
+        )
@@ -1,2 +1,141 @@
+from io import StringIO
+
+from decimal import Decimal
+
+from django.core.management import call_command
 from django.test import TestCase
 
+from core.models import (
+    CPU, GPU, Connector, GraphicsChip, Motherboard, MotherboardCapability, MotherboardConnector, Storage,
+)
+from core.services.motherboard_service import MotherboardService
+from core.services.ram_service import RAMService
+from core.services.storage_service import StorageService
+from core.tests.factories import make_catalog
+
+
+class TierScoreTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+
+    def test_tier_score_is_stored_on_save(self):
+        gpu = self.catalog.gpu
+        self.assertEqual(gpu.tier_score, gpu.compute_tier_score())
+        self.assertGreater(gpu.tier_score, 0)
+
+        gpu.vram_size_gb = 24
+        gpu.save()
+        self.assertEqual(GPU.objects.get(pk=gpu.pk).tier_score, gpu.compute_tier_score())
+
+    def test_recompute_command_fixes_stale_scores(self):
+        CPU.objects.update(tier_score=0)
+        GPU.objects.update(tier_score=0)
+        GraphicsChip.objects.update(tier_score=0)
+
+        call_command("recompute_tier_scores", stdout=StringIO())
+
+        for model in (CPU, GPU, GraphicsChip):
+            for obj in model.objects.all():
+                self.assertEqual(obj.tier_score, obj.compute_tier_score())
+
+    def test_filter_by_tier_score_range(self):
+        score = self.catalog.cpu_am5.tier_score
+        response = self.client.get("/api/cpus/", {"tier_score_min": score, "tier_score_max": score})
+        self.assertEqual(
+            {cpu["id"] for cpu in response.json()},
+            set(CPU.objects.filter(tier_score=score).values_list("id", flat=True)),
+        )
+
+
+class MotherboardCapabilityTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+
+    def capability(self, mobo):
+        return MotherboardCapability.objects.get(pk=mobo.pk)
+
+    def test_summary_is_built_from_connectors_and_ram(self):
+        capability = self.capability(self.catalog.mobo_am5)
+
+        self.assertEqual(capability.gpu_slot_lanes, 16)
+        self.assertEqual(capability.gpu_slot_gen, Decimal("4.0"))
+        self.assertEqual((capability.m2_pcie_gen, capability.m2_pcie_lanes), (Decimal("4.0"), 4))
+        self.assertFalse(capability.m2_sata)
+        self.assertEqual(capability.sata_ports, 0)
+        self.assertEqual(capability.ram_type_set, {"DDR5"})
+        self.assertEqual(
+            capability.power_connectors,
+            [
+                {"category": "ATX Power", "lanes": 24, "version": None},
+                {"category": "CPU Power", "lanes": 8, "version": None},
+            ],
+        )
+
+    def test_summary_follows_connector_and_ram_changes(self):
+        mobo = self.catalog.mobo_am5
+        MotherboardConnector.objects.get(motherboard=mobo, connector=self.catalog.pcie4_x16).delete()
+        mobo.supported_ram.add(self.catalog.ddr4)
+
+        capability = self.capability(mobo)
+        self.assertIsNone(capability.gpu_slot_lanes)
+        self.assertEqual(capability.ram_type_set, {"DDR4", "DDR5"})
+
+        response = self.client.get("/api/compatibility/", {"mobo": mobo.id, "categories": "gpus"})
+        self.assertEqual(response.json()["gpus"], [])
+
+    def test_deleting_motherboard_removes_summary(self):
+        mobo_id = self.catalog.mobo_am4.id
+        Motherboard.objects.filter(pk=mobo_id).delete()
+        self.assertFalse(MotherboardCapability.objects.filter(pk=mobo_id).exists())
+
+    def test_boards_without_summary_fall_back_to_connectors(self):
+        MotherboardCapability.objects.all().delete()
+
+        compatible = MotherboardService.get_compatible_motherboards({
+            "cpu": self.catalog.cpu_am5.id, "gpu": self.catalog.gpu.id, "mem": self.catalog.storage.id,
+        })
+        self.assertEqual(list(compatible), [self.catalog.mobo_am5])
+        self.assertEqual(
+            list(RAMService.get_compatible_motherboards(self.catalog.ram_ddr4)), [self.catalog.mobo_am4],
+        )
+
+    def test_m2_sata_drive_fits_pcie_slot_with_sata_support_without_summary(self):
+        mobo = self.catalog.mobo_am4
+        m2_pcie_sata = Connector.objects.create(category="M.2 PCIe", version=Decimal("3.0"), lanes=4, extra="SATA")
+        MotherboardConnector.objects.create(motherboard=mobo, connector=m2_pcie_sata)
+        m2_sata = Connector.objects.create(category="M.2 SATA")
+        drive = Storage.objects.create(
+            manufacturer=self.catalog.maker, name="SSD M.2 SATA", connector=m2_sata,
+            capacity_gb=500, price=Decimal("150"),
+        )
+        self.assertTrue(self.capability(mobo).m2_sata)
+
+        MotherboardCapability.objects.all().delete()
+        compatible = MotherboardService.get_compatible_motherboards({"mem": drive.id})
+        self.assertEqual(list(compatible), [mobo])
+
+    def test_storage_is_matched_per_m2_slot(self):
+        mobo = self.catalog.mobo_am5
+        m2_pcie5_x2 = Connector.objects.create(category="M.2 PCIe", version=Decimal("5.0"), lanes=2)
+        MotherboardConnector.objects.create(motherboard=mobo, connector=m2_pcie5_x2)
+        capability = self.capability(mobo)
+        self.assertEqual((capability.m2_pcie_gen, capability.m2_pcie_lanes), (Decimal("5.0"), 2))
+
+        # dysk 4.0 x4 pasuje do slotu 4.0 x4, choć najnowszy slot ma tylko 2 linie
+        compatible = MotherboardService.get_compatible_motherboards({"mem": self.catalog.storage.id})
+        self.assertIn(mobo, compatible)
+
+        m2_pcie5_x4 = Connector.objects.create(category="M.2 PCIe", version=Decimal("5.0"), lanes=4)
+        too_fast = Storage.objects.create(
+            manufacturer=self.catalog.maker, name="SSD 5.0 x4", connector=m2_pcie5_x4,
+            capacity_gb=2000, price=Decimal("400"),
+        )
+        drives = StorageService.get_compatible_m2({"mobo": mobo.id})
+        self.assertIn(self.catalog.storage, drives)
+        self.assertNotIn(too_fast, drives)
+        self.assertNotIn(mobo, MotherboardService.get_compatible_motherboards({"mem": too_fast.id}))
+
+    def test_rebuild_command_restores_missing_summaries(self):
+        MotherboardCapability.objects.all().delete()
+        call_command("rebuild_motherboard_capabilities", stdout=StringIO())
+        self.assertEqual(MotherboardCapability.objects.count(), Motherboard.objects.count())
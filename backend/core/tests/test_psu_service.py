@@ -0,0 +1,109 @@
+import random
+
+from django.test import SimpleTestCase, TestCase
+
+from core.models import PSU
+from core.services.catalog_service import CatalogService
+from core.services.psu_service import PSUService
+from core.tests.factories import make_catalog
+
+
+class PCIePowerMatcherTest(SimpleTestCase):
+    def test_dp_matcher_agrees_with_exhaustive_search(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            values = sorted((rng.choice([6, 8, 8, 12, 16]) for _ in range(rng.randint(0, 9))), reverse=True)
+            target = rng.randint(0, 60)
+            self.assertEqual(
+                PSUService._find_best_subset(values, target),
+                PSUService._find_best_subset_exhaustive(values, target),
+                (values, target),
+            )
+
+    def test_can_satisfy_gpu_power(self):
+        self.assertTrue(PSUService.can_satisfy_gpu_power([8, 8, 6], [8, 8]))
+        self.assertTrue(PSUService.can_satisfy_gpu_power([8, 8], [16]))
+        self.assertFalse(PSUService.can_satisfy_gpu_power([8, 6], [8, 8]))
+        self.assertFalse(PSUService.can_satisfy_gpu_power(None, [8]))
+        self.assertTrue(PSUService.can_satisfy_gpu_power([], []))
+
+    def test_many_leads_do_not_blow_up(self):
+        self.assertFalse(PSUService.can_satisfy_gpu_power([8] * 40, [16, 400]))
+
+
+class PSUConnectorInventoryTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+
+    def test_inventory_is_synced_on_save(self):
+        psu = self.catalog.psu
+        items = {(item.category, item.lanes, item.quantity) for item in psu.connector_items.all()}
+
+        self.assertIn(("ATX Power", 24, 1), items)
+        self.assertIn(("PCIe Power", 8, 4), items)
+        self.assertEqual(PSU.objects.get(pk=psu.pk).pcie_pins, [8, 8, 8, 8])
+
+        psu.connectors = {"ATX 24-pin": 1}
+        psu.save()
+        self.assertEqual(psu.connector_items.count(), 1)
+        self.assertEqual(PSU.objects.get(pk=psu.pk).pcie_pins, [])
+
+    def test_filter_by_mobo_uses_inventory(self):
+        weak = PSU.objects.create(
+            manufacturer=self.catalog.maker, name="No EPS", wattage=650,
+            connectors={"ATX 24-pin (20+4)": 1, "PCIe 8-pin (6+2)": 2},
+            form_factor=self.catalog.psu_atx,
+        )
+
+        compatible = PSUService.filter_by_mobo(PSU.objects.all(), self.catalog.mobo_am5)
+
+        self.assertIn(self.catalog.psu, compatible)
+        self.assertNotIn(weak, compatible)
+
+    def test_filter_by_mobo_query_count(self):
+        # zasilacze bez inwentarza + właściwe filtrowanie
+        with self.assertNumQueries(2):
+            compatible = list(PSUService.filter_by_mobo(PSU.objects.all(), self.catalog.mobo_am5))
+
+        self.assertEqual(compatible, [self.catalog.psu])
+
+    def test_synced_psu_without_items_skips_fallback(self):
+        # złącza, z których nie powstaje żaden PSUConnectorItem, nie oznaczają braku synchronizacji
+        bare = PSU.objects.create(
+            manufacturer=self.catalog.maker, name="Unknown leads", wattage=750, price=90,
+            connectors={"12VHPWR": 1}, form_factor=self.catalog.psu_atx,
+        )
+        self.assertFalse(bare.connector_items.exists())
+        self.assertTrue(PSU.objects.get(pk=bare.pk).connector_inventory_synced)
+
+        # bez zasilaczy do sprawdzenia w Pythonie: nie ma zapytania o wymagania płyty
+        with self.assertNumQueries(2):
+            compatible = list(PSUService.filter_by_mobo(PSU.objects.all(), self.catalog.mobo_am5))
+        self.assertEqual(compatible, [self.catalog.psu])
+
+        snapshot = CatalogService.get_snapshot()
+        self.assertEqual(snapshot.psus[bare.pk].connector_items, ())
+
+    def test_psus_without_inventory_fall_back_to_connectors(self):
+        # bulk_create (jak loaddata) nie wywołuje sygnału, więc inwentarz nie powstaje
+        strong, weak = PSU.objects.bulk_create([
+            PSU(
+                manufacturer=self.catalog.maker, name="Bulk strong", wattage=850, price=80,
+                connectors=self.catalog.psu.connectors, form_factor=self.catalog.psu_atx,
+            ),
+            PSU(
+                manufacturer=self.catalog.maker, name="Bulk weak", wattage=650,
+                connectors={"ATX 24-pin (20+4)": 1, "PCIe 8-pin (6+2)": 2},
+                form_factor=self.catalog.psu_atx,
+            ),
+        ])
+        self.assertFalse(strong.connector_items.exists())
+        self.assertFalse(strong.connector_inventory_synced)
+
+        compatible = PSUService.filter_by_mobo(PSU.objects.all(), self.catalog.mobo_am5)
+        self.assertIn(strong, compatible)
+        self.assertNotIn(weak, compatible)
+
+        snapshot = CatalogService.get_snapshot()
+        mobo = snapshot.motherboards[self.catalog.mobo_am5.id]
+        self.assertIn(snapshot.psus[strong.id], snapshot.psus_for_motherboard(mobo))
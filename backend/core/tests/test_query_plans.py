@@ -0,0 +1,57 @@
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from core.models import RAM, Storage, PSU, Case, Motherboard, GPU, CPU
+from core.services.case_service import CaseService
+from core.services.cpu_service import CPUService
+from core.services.gpu_service import GPUService
+from core.services.motherboard_service import MotherboardService
+from core.services.ram_service import RAMService
+from core.services.storage_service import StorageService
+from core.tests.factories import make_catalog
+
+# "SCAN tabela" bez "USING ... INDEX" oznacza pełny skan tabeli w EXPLAIN QUERY PLAN SQLite
+FULL_SCAN = re.compile(r"\bSCAN (core_\w+)\s*$", re.MULTILINE)
+
+
+@skipUnless(connection.vendor == "sqlite", "plany zapytań sprawdzane dla SQLite")
+class CompatibilityQueryPlanTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+
+    def assertNoFullScan(self, queryset):
+        plan = queryset.explain()
+        self.assertEqual(FULL_SCAN.findall(plan), [], plan)
+
+    def test_compatibility_filters_use_indexes(self):
+        c = self.catalog
+        queries = {
+            "motherboards": MotherboardService.get_compatible_motherboards(
+                {"cpu": c.cpu_am5.id, "ram": c.ram_ddr5.id, "gpu": c.gpu.id, "mem": c.storage.id}
+            ),
+            "cpus": CPUService.get_compatible_cpus({"mobo": c.mobo_am5.id}),
+            "rams": RAMService.get_compatible_rams({"cpu": c.cpu_am5.id, "mobo": c.mobo_am5.id}),
+            "gpus": GPUService.get_compatible_gpus({"mobo": c.mobo_am5.id, "case": c.case.id}),
+            "mems": StorageService.get_compatible_m2({"mobo": c.mobo_am5.id}),
+            "cases": CaseService.get_compatible_cases({"gpu": c.gpu.id}),
+            "psus_by_wattage": PSU.objects.filter(wattage__gte=650),
+        }
+        for name, queryset in queries.items():
+            with self.subTest(name):
+                self.assertNoFullScan(queryset)
+
+    def test_snapshot_loaders_use_priced_indexes(self):
+        for queryset in (
+            CPU.objects.filter(price__isnull=False).order_by("-tier_score", "price", "id"),
+            GPU.objects.filter(price__isnull=False).order_by("-tier_score", "price", "id"),
+            Motherboard.objects.filter(price__isnull=False).order_by("id"),
+            RAM.objects.filter(price__isnull=False).order_by("id"),
+            Storage.objects.filter(price__isnull=False).order_by("id"),
+            PSU.objects.filter(price__isnull=False).order_by("id"),
+            Case.objects.filter(price__isnull=False).order_by("id"),
+        ):
+            with self.subTest(queryset.model.__name__):
+                self.assertNoFullScan(queryset)
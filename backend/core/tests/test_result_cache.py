@@ -0,0 +1,87 @@
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core.services.result_cache_service import (
+    BuilderResultCache, FileCacheBackend, LocalMemoryCacheBackend,
+)
+
+
+class BuilderResultCacheTest(SimpleTestCase):
+    def test_counts_hits_and_misses(self):
+        cache = BuilderResultCache(LocalMemoryCacheBackend())
+
+        self.assertEqual(cache.get_or_compute("a", lambda: 1), 1)
+        self.assertEqual(cache.get_or_compute("a", lambda: 2), 1)
+
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_local_memory_backend_evicts_least_recently_used(self):
+        backend = LocalMemoryCacheBackend(max_entries=2)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+
+        self.assertEqual(backend.get("a"), 1)
+        self.assertIsNone(backend.get("b"))
+        self.assertEqual(backend.evictions, 1)
+
+    def test_file_backend_round_trip_and_eviction(self):
+        with tempfile.TemporaryDirectory() as location:
+            backend = FileCacheBackend(location, max_entries=1)
+            backend.set("a", {"total_price": "100"})
+            self.assertEqual(backend.get("a"), {"total_price": "100"})
+
+            time.sleep(0.01)
+            backend.set("b", 2)
+            self.assertIsNone(backend.get("a"))
+            self.assertEqual(backend.get("b"), 2)
+            self.assertEqual(backend.evictions, 1)
+
+    def test_concurrent_misses_compute_once(self):
+        cache = BuilderResultCache(LocalMemoryCacheBackend())
+        calls = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return "result"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+            for _ in range(4)
+        ]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, ["result"] * 4)
+
+
+@override_settings(REQUEST_METRICS={"PUBLIC": True})
+class BuilderResultCacheMetricsTest(TestCase):
+    def test_stats_are_reported_by_metrics_endpoint(self):
+        cache = BuilderResultCache(LocalMemoryCacheBackend(max_entries=1))
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("b", lambda: 2)
+
+        with mock.patch.object(BuilderResultCache, "_default", cache):
+            response = self.client.get("/api/_metrics/")
+
+        self.assertEqual(
+            response.json()["builder_cache"],
+            {"hits": 1, "misses": 2, "hit_ratio": 1 / 3, "evictions": 1},
+        )
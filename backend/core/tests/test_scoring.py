@@ -0,0 +1,80 @@
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from core.models import CPU, GPU, GraphicsChip
+from core.services import scoring_service
+from core.services.scoring_service import ScoringService
+from core.tests.factories import add_copies, make_catalog
+
+
+class ScoringServiceMixin:
+    """Te same testy dla obu implementacji (numpy i listy)."""
+
+    def setUp(self):
+        self.catalog = make_catalog()
+        add_copies(self.catalog, 3)
+        # skrajne przypadki wzorów: brak boost/cache, brak szyny, nasycenie do 10
+        cpu = self.catalog.cpu_am4
+        cpu.boost_clock_ghz, cpu.cache_mb, cpu.p_cores, cpu.threads = None, None, 24, 64
+        cpu.save()
+        chip = GraphicsChip.objects.create(marketing_name="Bare", memory_bus_width=None)
+        GPU.objects.create(
+            manufacturer=self.catalog.maker, model_name="Bare", graphics_chip=chip,
+            base_clock_mhz=1275, length_mm=200, price=Decimal("100"),
+        )
+        ScoringService.clear()
+        self.addCleanup(ScoringService.clear)
+
+    def test_default_profile_matches_model_formulas(self):
+        for category, model in (("cpu", CPU), ("gpu", GPU), ("chip", GraphicsChip)):
+            table = ScoringService.load_table(category)
+            scores = ScoringService.round_scores(ScoringService.compute(table, category))
+            expected = {obj.pk: obj.compute_tier_score() for obj in model.objects.all()}
+            self.assertEqual(
+                {int(pk): int(score) for pk, score in zip(table.ids, scores)}, expected, category
+            )
+
+    def test_top_orders_by_score_then_id(self):
+        scores = dict(zip(
+            (int(pk) for pk in ScoringService.get_table("gpu").ids),
+            (float(score) for score in ScoringService.get_scores("gpu", "gaming")),
+        ))
+        expected = sorted(scores, key=lambda pk: (-scores[pk], pk))
+
+        self.assertEqual([pk for pk, _ in ScoringService.top("gpu", 3, "gaming")], expected[:3])
+        self.assertEqual([pk for pk, _ in ScoringService.top("gpu", 100, "gaming")], expected)
+        self.assertEqual(
+            [pk for pk, _ in ScoringService.top("gpu", 2, "gaming", ids=expected[-2:])], expected[-2:]
+        )
+
+    @override_settings(TIER_SCORE_PROFILES={
+        "cores": {"cpu": {"weights": {"p_cores": 1}, "max_score": 100}},
+    })
+    def test_custom_profile(self):
+        best_id, best_score = ScoringService.top("cpu", 1, "cores")[0]
+        self.assertEqual(best_id, self.catalog.cpu_am4.id)
+        self.assertAlmostEqual(best_score, 2.4)
+
+    def test_scores_follow_catalog_version(self):
+        before = dict(ScoringService.top("cpu", 100))
+        cpu = self.catalog.cpu_am5
+        cpu.p_cores = 16
+        cpu.save()
+
+        self.assertGreater(dict(ScoringService.top("cpu", 100))[cpu.id], before[cpu.id])
+
+
+@unittest.skipIf(scoring_service.np is None, "numpy is not installed")
+class NumpyScoringTest(ScoringServiceMixin, TestCase):
+    pass
+
+
+class PurePythonScoringTest(ScoringServiceMixin, TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(scoring_service, "np", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
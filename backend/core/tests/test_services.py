@@ -1,5 +1,10 @@
+from decimal import Decimal
+
 from django.test import TestCase
-from core.models import Connector, GPU, GPUConnector, Motherboard, MotherboardConnector, FormFactor
+from core.models import (
+    Connector, GPU, GraphicsChip, Manufacturer, Motherboard, MotherboardConnector,
+    MotherboardFormFactor, Socket,
+)
 from core.services.gpu_service import GPUService
 from core.services.motherboard_service import MotherboardService
 
@@ -7,32 +12,40 @@ from core.services.motherboard_service import MotherboardService
 class CompatibilityServiceTest(TestCase):
     def setUp(self):
         # form factor
-        ff = FormFactor.objects.create(name="ATX")
+        ff = MotherboardFormFactor.objects.create(name="ATX")
+        maker = Manufacturer.objects.create(name="Acme")
+        socket = Socket.objects.create(name="LGA 1700")
 
         # connectory
-        self.pcie_5_x16 = Connector.objects.create(category="PCIe", version=5.0, lanes=16)
-        self.pcie_3_x1 = Connector.objects.create(category="PCIe", version=3.0, lanes=1)
+        self.pcie_5_x16 = Connector.objects.create(category="PCIe", version=Decimal("5.0"), lanes=16)
+        self.pcie_3_x1 = Connector.objects.create(category="PCIe", version=Decimal("3.0"), lanes=1)
 
         # gpu
-        self.gpu = GPU.objects.create(name="RTX 4070")
-        GPUConnector.objects.create(gpu=self.gpu, connector=self.pcie_5_x16, ilosc=1)
+        chip = GraphicsChip.objects.create(marketing_name="RTX 4070", pcie_max_gen=4, pcie_max_width=16)
+        self.gpu = GPU.objects.create(manufacturer=maker, model_name="RTX 4070", graphics_chip=chip, length_mm=240)
 
         # motherboard z kompatybilnym slotem
-        self.mobo_good = Motherboard.objects.create(name="ASUS Z790", form_factor=ff)
-        MotherboardConnector.objects.create(motherboard=self.mobo_good, connector=self.pcie_5_x16, ilosc=1)
+        self.mobo_good = Motherboard.objects.create(
+            name="ASUS Z790", manufacturer=maker, socket=socket, form_factor=ff,
+            max_ram_capacity=128, dimm_slots=4,
+        )
+        MotherboardConnector.objects.create(motherboard=self.mobo_good, connector=self.pcie_5_x16, quantity=1)
 
         # motherboard bez kompatybilnego slotu
-        self.mobo_bad = Motherboard.objects.create(name="Old Board", form_factor=ff)
-        MotherboardConnector.objects.create(motherboard=self.mobo_bad, connector=self.pcie_3_x1, ilosc=1)
-
-    # def test_gpu_service_returns_compatible_mobo(self):
-    #     mobos = GPUService.get_compatible_motherboards(self.gpu)
-    #     self.assertIn(self.mobo_good, mobos)
-    #     self.assertNotIn(self.mobo_bad, mobos)
-
-    # def test_motherboard_service_returns_compatible_gpu(self):
-    #     gpus = MotherboardService.get_compatible_gpus(self.mobo_good)
-    #     self.assertIn(self.gpu, gpus)
-
-    #     gpus_bad = MotherboardService.get_compatible_gpus(self.mobo_bad)
-    #     self.assertNotIn(self.gpu, gpus_bad)
+        self.mobo_bad = Motherboard.objects.create(
+            name="Old Board", manufacturer=maker, socket=socket, form_factor=ff,
+            max_ram_capacity=32, dimm_slots=2,
+        )
+        MotherboardConnector.objects.create(motherboard=self.mobo_bad, connector=self.pcie_3_x1, quantity=1)
+
+    def test_gpu_service_returns_compatible_mobo(self):
+        mobos = GPUService.get_compatible_motherboard(self.gpu)
+        self.assertIn(self.mobo_good, mobos)
+        self.assertNotIn(self.mobo_bad, mobos)
+
+    def test_motherboard_service_returns_compatible_gpu(self):
+        gpus = MotherboardService.get_compatible_gpus(self.mobo_good)
+        self.assertIn(self.gpu, gpus)
+
+        gpus_bad = MotherboardService.get_compatible_gpus(self.mobo_bad)
+        self.assertNotIn(self.gpu, gpus_bad)
@@ -0,0 +1,399 @@
+import gzip
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.models import RAM, Storage
+from core.services.builder_job_service import BuilderJobService
+from core.services.builder_service import BuildBuilderService
+from core.services.catalog_export_service import CatalogExportService
+from core.services.facet_service import FacetService
+from core.services.filter_options_service import FilterOptionsService
+from core.services.frontier_service import FrontierService
+from core.services.metrics_service import RequestMetricsService
+from core.services.scoring_service import ScoringService
+from core.tests.factories import add_copies, make_catalog
+
+
+@override_settings(BUILDER_FRONTIER_AUTO_REBUILD=False)
+class BuildBuilderViewTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+
+    def test_returns_single_build(self):
+        response = self.client.get("/api/builder/", {"budget": 5000})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["cpu"]["id"], self.catalog.cpu_am5.id)
+
+    def test_rejects_invalid_params(self):
+        self.assertEqual(self.client.get("/api/builder/").status_code, 400)
+        self.assertEqual(self.client.get("/api/builder/", {"budget": 5000, "k": 0}).status_code, 400)
+        self.assertEqual(self.client.get("/api/builder/", {"budget": 5000, "mode": "x"}).status_code, 400)
+
+    def test_top_k_lists_differences_against_best_build(self):
+        response = self.client.get("/api/builder/", {"budget": 5000, "k": 2})
+
+        builds = response.json()["builds"]
+        self.assertEqual(len(builds), 2)
+        self.assertEqual(builds[0]["differences"], [])
+        changed = {item["component"]: item["change"] for item in builds[1]["differences"]}
+        self.assertEqual(changed["cpu"], "cheaper")
+
+    def test_pins_and_filters_constrain_build(self):
+        pinned = self.client.get("/api/builder/", {"budget": 5000, "mobo": self.catalog.mobo_am4.id})
+        filtered = self.client.get("/api/builder/", {"budget": 5000, "k": 2, "cpu__socket": self.catalog.am4.id})
+
+        self.assertEqual(pinned.json()["cpu"]["id"], self.catalog.cpu_am4.id)
+        self.assertEqual({build["cpu"]["id"] for build in filtered.json()["builds"]}, {self.catalog.cpu_am4.id})
+        unreachable = self.client.get("/api/builder/", {"budget": 5000, "gpu__vram_size_gb": 24})
+        self.assertEqual(unreachable.status_code, 404)
+
+    def test_rejects_invalid_constraints(self):
+        self.assertEqual(self.client.get("/api/builder/", {"budget": 5000, "cpu": "x"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/builder/", {"budget": 5000, "gpu__price_min": "x"}).status_code, 400)
+
+    def test_rejects_pins_outside_builder_catalog(self):
+        single_stick = RAM.objects.create(
+            name="RAM 1x8", manufacturer=self.catalog.maker, base=self.catalog.ddr5, modules_count=1,
+            module_memory=8, cycle_latency=30, price=Decimal("100"),
+        )
+
+        response = self.client.get("/api/builder/", {"budget": 5000, "ram": single_stick.id})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "pin_unavailable", "field": "ram"})
+        response = self.client.get("/api/builder/", {"budget": 5000, "mobo": 999999})
+        self.assertEqual(response.json(), {"error": "pin_unavailable", "field": "mobo"})
+        small_drive = Storage.objects.create(
+            manufacturer=self.catalog.maker, name="SSD 500", connector=self.catalog.m2_pcie4,
+            capacity_gb=500, price=Decimal("150"),
+        )
+        response = self.client.get("/api/builder/", {"budget": 5000, "mem": small_drive.id})
+        self.assertEqual(response.json(), {"error": "pin_unavailable", "field": "mem"})
+        response = self.client.get("/api/builder/", {"budget": 5000, "mem": self.catalog.storage.id})
+        self.assertEqual(response.status_code, 200)
+
+    def test_answers_from_frontier_when_ready(self):
+        FrontierService.rebuild()
+
+        with mock.patch.object(BuildBuilderService, "build") as build:
+            response = self.client.get("/api/builder/", {"budget": 3500})
+
+        build.assert_not_called()
+        self.assertEqual(response.json()["cpu"]["id"], self.catalog.cpu_am4.id)
+
+    def test_repeated_request_is_served_from_cache(self):
+        with mock.patch.object(BuildBuilderService, "build", wraps=BuildBuilderService.build) as build:
+            first = self.client.get("/api/builder/", {"budget": 4000})
+            second = self.client.get("/api/builder/", {"budget": 4000})
+
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(first.json(), second.json())
+
+
+@override_settings(BUILDER_FRONTIER_AUTO_REBUILD=False, BUILDER_JOB_WORKERS=0)
+class BuilderJobViewTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+        self.addCleanup(BuilderJobService.clear)
+
+    def test_job_reports_progress_and_result(self):
+        response = self.client.post("/api/builder/jobs/", {"budget": 5000, "k": 2}, content_type="application/json")
+
+        self.assertEqual(response.status_code, 202)
+        job = self.client.get(response["Location"]).json()
+        self.assertEqual(job["status"], "done")
+        self.assertEqual(job["result_status"], 200)
+        self.assertEqual(job["result"], self.client.get("/api/builder/", {"budget": 5000, "k": 2}).json())
+        self.assertGreater(job["progress"]["candidates_explored"], 0)
+        self.assertEqual(job["progress"]["gpus_done"], job["progress"]["gpus_total"])
+        self.assertEqual(job["progress"]["best"]["score"], job["result"]["builds"][0]["score"])
+
+    def test_rejects_invalid_params_and_unknown_job(self):
+        self.assertEqual(self.client.post("/api/builder/jobs/", {"k": 2}).status_code, 400)
+        for body in ([{"budget": 5000}], "5000"):
+            response = self.client.post("/api/builder/jobs/", body, content_type="application/json")
+            self.assertEqual(response.status_code, 400, body)
+            self.assertEqual(response.json(), {"error": "params_invalid"})
+        self.assertEqual(self.client.get("/api/builder/jobs/missing/").status_code, 404)
+
+
+class CompatibilityViewTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+
+    def test_returns_ids_matching_single_category_endpoints(self):
+        params = {"cpu": self.catalog.cpu_am5.id, "gpu": self.catalog.gpu.id}
+        response = self.client.get("/api/compatibility/", params)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        for category in ("cpus", "gpus", "motherboards", "rams", "mems", "psus", "cases"):
+            listed = self.client.get(f"/api/{category}/", params).json()
+            self.assertEqual(data[category], sorted(item["id"] for item in listed), category)
+        self.assertEqual(data["motherboards"], [self.catalog.mobo_am5.id])
+        self.assertEqual(data["rams"], [self.catalog.ram_ddr5.id])
+
+    def test_selected_components_are_loaded_once(self):
+        params = {"cpu": self.catalog.cpu_am5.id, "mobo": self.catalog.mobo_am5.id}
+        response = self.client.get("/api/compatibility/", params)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/compatibility/", params)
+
+        mobo_lookups = [
+            query["sql"] for query in queries.captured_queries
+            if query["sql"].startswith('SELECT "core_motherboard"."id"')
+            and f'"core_motherboard"."id" = {self.catalog.mobo_am5.id}' in query["sql"]
+        ]
+        self.assertEqual(response.json()["cpus"], [self.catalog.cpu_am5.id])
+        self.assertEqual(len(mobo_lookups), 1)
+
+    def test_categories_param(self):
+        response = self.client.get("/api/compatibility/", {"categories": "cpus,rams"})
+        self.assertEqual(set(response.json()), {"cpus", "rams"})
+
+        self.assertEqual(self.client.get("/api/compatibility/", {"categories": "x"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/compatibility/", {"cpu": 999}).status_code, 404)
+
+
+class RankingViewTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+        add_copies(self.catalog, 2)
+        ScoringService.clear()
+        self.addCleanup(ScoringService.clear)
+
+    def test_returns_top_components_for_profile(self):
+        response = self.client.get("/api/rankings/", {"category": "cpu", "profile": "office", "n": 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(item["id"], item["score"]) for item in response.json()["results"]],
+            ScoringService.top("cpu", 2, "office"),
+        )
+        narrowed = self.client.get("/api/rankings/", {"category": "cpu", "ids": self.catalog.cpu_am4.id})
+        self.assertEqual([item["id"] for item in narrowed.json()["results"]], [self.catalog.cpu_am4.id])
+
+    def test_rejects_invalid_params(self):
+        for params in (
+            {},
+            {"category": "ram"},
+            {"category": "cpu", "profile": "x"},
+            {"category": "cpu", "n": 0},
+            {"category": "cpu", "n": "x"},
+            {"category": "cpu", "ids": "1,x"},
+        ):
+            self.assertEqual(self.client.get("/api/rankings/", params).status_code, 400, params)
+
+
+class ListQueryCountTest(TestCase):
+    ENDPOINTS = ("cpus", "gpus", "motherboards", "rams", "mems", "psus", "cases")
+
+    def setUp(self):
+        self.catalog = make_catalog()
+
+    def _count_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        for params in ({}, {"mobo": self.catalog.mobo_am5.id}):
+            before = {endpoint: self._count_queries(f"/api/{endpoint}/", params) for endpoint in self.ENDPOINTS}
+            add_copies(self.catalog, 5)
+            after = {endpoint: self._count_queries(f"/api/{endpoint}/", params) for endpoint in self.ENDPOINTS}
+
+            self.assertEqual(before, after, params)
+
+
+class FilterOptionsViewTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+        FilterOptionsService.clear()
+
+    def test_options_are_cached_per_catalog_version(self):
+        first = self.client.get("/api/filters/options/")
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/filters/options/")
+
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertEqual([o["label"] for o in first.json()["cpu"]["socket"]], ["AM4", "AM5"])
+
+    def test_conditional_request_returns_304_until_catalog_changes(self):
+        etag = self.client.get("/api/filters/options/")["ETag"]
+
+        response = self.client.get("/api/filters/options/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.catalog.cpu_am4.save()
+        response = self.client.get("/api/filters/options/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class FilterFacetsViewTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+        FacetService.clear()
+
+    def _counts(self, response, facet):
+        return {item["value"]: item["count"] for item in response.json()["facets"][facet]}
+
+    def test_counts_follow_partial_build_and_other_filters(self):
+        catalog = self.catalog
+        response = self.client.get("/api/filters/facets/", {"category": "cpu"})
+        self.assertEqual(response.json()["total"], 2)
+        self.assertEqual(self._counts(response, "socket"), {catalog.am4.id: 1, catalog.am5.id: 1})
+
+        response = self.client.get("/api/filters/facets/", {"category": "cpu", "mobo": catalog.mobo_am5.id})
+        self.assertEqual(self._counts(response, "socket"), {catalog.am4.id: 0, catalog.am5.id: 1})
+
+        response = self.client.get(
+            "/api/filters/facets/",
+            {"category": "cpu", "socket": catalog.am4.id, "supported_ram": catalog.ddr5.id},
+        )
+        self.assertEqual(response.json()["total"], 0)
+        # licznik facetu ignoruje jego własny filtr, ale uwzględnia pozostałe
+        self.assertEqual(self._counts(response, "socket"), {catalog.am4.id: 0, catalog.am5.id: 1})
+        self.assertEqual(self._counts(response, "supported_ram"), {catalog.ddr4.id: 1, catalog.ddr5.id: 0})
+
+    def test_range_filters_and_invalid_category(self):
+        response = self.client.get("/api/filters/facets/", {"category": "ram", "price_max": 200})
+        self.assertEqual(response.json()["total"], 1)
+
+        self.assertEqual(self.client.get("/api/filters/facets/", {"category": "psu"}).status_code, 400)
+
+
+class ListPaginationTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+        add_copies(self.catalog, 3)
+
+    def test_without_limit_returns_plain_list(self):
+        response = self.client.get("/api/cpus/")
+
+        self.assertIsInstance(response.json(), list)
+        self.assertEqual(len(response.json()), 5)
+
+    def test_limit_offset_pages_results(self):
+        response = self.client.get("/api/cpus/", {"limit": 2, "offset": 2})
+
+        data = response.json()
+        self.assertEqual(data["count"], 5)
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIsNotNone(data["next"])
+        self.assertIsNotNone(data["previous"])
+
+    def test_stream_param_streams_same_list(self):
+        for endpoint in ("/api/gpus/", "/api/motherboards/", "/api/rams/"):
+            response = self.client.get(endpoint, {"stream": 1})
+
+            self.assertTrue(response.streaming)
+            streamed = json.loads(b"".join(response.streaming_content))
+            self.assertEqual(streamed, self.client.get(endpoint).json())
+
+    def test_fields_param_selects_serializer(self):
+        light = self.client.get("/api/gpus/", {"fields": "light"}).json()
+        detail = self.client.get("/api/gpus/", {"fields": "detail"}).json()
+
+        self.assertEqual(set(light[0]), {"id", "short_name"})
+        self.assertIn("power_connectors", detail[0])
+        self.assertEqual(self.client.get("/api/gpus/", {"fields": "x"}).status_code, 400)
+
+
+class CatalogExportViewTest(TestCase):
+    def setUp(self):
+        self.catalog = make_catalog()
+        CatalogExportService.clear()
+
+    def test_export_is_columnar(self):
+        data = self.client.get("/api/catalog/export/").json()
+
+        cpus = data["tables"]["cpus"]
+        self.assertEqual(cpus["ids"], [self.catalog.cpu_am4.id, self.catalog.cpu_am5.id])
+        self.assertEqual(cpus["columns"]["price"], [500.0, 1500.0])
+        self.assertEqual(cpus["columns"]["socket_id"], [self.catalog.am4.id, self.catalog.am5.id])
+        names = cpus["columns"]["name"]
+        self.assertEqual([names["values"][code] for code in names["codes"]], ["Ryzen 5 5600", "Ryzen 7 7800X3D"])
+        self.assertEqual(cpus["relations"]["supported_ram"], [[self.catalog.ddr4.id], [self.catalog.ddr5.id]])
+
+    def test_gzip_and_etag(self):
+        response = self.client.get("/api/catalog/export/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        data = json.loads(gzip.decompress(response.content))
+        self.assertIn("cases", data["tables"])
+
+        cached = self.client.get(
+            "/api/catalog/export/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(cached.status_code, 304)
+
+        self.catalog.case.save()
+        changed = self.client.get(
+            "/api/catalog/export/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(changed.status_code, 200)
+
+
+class RequestMetricsTest(TestCase):
+    def setUp(self):
+        make_catalog()
+        RequestMetricsService.clear()
+        self.addCleanup(RequestMetricsService.clear)
+
+    def test_server_timing_header(self):
+        response = self.client.get("/api/cpus/")
+
+        timing = response["Server-Timing"]
+        self.assertRegex(
+            timing,
+            r'^db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+, render;dur=[\d.]+, total;dur=[\d.]+$',
+        )
+
+    @override_settings(REQUEST_METRICS={"PUBLIC": True})
+    def test_metrics_are_aggregated_per_view_and_action(self):
+        for _ in range(3):
+            self.client.get("/api/cpus/")
+        self.client.get("/api/filters/options/")
+
+        response = self.client.get("/api/_metrics/")
+
+        summary = response.json()
+        self.assertEqual(summary["CPUViewSet.list"]["count"], 3)
+        self.assertIn("FilterOptionsView.get", summary)
+        queries = summary["CPUViewSet.list"]["queries"]
+        self.assertGreater(queries["p50"], 0)
+        self.assertLessEqual(queries["p50"], queries["p99"])
+        self.assertGreater(summary["CPUViewSet.list"]["size_bytes"]["max"], 0)
+        self.assertIsNotNone(summary["CPUViewSet.list"]["serialize_ms"])
+
+    @override_settings(REQUEST_METRICS={"PUBLIC": True})
+    def test_streamed_list_is_recorded_after_body_is_sent(self):
+        response = self.client.get("/api/cpus/", {"stream": 1})
+        self.assertNotIn("CPUViewSet.list", RequestMetricsService.summary())
+
+        body = b"".join(response.streaming_content)
+
+        stats = RequestMetricsService.summary()["CPUViewSet.list"]
+        self.assertEqual(stats["size_bytes"]["max"], len(body))
+        self.assertGreater(stats["queries"]["max"], 0)
+        self.assertIsNotNone(stats["serialize_ms"])
+        self.assertIsNone(stats["render_ms"])
+
+    @override_settings(REQUEST_METRICS={"PUBLIC": False})
+    def test_endpoint_requires_staff_when_not_public(self):
+        self.assertEqual(self.client.get("/api/_metrics/").status_code, 403)
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(RequestMetricsService._percentile(values, 50), 50)
+        self.assertEqual(RequestMetricsService._percentile(values, 99), 99)
+        self.assertEqual(RequestMetricsService._percentile([7], 90), 7)
@@ -1,8 +1,17 @@
 # core/views.py
+from decimal import Decimal
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
 from rest_framework import viewsets, filters
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from .renderers import stream_json_array
 from .filterset import (
     RAMBaseFilter, MotherboardFormFactorFilter, PSUFormFactorFilter,
     CPUFilter, MotherboardFilter, RAMFilter, StorageFilter, GPUFilter
@@ -30,71 +39,20 @@ from core.services.gpu_service import GPUService
 from core.services.psu_service import PSUService
 from core.services.storage_service import StorageService
 from core.services.case_service import CaseService
-from core.services.builder_service import BuildBuilderService
+from core.services.compatibility_service import CompatibilityService
+from core.services.filter_options_service import FilterOptionsService
+from core.services.facet_service import FacetService
+from core.services.catalog_export_service import CatalogExportService
+from core.services.builder_service import BuildBuilderService, BuildConstraints
+from core.services.frontier_service import FrontierService
+from core.services.result_cache_service import BuilderResultCache
+from core.services.builder_job_service import BuilderJobService
+from core.services.metrics_service import RequestMetricsService
+from core.services.evaluation_service import BuildEvaluationService
+from core.services.scoring_service import ScoringService
 
 from core import tools
 
-OUTPUT_CATEGORIES = ("HDMI", "DisplayPort", "DVI", "VGA", "USB-C")
-
-
-def build_options(values, label_fn=None):
-    return [
-        {"value": value, "label": label_fn(value) if label_fn else str(value)}
-        for value in values
-    ]
-
-
-def values_to_options(rows, value_key, label_key):
-    return [
-        {"value": row[value_key], "label": row[label_key]}
-        for row in rows
-    ]
-
-
-def rambase_options(qs):
-    return [
-        {"value": base.id, "label": f"{base.type}-{base.mts}"}
-        for base in qs.order_by("type", "mts")
-    ]
-
-
-def connector_options(qs):
-    return [
-        {"value": connector.id, "label": str(connector)}
-        for connector in qs.order_by("category", "version", "lanes")
-    ]
-
-
-def _resolve_field(model, field):
-    current_model = model
-    field_obj = None
-    for part in field.split("__"):
-        try:
-            field_obj = current_model._meta.get_field(part)
-        except Exception:
-            return None
-        if getattr(field_obj, "is_relation", False) and hasattr(field_obj, "related_model"):
-            current_model = field_obj.related_model
-    return field_obj
-
-
-def distinct_values(qs, field, order=True):
-    field_obj = _resolve_field(qs.model, field)
-    if field_obj is not None and getattr(field_obj, "null", False):
-        qs = qs.exclude(**{f"{field}__isnull": True})
-    if field_obj is not None and field_obj.get_internal_type() in {
-        "CharField",
-        "TextField",
-        "SlugField",
-        "EmailField",
-        "URLField",
-    }:
-        qs = qs.exclude(**{field: ""})
-    values = qs.values_list(field, flat=True).distinct()
-    if order:
-        values = values.order_by(field)
-    return list(values)
-
 
 class PSUFormFactorViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = PSUFormFactor.objects.all().order_by("name")
@@ -128,6 +86,59 @@ class BaseViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     # Ustal w podklasach: search_fields, ordering_fields
 
+    # ?fields=light -> serializer_class (id, short_name), domyślnie pełny detail_serializer_class
+    FIELDS_LIGHT = "light"
+    FIELDS_DETAIL = "detail"
+    detail_serializer_class = None
+
+    def get_serializer_class(self):
+        if self.detail_serializer_class is None or self.action not in ("retrieve", "list"):
+            return super().get_serializer_class()
+
+        fields = self.request.query_params.get("fields", self.FIELDS_DETAIL)
+        if fields == self.FIELDS_LIGHT:
+            return self.serializer_class
+        if fields != self.FIELDS_DETAIL:
+            raise ValidationError({"fields": [f"Dozwolone: {self.FIELDS_LIGHT}, {self.FIELDS_DETAIL}."]})
+        return self.detail_serializer_class
+
+    def setup_eager_loading(self, queryset):
+        setup = getattr(self.get_serializer_class(), "setup_eager_loading", None)
+        return setup(queryset) if setup else queryset
+
+    def serialize(self, instance, many=False):
+        # faza "serialize" w Server-Timing i /api/_metrics/ (razem z zapytaniami wywołanymi przez serializer)
+        with RequestMetricsService.phase(self.request, "serialize"):
+            return self.get_serializer(instance, many=many).data
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.serialize(self.get_object()))
+
+    # ?stream=1 -> odpowiedź budowana przyrostowo z queryset.iterator() zamiast całej listy w pamięci
+    STREAM_CHUNK_SIZE = 200
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        stream = request.query_params.get("stream") in ("1", "true")
+        # stronicowana odpowiedź i tak ma rozmiar strony
+        if not stream or self.paginator is not None and self.paginator.get_limit(request) is not None:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                return self.get_paginated_response(self.serialize(page, many=True))
+            return Response(self.serialize(queryset, many=True))
+
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+
+        def serialize(obj):
+            with RequestMetricsService.phase(request, "serialize"):
+                return serializer_class(obj, context=context).data
+
+        return StreamingHttpResponse(
+            stream_json_array(queryset.iterator(chunk_size=self.STREAM_CHUNK_SIZE), serialize),
+            content_type="application/json",
+        )
+
 
 class ManufacturerViewSet(BaseViewSet):
     queryset = Manufacturer.objects.all().order_by("name")
@@ -136,119 +147,102 @@ class ManufacturerViewSet(BaseViewSet):
 
 class CPUViewSet(BaseViewSet):
     queryset = CPU.objects.all().order_by("id")
+    serializer_class = CPUSerializer
+    detail_serializer_class = CPUDetailSerializer
     filterset_class = CPUFilter
 
-    def get_serializer_class(self):
-        if self.action in ['retrieve', 'list']:
-            return CPUDetailSerializer
-        return CPUSerializer
-
     def get_queryset(self):
-        return CPUService.get_compatible_cpus(
-            data=tools.extract_params(self.request)                                    
+        qs = CPUService.get_compatible_cpus(
+            data=tools.extract_params(self.request)
         )
+        return self.setup_eager_loading(qs).order_by("id")
 
 
 class GPUViewSet(BaseViewSet):
     queryset = GPU.objects.all().order_by("id")
+    serializer_class = GPUSerializer
+    detail_serializer_class = GPUDetailSerializer
     filterset_class = GPUFilter
-    
-    def get_serializer_class(self):
-        if self.action in ['retrieve', 'list']:
-            return GPUDetailSerializer
-        return GPUSerializer
 
     def get_queryset(self):
-        return GPUService.get_compatible_gpus(
+        qs = GPUService.get_compatible_gpus(
             data=tools.extract_params(self.request)
         )
+        return self.setup_eager_loading(qs).order_by("id")
 
 
 class MotherboardViewSet(BaseViewSet):
     queryset = Motherboard.objects.all().order_by("id")
+    serializer_class = MotherboardSerializer
+    detail_serializer_class = MotherboardDetailSerializer
     filterset_class = MotherboardFilter
 
-    def get_serializer_class(self):
-        if self.action in ['retrieve', 'list']:
-            return MotherboardDetailSerializer
-        return MotherboardSerializer
-
     def get_queryset(self):
-        return MotherboardService.get_compatible_motherboards(
+        qs = MotherboardService.get_compatible_motherboards(
             data=tools.extract_params(self.request)
         )
+        return self.setup_eager_loading(qs).order_by("id")
 
 
 class RAMViewSet(BaseViewSet):
     queryset = RAM.objects.all().order_by("id")
+    serializer_class = RAMSerializer
+    detail_serializer_class = RAMDetailSerializer
     filterset_class = RAMFilter
 
-    def get_serializer_class(self):
-        if self.action in ['retrieve', 'list']:
-            return RAMDetailSerializer
-        return RAMSerializer
-
     def get_queryset(self):
-        return RAMService.get_compatible_rams(
+        qs = RAMService.get_compatible_rams(
             data=tools.extract_params(self.request)
         )
+        return self.setup_eager_loading(qs).order_by("id")
 
 
 class StorageViewSet(BaseViewSet):
     queryset = Storage.objects.all().order_by("id")
+    serializer_class = StorageSerializer
+    detail_serializer_class = StorageDetailSerializer
     filterset_class = StorageFilter
 
-    def get_serializer_class(self):
-        if self.action in ['retrieve', 'list']:
-            return StorageDetailSerializer
-        return StorageSerializer
-
     def get_queryset(self):
-        return StorageService.get_compatible_m2(
+        qs = StorageService.get_compatible_m2(
             data=tools.extract_params(self.request)
         )
+        return self.setup_eager_loading(qs).order_by("id")
 
 
 class PSUViewSet(BaseViewSet):
     queryset = PSU.objects.all().order_by("id")
-
-    def get_serializer_class(self):
-        if self.action in ['retrieve', 'list']:
-            return PSUDetailSerializer
-        return PSUSerializer
+    serializer_class = PSUSerializer
+    detail_serializer_class = PSUDetailSerializer
 
     def get_queryset(self):
-        return PSUService.get_compatible_psus(
+        qs = PSUService.get_compatible_psus(
             data=tools.extract_params(self.request)
         )
+        return self.setup_eager_loading(qs).order_by("id")
 
 
 class CaseViewSet(BaseViewSet):
     queryset = Case.objects.all().order_by("id")
-
-    def get_serializer_class(self):
-        if self.action in ['retrieve', 'list']:
-            return CaseDetailSerializer
-        return CaseSerializer
+    serializer_class = CaseSerializer
+    detail_serializer_class = CaseDetailSerializer
 
     def get_queryset(self):
-        return CaseService.get_compatible_cases(
+        qs = CaseService.get_compatible_cases(
             data=tools.extract_params(self.request)
         )
+        return self.setup_eager_loading(qs).order_by("id")
 
 
 class CoolerViewSet(BaseViewSet):
     queryset = Cooler.objects.all().order_by("id")
+    serializer_class = CoolerSerializer
+    detail_serializer_class = CoolerDetailSerializer
     search_fields = ["name", "manufacturer__name", "type", "socket_compat"]
     ordering_fields = ["tdp_w_supported", "id"]
 
-    def get_serializer_class(self):
-        if self.action in ['retrieve', 'list']:
-            return CoolerDetailSerializer
-        return CoolerSerializer
-
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = self.setup_eager_loading(super().get_queryset())
         min_tdp = self.request.query_params.get("min_tdp")
         socket = self.request.query_params.get("socket")
         typ = self.request.query_params.get("type")
@@ -263,7 +257,9 @@ class CoolerViewSet(BaseViewSet):
 
 class BuildViewSet(BaseViewSet):
     queryset = Build.objects.select_related(
-        "cpu", "gpu", "motherboard", "ram", "storage", "psu", "case", "cooler", "user"
+        "cpu", "gpu", "motherboard", "ram", "storage", "psu", "case", "cooler", "user",
+        "gpu__manufacturer", "gpu__graphics_chip", "ram__manufacturer", "ram__base",
+        "psu__manufacturer",
     ).all().order_by("-created_at")
     search_fields = [
         "name", "user__username",
@@ -283,171 +279,353 @@ class BuildViewSet(BaseViewSet):
             qs = qs.filter(user_id=user_id)
         return qs
 
+    @action(detail=False, methods=["post"])
+    def evaluate(self, request):
+        # {"cpu": 1, "gpu": 2, ...} -> jedna ocena, {"builds": [{...}, ...]} -> lista ocen
+        body = request.data
+        if not isinstance(body, dict):
+            return Response({"error": "builds_invalid"}, status=400)
+
+        profile_ids = body.get("profiles")
+        if profile_ids is not None and (
+            not isinstance(profile_ids, list)
+            or not all(isinstance(profile_id, str) for profile_id in profile_ids)
+            or not set(profile_ids) <= set(BuildEvaluationService.get_profiles())
+        ):
+            return Response({"error": "profiles_invalid"}, status=400)
+
+        batch = "builds" in body
+        raw_builds = body["builds"] if batch else [body]
+        if not isinstance(raw_builds, list) or len(raw_builds) > BuildEvaluationService.MAX_BATCH:
+            return Response({"error": "builds_invalid"}, status=400)
+
+        builds = []
+        for raw in raw_builds:
+            if not isinstance(raw, dict):
+                return Response({"error": "builds_invalid"}, status=400)
+            build = {}
+            for key, value in raw.items():
+                if key not in tools.COMPATIBILITY_KEYS or value is None:
+                    continue
+                if isinstance(value, bool) or not isinstance(value, (int, str)):
+                    return Response({"error": "builds_invalid"}, status=400)
+                try:
+                    build[key] = int(value)
+                except ValueError:
+                    return Response({"error": "builds_invalid"}, status=400)
+            builds.append(build)
+
+        results = BuildEvaluationService.evaluate_many(builds, profile_ids)
+        if batch:
+            return Response({"results": results})
+        if "error" in results[0]:
+            return Response(results[0], status=404)
+        return Response(results[0])
+
 
 class FilterOptionsView(APIView):
     def get(self, request):
-        cpu_qs = CPU.objects.all()
-        mobo_qs = Motherboard.objects.all()
-        ram_qs = RAM.objects.all()
-        storage_qs = Storage.objects.all()
-        gpu_qs = GPU.objects.all()
-        chip_qs = GraphicsChip.objects.filter(gpu__isnull=False).distinct()
-
-        cpu_options = {
-            "family": build_options(distinct_values(cpu_qs, "family")),
-            "generation": build_options(distinct_values(cpu_qs, "generation")),
-            "manufacturer": values_to_options(
-                cpu_qs.values("manufacturer_id", "manufacturer__name").distinct().order_by("manufacturer__name"),
-                "manufacturer_id",
-                "manufacturer__name",
-            ),
-            "socket": values_to_options(
-                cpu_qs.values("socket_id", "socket__name").distinct().order_by("socket__name"),
-                "socket_id",
-                "socket__name",
-            ),
-            "p_cores": build_options(distinct_values(cpu_qs, "p_cores")),
-            "e_cores": build_options(distinct_values(cpu_qs, "e_cores")),
-            "threads": build_options(distinct_values(cpu_qs, "threads")),
-            "supported_ram": rambase_options(
-                RAMBase.objects.filter(cpu__isnull=False).distinct()
-            ),
-            "max_internal_memory_gb": build_options(distinct_values(cpu_qs, "max_internal_memory_gb")),
-            "supported_pcie": connector_options(
-                Connector.objects.filter(cpu_supported_pcie__isnull=False, category="PCIe").distinct()
-            ),
-            "cache_mb": build_options(distinct_values(cpu_qs, "cache_mb")),
-            "pcie_max_gen": build_options(
-                distinct_values(
-                    Connector.objects.filter(cpu_supported_pcie__isnull=False, category="PCIe"),
-                    "version",
-                )
-            ),
-        }
-
-        motherboard_options = {
-            "manufacturer": values_to_options(
-                mobo_qs.values("manufacturer_id", "manufacturer__name").distinct().order_by("manufacturer__name"),
-                "manufacturer_id",
-                "manufacturer__name",
-            ),
-            "socket": values_to_options(
-                mobo_qs.values("socket_id", "socket__name").distinct().order_by("socket__name"),
-                "socket_id",
-                "socket__name",
-            ),
-            "form_factor": values_to_options(
-                mobo_qs.values("form_factor_id", "form_factor__name").distinct().order_by("form_factor__name"),
-                "form_factor_id",
-                "form_factor__name",
-            ),
-            "supported_ram": rambase_options(
-                RAMBase.objects.filter(motherboard__isnull=False).distinct()
-            ),
-            "max_ram_capacity": build_options(distinct_values(mobo_qs, "max_ram_capacity")),
-            "dimm_slots": build_options(distinct_values(mobo_qs, "dimm_slots")),
-            "pcie_max_gen": build_options(
-                distinct_values(
-                    Connector.objects.filter(motherboardconnector__isnull=False, category="PCIe"),
-                    "version",
-                )
-            ),
-        }
-
-        ram_options = {
-            "manufacturer": values_to_options(
-                ram_qs.values("manufacturer_id", "manufacturer__name").distinct().order_by("manufacturer__name"),
-                "manufacturer_id",
-                "manufacturer__name",
-            ),
-            "base": rambase_options(
-                RAMBase.objects.filter(variants__isnull=False).distinct()
-            ),
-            "modules_count": build_options(distinct_values(ram_qs, "modules_count")),
-            "total_capacity": build_options(distinct_values(ram_qs, "total_capacity")),
-        }
-
-        storage_options = {
-            "manufacturer": values_to_options(
-                storage_qs.values("manufacturer_id", "manufacturer__name").distinct().order_by("manufacturer__name"),
-                "manufacturer_id",
-                "manufacturer__name",
-            ),
-            "connector": connector_options(
-                Connector.objects.filter(storage__isnull=False).distinct()
-            ),
-            "capacity_gb": build_options(distinct_values(storage_qs, "capacity_gb")),
-            "pcie_max_gen": build_options(
-                distinct_values(
-                    Connector.objects.filter(storage__isnull=False, category="M.2 PCIe"),
-                    "version",
+        options, version, last_modified = FilterOptionsService.get_options()
+        etag = f'"catalog-{version}"'
+
+        # If-None-Match / If-Modified-Since zgodne z bieżącą wersją katalogu -> 304 bez treści
+        not_modified = get_conditional_response(request, etag=etag, last_modified=int(last_modified))
+        response = not_modified or Response(options)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+class FilterFacetsView(APIView):
+    def get(self, request):
+        category = request.query_params.get("category")
+        if category not in FacetService.CATEGORIES:
+            return Response({"error": "category_invalid"}, status=400)
+
+        try:
+            facets = FacetService.get_facets(
+                category, tools.extract_params(request), request.query_params
+            )
+        except ObjectDoesNotExist:
+            return Response({"error": "component_not_found"}, status=404)
+
+        return Response(facets)
+
+
+class CatalogExportView(APIView):
+    def get(self, request):
+        export = CatalogExportService.get_export()
+        use_gzip = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")
+        # osobne ETagi dla wersji skompresowanej i nieskompresowanej
+        etag = f'"catalog-export-{export.version}{"-gzip" if use_gzip else ""}"'
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(
+                export.gzip_body if use_gzip else export.body, content_type="application/json"
+            )
+            if use_gzip:
+                response["Content-Encoding"] = "gzip"
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+
+
+BUILD_RESPONSE_FIELDS = (
+    ("cpu", "cpu", CPUDetailSerializer),
+    ("gpu", "gpu", GPUDetailSerializer),
+    ("mobo", "motherboard", MotherboardDetailSerializer),
+    ("ram", "ram", RAMDetailSerializer),
+    ("mem", "storage", StorageDetailSerializer),
+    ("psu", "psu", PSUDetailSerializer),
+    ("chassis", "case", CaseDetailSerializer),
+)
+
+
+def serialize_build(result):
+    data = {"total_price": str(result.total_price)}
+    for key, field, serializer_class in BUILD_RESPONSE_FIELDS:
+        data[key] = serializer_class(getattr(result, field)).data
+    return data
+
+
+# przypięte komponenty: klucze jak w /api/compatibility/ -> pole BuildConstraints
+BUILDER_PINS = {
+    "cpu": "cpu", "gpu": "gpu", "mobo": "motherboard", "ram": "ram",
+    "mem": "storage", "psu": "psu", "case": "case",
+}
+
+# filtry list komponentów z prefiksem, np. cpu__socket=3, gpu__vram_size_gb=12,16, mobo__price_max=800
+BUILDER_FILTERS = {
+    "cpu": ("cpu", CPUFilter, CPU),
+    "gpu": ("gpu", GPUFilter, GPU),
+    "mobo": ("motherboard", MotherboardFilter, Motherboard),
+}
+
+
+def parse_builder_constraints(params):
+    """BuildConstraints z przypiętych ID i filtrów albo Response z błędem 400."""
+    allowed = {}
+    snapshot = None
+    for key, field in BUILDER_PINS.items():
+        value = params.get(key)
+        if value in (None, ""):
+            continue
+        try:
+            pk = int(value)
+        except (TypeError, ValueError):
+            return Response({"error": "pin_invalid", "field": key}, status=400)
+
+        # przypięcie komponentu, którego builder nigdy nie wybierze, dawałoby zawsze build_not_found
+        snapshot = snapshot or BuildBuilderService.get_snapshot()
+        if not BuildBuilderService.can_use(snapshot, field, pk):
+            return Response({"error": "pin_unavailable", "field": key}, status=400)
+        allowed[field] = frozenset({pk})
+
+    for prefix, (field, filterset_class, model) in BUILDER_FILTERS.items():
+        data = {}
+        for name, value in params.items():
+            if name.startswith(f"{prefix}__"):
+                # body JSON może mieć liczby i listy - filtry oczekują tekstu jak w query string
+                data[name[len(prefix) + 2:]] = (
+                    ",".join(map(str, value)) if isinstance(value, list) else str(value)
                 )
-            ),
-        }
+        if not data:
+            continue
 
-        gpu_output_values = distinct_values(
-            Connector.objects.filter(gpuconnector__isnull=False, category__in=OUTPUT_CATEGORIES),
-            "category",
-        )
+        filterset = filterset_class(data, queryset=model.objects.filter(price__isnull=False))
+        # nieznane parametry są pomijane, jak na listach komponentów
+        if not filterset.is_valid():
+            return Response({"error": "filters_invalid"}, status=400)
+        ids = frozenset(filterset.qs.values_list("id", flat=True))
+        allowed[field] = allowed[field] & ids if field in allowed else ids
 
-        gpu_options = {
-            "manufacturer": values_to_options(
-                gpu_qs.values("manufacturer_id", "manufacturer__name").distinct().order_by("manufacturer__name"),
-                "manufacturer_id",
-                "manufacturer__name",
-            ),
-            "vram_size_gb": build_options(distinct_values(gpu_qs, "vram_size_gb")),
-            "outputs": build_options(gpu_output_values),
-            "graphics_chip_vendor": build_options(distinct_values(chip_qs, "vendor")),
-            "graphics_chip_marketing_name": build_options(
-                distinct_values(chip_qs, "marketing_name")
-            ),
-            "graphics_chip_pcie_max_gen": build_options(
-                distinct_values(chip_qs, "pcie_max_gen")
-            ),
-            "graphics_chip_memory_type": build_options(
-                distinct_values(chip_qs, "memory_type")
-            ),
-            "graphics_chip_ray_tracing_gen": build_options(
-                distinct_values(chip_qs, "ray_tracing_gen")
-            ),
-            "graphics_chip_upscaling_technology": build_options(
-                distinct_values(chip_qs, "upscaling_technology")
-            ),
-        }
+    return BuildConstraints(**allowed)
 
-        return Response({
-            "cpu": cpu_options,
-            "mobo": motherboard_options,
-            "ram": ram_options,
-            "mem": storage_options,
-            "gpu": gpu_options,
-        })
+
+def parse_builder_params(params):
+    """(budget, k, mode, constraints) z parametrów zapytania albo Response z błędem 400."""
+    # body JSON nie musi być obiektem (np. lista)
+    if not isinstance(params, dict):
+        return Response({"error": "params_invalid"}, status=400)
+
+    budget_raw = params.get("budget")
+    if budget_raw in (None, ""):
+        return Response({"error": "budget_required"}, status=400)
+
+    try:
+        budget = int(budget_raw)
+    except (TypeError, ValueError):
+        return Response({"error": "budget_invalid"}, status=400)
+
+    k = None
+    k_raw = params.get("k")
+    if k_raw is not None:
+        try:
+            k = int(k_raw)
+        except (TypeError, ValueError):
+            return Response({"error": "k_invalid"}, status=400)
+        if not 1 <= k <= BuildBuilderService.MAX_TOP_K:
+            return Response({"error": "k_invalid"}, status=400)
+
+    mode = params.get("mode", BuildBuilderService.MODE_OPTIMAL)
+    if mode not in BuildBuilderService.MODES:
+        return Response({"error": "mode_invalid"}, status=400)
+
+    constraints = parse_builder_constraints(params)
+    if isinstance(constraints, Response):
+        return constraints
+
+    return budget, k, mode, constraints
 
 
 class BuildBuilderView(APIView):
     def get(self, request):
-        budget_raw = request.query_params.get("budget")
-        if not budget_raw:
-            return Response({"error": "budget_required"}, status=400)
+        params = parse_builder_params(request.query_params)
+        if isinstance(params, Response):
+            return params
+
+        key, compute = self.get_search(*params)
+        data, status = BuilderResultCache.get_default().get_or_compute(key, compute)
+        return Response(data, status=status)
+
+    @classmethod
+    def get_search(cls, budget, k, mode, constraints=None):
+        """Klucz cache i funkcja compute(progress=None) -> (dane, status HTTP)."""
+        if k is not None:
+            key = BuilderResultCache.make_key(budget, BuildBuilderService.MODE_OPTIMAL, k, constraints)
+            return key, lambda progress=None: cls._top_builds(budget, k, progress, constraints)
+        key = BuilderResultCache.make_key(budget, mode, constraints=constraints)
+        return key, lambda progress=None: cls._single_build(budget, mode, progress, constraints)
+
+    @staticmethod
+    def _single_build(budget, mode, progress=None, constraints=None):
+        # front Pareto jest liczony dla pełnego katalogu, więc tylko bez ograniczeń
+        optimal = mode == BuildBuilderService.MODE_OPTIMAL and not constraints
+        if optimal and budget > 0 and FrontierService.is_ready():
+            candidate = FrontierService.lookup(Decimal(budget))
+            result = BuildBuilderService._load_results([candidate])[0] if candidate else None
+        else:
+            if optimal:
+                FrontierService.schedule_rebuild()
+            result = BuildBuilderService.build(
+                budget, mode=mode, progress=progress, constraints=constraints,
+            )
+        if not result:
+            return {"error": "build_not_found"}, 404
+
+        return {"budget": budget, **serialize_build(result)}, 200
+
+    @staticmethod
+    def _top_builds(budget, k, progress=None, constraints=None):
+        results = BuildBuilderService.build_top(budget, k, progress, constraints)
+        if not results:
+            return {"error": "build_not_found"}, 404
+
+        response_keys = {field: key for key, field, _ in BUILD_RESPONSE_FIELDS}
+        best = results[0]
+        builds = []
+        for result in results:
+            differences = [
+                {
+                    "component": response_keys[item["component"]],
+                    "change": item["change"],
+                    "price_delta": str(item["price_delta"]),
+                }
+                for item in BuildBuilderService.compare(result, best)
+            ]
+            builds.append({
+                **serialize_build(result),
+                "score": result.score,
+                "differences": differences,
+            })
+
+        return {"budget": budget, "k": k, "builds": builds}, 200
+
+
+class BuilderJobsView(APIView):
+    def post(self, request):
+        params = parse_builder_params(request.data)
+        if isinstance(params, Response):
+            return params
+
+        job = BuilderJobService.submit(*BuildBuilderView.get_search(*params))
+        url = f"/api/builder/jobs/{job.id}/"
+        return Response(
+            {"id": job.id, "status": job.status, "url": url},
+            status=202, headers={"Location": url},
+        )
+
+
+class BuilderJobView(APIView):
+    def get(self, request, job_id):
+        job = BuilderJobService.get(job_id)
+        if job is None:
+            return Response({"error": "job_not_found"}, status=404)
+        return Response(BuilderJobService.as_dict(job))
+
+
+class CompatibilityView(APIView):
+    def get(self, request):
+        categories = None
+        categories_raw = request.query_params.get("categories")
+        if categories_raw:
+            categories = {name.strip() for name in categories_raw.split(",") if name.strip()}
+            known = {name for name, _ in CompatibilityService.CATEGORIES}
+            if not categories or not categories <= known:
+                return Response({"error": "categories_invalid"}, status=400)
 
         try:
-            budget = int(budget_raw)
+            compatible = CompatibilityService.get_compatible_ids(
+                tools.extract_params(request), categories=categories
+            )
+        except ObjectDoesNotExist:
+            return Response({"error": "component_not_found"}, status=404)
+
+        return Response(compatible)
+
+
+class RankingView(APIView):
+    def get(self, request):
+        category = request.query_params.get("category")
+        if category not in ScoringService.FEATURES:
+            return Response({"error": "category_invalid"}, status=400)
+
+        profile = request.query_params.get("profile", "default")
+        if category not in ScoringService.get_profiles().get(profile, {}):
+            return Response({"error": "profile_invalid"}, status=400)
+
+        try:
+            n = int(request.query_params.get("n", 10))
         except ValueError:
-            return Response({"error": "budget_invalid"}, status=400)
+            return Response({"error": "n_invalid"}, status=400)
+        if not 1 <= n <= ScoringService.MAX_TOP_N:
+            return Response({"error": "n_invalid"}, status=400)
+
+        ids = None
+        ids_raw = request.query_params.get("ids")
+        if ids_raw:
+            try:
+                ids = {int(value) for value in ids_raw.split(",")}
+            except ValueError:
+                return Response({"error": "ids_invalid"}, status=400)
+
+        results = ScoringService.top(category, n, profile, ids)
+        return Response({
+            "category": category,
+            "profile": profile,
+            "results": [{"id": pk, "score": score} for pk, score in results],
+        })
 
-        result = BuildBuilderService.build(budget)
-        if not result:
-            return Response({"error": "build_not_found"}, status=404)
 
+class MetricsView(APIView):
+    def get(self, request):
+        # poza DEBUG statystyki widzi tylko personel, chyba że REQUEST_METRICS["PUBLIC"]
+        if not RequestMetricsService.get_config()["PUBLIC"] and not request.user.is_staff:
+            return Response({"error": "forbidden"}, status=403)
         return Response({
-            "budget": budget,
-            "total_price": str(result.total_price),
-            "cpu": CPUDetailSerializer(result.cpu).data,
-            "gpu": GPUDetailSerializer(result.gpu).data,
-            "mobo": MotherboardDetailSerializer(result.motherboard).data,
-            "ram": RAMDetailSerializer(result.ram).data,
-            "mem": StorageDetailSerializer(result.storage).data,
-            "psu": PSUDetailSerializer(result.psu).data,
-            "chassis": CaseDetailSerializer(result.case).data,
+            **RequestMetricsService.summary(),
+            "builder_cache": BuilderResultCache.get_default().stats(),
         })
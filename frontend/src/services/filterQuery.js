@@ -0,0 +1,33 @@
+export function buildFilterQuery(filters) {
+  if (!filters) return "";
+  const parts = [];
+
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value === null || value === undefined) return;
+    if (typeof value === "string" && value.trim() === "") return;
+    if (Array.isArray(value)) {
+      if (value.length === 0) return;
+      if (key === "integrated_gpu") {
+        if (value.length !== 1) return;
+        parts.push(`${encodeURIComponent(key)}=${encodeURIComponent(String(value[0]))}`);
+        return;
+      }
+      parts.push(`${encodeURIComponent(key)}=${encodeURIComponent(value.join(","))}`);
+      return;
+    }
+    if (typeof value === "object" && value !== null) {
+      const min = value.min;
+      const max = value.max;
+      if (min !== "" && min !== null && min !== undefined) {
+        parts.push(`${encodeURIComponent(key)}_min=${encodeURIComponent(min)}`);
+      }
+      if (max !== "" && max !== null && max !== undefined) {
+        parts.push(`${encodeURIComponent(key)}_max=${encodeURIComponent(max)}`);
+      }
+      return;
+    }
+    parts.push(`${encodeURIComponent(key)}=${encodeURIComponent(value)}`);
+  });
+
+  return parts.join("&");
+}
@@ -3,6 +3,7 @@ import SummaryView from "./SummaryView";
 import SelectView from "./SelectView";
 import "./layout.css";
 import { ConfiguratorContext } from "../context/ConfiguratorContext";
+import { buildFilterQuery } from "../services/filterQuery";
 
 const buildRange = () => ({ min: "", max: "" });
 
@@ -72,6 +73,15 @@ const getDefaultFilters = () => ({
   },
 });
 
+// parametry zestawu, względem których liczone są facety (jak w ComponentList)
+const FACET_CONTEXT_PARAMS = {
+  cpu: ["mobo", "ram", "gpu", "psu"],
+  mobo: ["cpu", "ram", "gpu", "psu", "mem", "chassis"],
+  ram: ["mobo", "cpu"],
+  mem: ["mobo"],
+  gpu: ["psu", "cpu", "mobo", "chassis"],
+};
+
 function ConfiguratorLayout() {
   const { updateBuild } = useContext(ConfiguratorContext);
   const [activePanel, setActivePanel] = useState("summary");
@@ -80,6 +90,7 @@ function ConfiguratorLayout() {
   const [activeFilterCategory, setActiveFilterCategory] = useState("cpu");
   const [filters, setFilters] = useState(getDefaultFilters());
   const [filterOptions, setFilterOptions] = useState(null);
+  const [facetCounts, setFacetCounts] = useState(null);
   const [builderOpen, setBuilderOpen] = useState(false);
   const [builderLoading, setBuilderLoading] = useState(false);
   const [builderError, setBuilderError] = useState("");
@@ -109,6 +120,36 @@ function ConfiguratorLayout() {
       .catch((err) => console.error("Błąd pobierania filtrów:", err));
   }, []);
 
+  useEffect(() => {
+    const contextParams = FACET_CONTEXT_PARAMS[activeFilterCategory];
+    if (!filtersOpen || !contextParams) {
+      setFacetCounts(null);
+      return;
+    }
+
+    const keepIncompatible = filters?.general?.keep_incompatible === true;
+    const params = [`category=${activeFilterCategory}`];
+    if (!keepIncompatible) {
+      contextParams.forEach((param) => {
+        if (selected[param]) params.push(`${param}=${selected[param]}`);
+      });
+    }
+    const filterQuery = buildFilterQuery(filters[activeFilterCategory]);
+    if (filterQuery) params.push(filterQuery);
+
+    const controller = new AbortController();
+    fetch(`http://localhost:8000/api/filters/facets/?${params.join("&")}`, {
+      signal: controller.signal,
+    })
+      .then((res) => res.json())
+      .then((data) => setFacetCounts(data.facets || null))
+      .catch((err) => {
+        if (err.name !== "AbortError") console.error("Błąd pobierania facetów:", err);
+      });
+
+    return () => controller.abort();
+  }, [filtersOpen, activeFilterCategory, filters, selected]);
+
   const handleFilterChange = (category, field, value) => {
     setFilters((prev) => {
       const next = {
@@ -208,6 +249,7 @@ function ConfiguratorLayout() {
         onCloseFilters={() => setFiltersOpen(false)}
         onClearFilters={handleClearFilters}
         filterOptions={filterOptions}
+        facetCounts={facetCounts}
         filters={filters}
         activeFilterCategory={activeFilterCategory}
         onSelectFilterCategory={setActiveFilterCategory}
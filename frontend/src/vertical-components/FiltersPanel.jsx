@@ -85,6 +85,7 @@ function FiltersPanel({
   onSelectCategory,
   filters,
   filterOptions,
+  facetCounts,
   onChange,
   onClear,
   onClose,
@@ -118,6 +119,9 @@ function FiltersPanel({
   const renderMultiField = (field) => {
     const options = filterOptions?.[activeCategory]?.[field.key] || [];
     const current = filters?.[activeCategory]?.[field.key] || [];
+    const counts = new Map(
+      (facetCounts?.[field.key] || []).map((item) => [String(item.value), item.count])
+    );
 
     return (
       <div className="filters-field" key={field.key}>
@@ -129,8 +133,10 @@ function FiltersPanel({
           {options.map((option) => {
             const value = String(option.value);
             const checked = current.includes(value);
+            const count = counts.get(value);
+            const empty = facetCounts && !checked && !count;
             return (
-              <label key={value} className="filters-option">
+              <label key={value} className={`filters-option ${empty ? "filters-option-empty" : ""}`}>
                 <input
                   type="checkbox"
                   checked={checked}
@@ -142,6 +148,7 @@ function FiltersPanel({
                   }}
                 />
                 <span>{option.label}</span>
+                {count !== undefined && <span className="filters-option-count">({count})</span>}
               </label>
             );
           })}
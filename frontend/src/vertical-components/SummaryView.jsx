@@ -55,6 +55,7 @@ function SummaryView({
   onFilterChange,
   onClearFilters,
   filterOptions,
+  facetCounts,
   filters,
   activeFilterCategory,
   onSelectFilterCategory,
@@ -116,6 +117,7 @@ function SummaryView({
         onSelectCategory={onSelectFilterCategory}
         filters={filters}
         filterOptions={filterOptions}
+        facetCounts={facetCounts}
         onChange={onFilterChange}
         onClear={onClearFilters}
         onClose={onCloseFilters}